@@ -71,6 +71,19 @@ MODEL_PRICING = {
 
 ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
 
+# Persona listing (with usage counts) shared across engine instances.
+# The admin dashboard builds a fresh engine per request, so an instance
+# cache would never be hit.
+_personas_list_cache = {"data": None, "ts": 0}
+_PERSONAS_LIST_TTL = 300  # seconds
+_personas_list_lock = asyncio.Lock()
+
+
+def clear_personas_cache():
+    """Drop the cached persona listing (call after any persona mutation)."""
+    _personas_list_cache["data"] = None
+    _personas_list_cache["ts"] = 0
+
 # ============================================================
 # AI Engine
 # ============================================================
@@ -91,7 +104,10 @@ class AIEngine:
     @property
     def http(self):
         if self._http is None:
-            self._http = httpx.AsyncClient(timeout=60.0)
+            self._http = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            )
         return self._http
 
     async def close(self):
@@ -726,43 +742,56 @@ Focus on well-known, real URLs from reputable sources. Return ONLY the JSON arra
             candidates.sort(key=lambda x: x.get("quality", 0), reverse=True)
             candidates = candidates[:count]
 
-            # Add links to the site (check for duplicates)
-            added_links = []
+            # Normalize first so one IN query covers every candidate
             for c in candidates:
                 url = c.get("url", "").strip()
-                if not url:
-                    continue
-                url = normalize_url(url)
+                c["url"] = normalize_url(url) if url else ""
+            urls = list({c["url"] for c in candidates if c["url"]})
+            seen = set()
+            if urls:
+                existing = self.supabase.table("links").select("url").in_("url", urls).execute()
+                seen = {r["url"] for r in (existing.data or [])}
 
-                # Check if already exists
-                existing = self.supabase.table("links").select("id").eq("url", url).execute()
-                if existing.data:
+            # Add links to the site (check for duplicates)
+            new_candidates = []
+            for c in candidates:
+                url = c["url"]
+                if not url or url in seen:
                     continue
-
-                # Insert new link
-                insert_data = {
-                    "url": url,
+                seen.add(url)
+                new_candidates.append(c)
+
+            # Insert all new links in one statement; a URL added since the
+            # check above is skipped rather than failing the batch
+            inserted = {}
+            if new_candidates:
+                resp = self.supabase.table("links").upsert([{
+                    "url": c["url"],
                     "title": c.get("title", ""),
                     "source": "ai-discovery",
                     "submitted_by": "ai-engine",
                     "description": c.get("reason", ""),
-                }
-                resp = self.supabase.table("links").insert(insert_data).execute()
-                if resp.data:
-                    link_id = resp.data[0]["id"]
-                    added_links.append({
-                        "id": link_id,
-                        "url": url,
-                        "title": c.get("title", ""),
-                        "is_new": True,
-                        "quality": c.get("quality", 0),
-                    })
+                } for c in new_candidates], on_conflict="url", ignore_duplicates=True).execute()
+                inserted = {r["url"]: r["id"] for r in (resp.data or [])}
 
-                    # Record in ai_generated_content
-                    self._record_content(
-                        run_id, link_id, "description",
-                        c.get("reason", ""), "ai-discovery", model_used, 0
-                    )
+            added_links = []
+            for c in new_candidates:
+                link_id = inserted.get(c["url"])
+                if link_id is None:
+                    continue
+                added_links.append({
+                    "id": link_id,
+                    "url": c["url"],
+                    "title": c.get("title", ""),
+                    "is_new": True,
+                    "quality": c.get("quality", 0),
+                })
+
+                # Record in ai_generated_content
+                self._record_content(
+                    run_id, link_id, "description",
+                    c.get("reason", ""), "ai-discovery", model_used, 0
+                )
 
             self._complete_run(run_id, len(added_links), total_tokens, model_used)
             return {
@@ -1226,7 +1255,24 @@ Focus on well-known, real URLs from reputable sources. Return ONLY the JSON arra
         return resp.data or []
 
     async def get_personas(self) -> list[dict]:
-        """Get all configured personas with usage stats."""
+        """Get all configured personas with usage stats (cached for 5 minutes)."""
+        now = datetime.now(timezone.utc).timestamp()
+        if _personas_list_cache["data"] is not None and (now - _personas_list_cache["ts"]) < _PERSONAS_LIST_TTL:
+            return _personas_list_cache["data"]
+
+        async with _personas_list_lock:
+            # Another request may have refreshed the cache while we waited
+            now = datetime.now(timezone.utc).timestamp()
+            if _personas_list_cache["data"] is not None and (now - _personas_list_cache["ts"]) < _PERSONAS_LIST_TTL:
+                return _personas_list_cache["data"]
+
+            result = self._load_personas_with_usage()
+            _personas_list_cache["data"] = result
+            _personas_list_cache["ts"] = now
+            return result
+
+    def _load_personas_with_usage(self) -> list[dict]:
+        """Build the persona listing with usage counts from the DB."""
         personas = self._get_personas(force_refresh=True)
         
         # Get usage counts
@@ -14,7 +14,7 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 
-from ai_engine import AIEngine
+from ai_engine import AIEngine, clear_personas_cache
 
 
 # ============================================================
@@ -202,7 +202,7 @@ def create_ai_router(supabase_client, anthropic_api_key: str = None,
         return {"personas": await engine.get_personas()}
 
     @router.get("/personas/{persona_id}")
-    async def ai_persona_detail(persona_id: str):
+    def ai_persona_detail(persona_id: str):
         """Get details for a specific persona."""
         personas = engine._get_personas()
         persona = personas.get(persona_id)
@@ -212,7 +212,7 @@ def create_ai_router(supabase_client, anthropic_api_key: str = None,
         
         # Get usage count
         content_resp = supabase_client.table("ai_generated_content").select(
-            "id"
+            "id", count="exact", head=True
         ).eq("persona_id", persona_id).execute()
         
         return {
@@ -222,11 +222,11 @@ def create_ai_router(supabase_client, anthropic_api_key: str = None,
             "description": persona.get("description"),
             "priority": persona.get("priority"),
             "has_system_prompt": bool(persona.get("system_prompt")),
-            "usage_count": len(content_resp.data or []),
+            "usage_count": content_resp.count or 0,
         }
 
     @router.put("/personas/{persona_id}")
-    async def ai_persona_update(persona_id: str, body: PersonaUpdateRequest):
+    def ai_persona_update(persona_id: str, body: PersonaUpdateRequest):
         """Update a persona's configuration."""
         update_data = {}
         if body.name is not None:
@@ -258,8 +258,9 @@ def create_ai_router(supabase_client, anthropic_api_key: str = None,
                 update_data["id"] = persona_id
                 supabase_client.table("ai_personas").insert(update_data).execute()
             
-            # Clear cache
+            # Clear caches
             engine._personas_cache = None
+            clear_personas_cache()
             
             return {"ok": True, "persona_id": persona_id}
         except Exception as e:
@@ -294,7 +295,7 @@ def create_ai_router(supabase_client, anthropic_api_key: str = None,
         return {"runs": runs}
 
     @router.get("/runs/{run_id}")
-    async def ai_run_detail(run_id: str):
+    def ai_run_detail(run_id: str):
         """Get details of a specific run including generated content."""
         run_resp = supabase_client.table("ai_runs").select("*").eq("id", run_id).execute()
         if not run_resp.data:
@@ -4,7 +4,7 @@ Uses the api_rate_limits table for persistent state across restarts.
 """
 
 from datetime import datetime, timezone, timedelta
-from db import query_one, execute
+from db import query, query_one, execute
 
 # Backoff durations by consecutive failure count
 BACKOFF_MINUTES = {
@@ -119,20 +119,8 @@ def record_failure(api_name: str, error: str) -> None:
     print(f"[Backoff] {api_name}: failure #{failures}, backing off until {backoff_until.isoformat()}")
 
 
-def get_backoff_status(api_name: str) -> dict:
-    """
-    Get the current backoff status for an API.
-    Returns dict with consecutive_failures, backoff_until, last_error, etc.
-    """
-    row = query_one(
-        """
-        SELECT api_name, consecutive_failures, backoff_until, 
-               last_success_at, last_failure_at, last_error
-        FROM api_rate_limits WHERE api_name = %s
-        """,
-        (api_name,)
-    )
-    
+def _backoff_status_from_row(api_name: str, row: dict) -> dict:
+    """Shape an api_rate_limits row (or None) into a backoff status dict."""
     if not row:
         return {
             "api_name": api_name,
@@ -162,6 +150,39 @@ def get_backoff_status(api_name: str) -> dict:
     }
 
 
+def get_backoff_status(api_name: str) -> dict:
+    """
+    Get the current backoff status for an API.
+    Returns dict with consecutive_failures, backoff_until, last_error, etc.
+    """
+    row = query_one(
+        """
+        SELECT api_name, consecutive_failures, backoff_until, 
+               last_success_at, last_failure_at, last_error
+        FROM api_rate_limits WHERE api_name = %s
+        """,
+        (api_name,)
+    )
+    return _backoff_status_from_row(api_name, row)
+
+
+def get_backoff_status_many(api_names: list[str]) -> dict:
+    """
+    Get backoff status for several APIs in one query.
+    Returns {api_name: status_dict}; APIs with no row get the default status.
+    """
+    rows = query(
+        """
+        SELECT api_name, consecutive_failures, backoff_until, 
+               last_success_at, last_failure_at, last_error
+        FROM api_rate_limits WHERE api_name = ANY(%s)
+        """,
+        (list(api_names),)
+    )
+    by_name = {r["api_name"]: r for r in rows}
+    return {name: _backoff_status_from_row(name, by_name.get(name)) for name in api_names}
+
+
 # ============================================================
 # Rolling Window Rate Limiting
 # ============================================================
@@ -5,16 +5,71 @@ Connections use autocommit=True to avoid implicit transaction overhead.
 """
 
 import os
+import asyncio
+import functools
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+import psycopg2
 from psycopg2 import pool as pg_pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, register_default_json, register_default_jsonb
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to psycopg2's stdlib json.loads
+    orjson = None
+
+# Decode json/jsonb columns (meta_json, params, errors, ...) with orjson
+# when it is installed; it parses large result sets several times faster.
+if orjson is not None:
+    register_default_json(globally=True, loads=orjson.loads)
+    register_default_jsonb(globally=True, loads=orjson.loads)
 
 # Connection pool singleton
 _pool = None
 _pool_lock = threading.Lock()
 
-def get_pool(min_conn=2, max_conn=10):
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '2'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '10'))
+
+# ThreadedConnectionPool raises PoolError instead of waiting when every
+# connection is checked out. Plain def handlers run on FastAPI's own
+# threadpool (40 threads), so checkouts queue here for a free slot, up to
+# DB_CHECKOUT_TIMEOUT seconds before giving up with the same PoolError.
+# A slot is per thread, not per connection: get_conn() nested inside
+# get_conn() on the same thread takes a second connection without
+# waiting for a second slot, so it can't deadlock against itself.
+DB_CHECKOUT_TIMEOUT = float(os.getenv('DB_CHECKOUT_TIMEOUT', '30'))
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+_slot_depth = threading.local()  # connections this thread has checked out
+
+
+def _acquire_slot():
+    depth = getattr(_slot_depth, 'n', 0)
+    if depth == 0 and not _pool_slots.acquire(timeout=DB_CHECKOUT_TIMEOUT):
+        raise pg_pool.PoolError("connection pool exhausted")
+    _slot_depth.n = depth + 1
+
+
+def _release_slot():
+    _slot_depth.n -= 1
+    if _slot_depth.n == 0:
+        _pool_slots.release()
+
+# libpq options applied to every pooled connection. TCP keepalives stop
+# idle connections from being silently dropped by NAT/load balancers
+# between bursts, which would otherwise cost a reconnect (TCP + TLS +
+# auth) on the next query.
+_CONNECT_KWARGS = {
+    'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '10')),
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+}
+
+def get_pool(min_conn=DB_POOL_MIN, max_conn=DB_POOL_MAX):
     """Get or create the connection pool singleton."""
     global _pool
     if _pool is not None:
@@ -26,7 +81,7 @@ def get_pool(min_conn=2, max_conn=10):
         if not database_url:
             raise RuntimeError("DATABASE_URL environment variable is required")
         _pool = pg_pool.ThreadedConnectionPool(
-            min_conn, max_conn, database_url
+            min_conn, max_conn, database_url, **_CONNECT_KWARGS
         )
         # Set autocommit on initial pooled connections
         # (avoids implicit BEGIN/COMMIT per query â€” saves 2 round trips)
@@ -37,6 +92,20 @@ def get_pool(min_conn=2, max_conn=10):
         return _pool
 
 
+# Dedicated executor for blocking DB calls made from async code. Keep it
+# below the pool's max_conn: ThreadedConnectionPool raises PoolError
+# instead of waiting when it runs out, and FastAPI's own threadpool
+# (plain def handlers) and the background worker need connections too.
+DB_WORKERS = int(os.getenv('DB_WORKERS', '8'))
+_db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='db')
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking DB call on the shared DB executor and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(fn, *args, **kwargs))
+
+
 def close_pool():
     """Close all connections in the pool."""
     global _pool
@@ -44,6 +113,55 @@ def close_pool():
         if _pool:
             _pool.closeall()
             _pool = None
+            _idle_since.clear()
+
+
+# Connections idle in the pool longer than this are pinged before use
+# (see _checkout). Busy connections skip the extra round trip.
+DB_PING_AFTER_IDLE = float(os.getenv('DB_PING_AFTER_IDLE', '30'))
+_idle_since: dict = {}  # id(conn) -> monotonic time it was checked in
+
+
+def _alive(conn) -> bool:
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+
+def _checkout(p):
+    """Get a live connection from the pool (pool_pre_ping style).
+
+    psycopg2 only marks a connection closed after an operation on it
+    fails, so one the server or pooler dropped while it sat idle still
+    looks open. Connections idle longer than DB_PING_AFTER_IDLE get a
+    SELECT 1 first and are replaced if it fails.
+    """
+    _acquire_slot()
+    try:
+        conn = p.getconn()
+        idle_since = _idle_since.pop(id(conn), None)
+        stale = idle_since is not None and time.monotonic() - idle_since > DB_PING_AFTER_IDLE
+        if conn.closed or (stale and not _alive(conn)):
+            p.putconn(conn, close=True)
+            conn = p.getconn()
+            _idle_since.pop(id(conn), None)
+    except Exception:
+        _release_slot()
+        raise
+    return conn
+
+
+def _checkin(p, conn):
+    # A connection that died mid-query is dropped, not pooled again
+    try:
+        if not conn.closed:
+            _idle_since[id(conn)] = time.monotonic()
+        p.putconn(conn, close=bool(conn.closed))
+    finally:
+        _release_slot()
 
 
 @contextmanager
@@ -54,12 +172,12 @@ def get_conn():
     For write operations needing transactions, use get_conn_transaction().
     """
     p = get_pool()
-    conn = p.getconn()
+    conn = _checkout(p)
     conn.autocommit = True
     try:
         yield conn
     finally:
-        p.putconn(conn)
+        _checkin(p, conn)
 
 
 @contextmanager
@@ -69,17 +187,19 @@ def get_conn_transaction():
     Auto-commits on success, rolls back on exception.
     """
     p = get_pool()
-    conn = p.getconn()
+    conn = _checkout(p)
     conn.autocommit = False
     try:
         yield conn
         conn.commit()
     except Exception:
-        conn.rollback()
+        if not conn.closed:
+            conn.rollback()
         raise
     finally:
-        conn.autocommit = True
-        p.putconn(conn)
+        if not conn.closed:
+            conn.autocommit = True
+        _checkin(p, conn)
 
 
 def query(sql, params=None):
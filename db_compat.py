@@ -5,9 +5,12 @@ Provides a drop-in replacement for the supabase-py Client's table() API:
     client = CompatClient()
     result = client.table('links').select('*').eq('id', 1).execute()
     result.data   # [{'id': 1, ...}]
-    result.count  # int (when count='exact')
+    result.count  # int (when count='exact', or a planner estimate with count='estimated')
 
-Supports: select, insert, update, delete, upsert
+    # Count only, no rows transferred (like PostgREST's HEAD request):
+    client.table('links').select('id', count='exact', head=True).eq('feed_id', 1).execute().count
+
+Supports: select, insert, update, delete, upsert (on_conflict, ignore_duplicates)
 Filters: eq, neq, in_, or_, ilike, gte, gt, lte, lt, like, is_
 Modifiers: order, limit, range
 """
@@ -17,8 +20,13 @@ import json
 from datetime import datetime, date, time, timedelta
 from decimal import Decimal
 from uuid import UUID
-from psycopg2.extras import RealDictCursor, Json
-from db import get_conn
+from psycopg2.extras import RealDictCursor, Json, execute_values
+from db import get_conn, get_conn_transaction
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
 
 
 def _serialize_value(val):
@@ -68,7 +76,8 @@ class TableQuery:
         self._table = table_name
         self._operation = None  # 'select', 'insert', 'update', 'delete', 'upsert'
         self._columns = '*'
-        self._count_mode = None  # None or 'exact'
+        self._count_mode = None  # None, 'exact' or 'estimated'
+        self._head = False      # True: skip fetching rows, only count
         self._filters = []      # [(column, op, value), ...]
         self._or_filters = []   # raw PostgREST-style OR strings
         self._order_by = []     # [(column, desc_bool), ...]
@@ -80,13 +89,15 @@ class TableQuery:
         self._update_data = None
         self._upsert_data = None
         self._on_conflict = None
+        self._ignore_duplicates = False
 
     # --- Operations ---
 
-    def select(self, columns='*', count=None):
+    def select(self, columns='*', count=None, head=False):
         self._operation = 'select'
         self._columns = columns
         self._count_mode = count
+        self._head = head
         return self
 
     def insert(self, data):
@@ -103,10 +114,11 @@ class TableQuery:
         self._operation = 'delete'
         return self
 
-    def upsert(self, data, on_conflict=None):
+    def upsert(self, data, on_conflict=None, ignore_duplicates=False):
         self._operation = 'upsert'
         self._upsert_data = data
         self._on_conflict = on_conflict
+        self._ignore_duplicates = ignore_duplicates
         return self
 
     # --- Filters ---
@@ -293,16 +305,12 @@ class TableQuery:
         sql += self._build_limit()
 
         count = None
+        rows = []
         with get_conn() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(sql, params if params else None)
-                rows = [_serialize_row(dict(r)) for r in cur.fetchall()]
-                
-                # Convert special types
-                for row in rows:
-                    for key, val in row.items():
-                        # Convert psycopg2's json columns properly
-                        pass  # RealDictCursor handles most types
+                if not self._head:
+                    cur.execute(sql, params if params else None)
+                    rows = [_serialize_row(dict(r)) for r in cur.fetchall()]
 
                 if self._count_mode == 'exact':
                     # Run a separate COUNT query
@@ -311,6 +319,16 @@ class TableQuery:
                     count_sql += self._build_where(count_params)
                     cur.execute(count_sql, count_params if count_params else None)
                     count = cur.fetchone()['cnt']
+                elif self._count_mode == 'estimated':
+                    # Planner row estimate -- no scan, accuracy depends on ANALYZE stats
+                    count_params = []
+                    count_sql = f'EXPLAIN (FORMAT JSON) SELECT 1 FROM "{self._table}"'
+                    count_sql += self._build_where(count_params)
+                    cur.execute(count_sql, count_params if count_params else None)
+                    plan = cur.fetchone()['QUERY PLAN']
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    count = int(plan[0]['Plan']['Plan Rows'])
 
         return CompatResponse(data=rows, count=count)
 
@@ -329,19 +347,16 @@ class TableQuery:
             data = [data]
 
         cols = ', '.join(f'"{k}"' for k in keys)
-        placeholders = ', '.join(['%s'] * len(keys))
-        sql = f'INSERT INTO "{self._table}" ({cols}) VALUES ({placeholders}) RETURNING *'
+        # Multi-row VALUES: one statement per _INSERT_PAGE_SIZE rows
+        # instead of one round trip per row
+        sql = f'INSERT INTO "{self._table}" ({cols}) VALUES %s RETURNING *'
+        values = [[_prep_value(row_data.get(k)) for k in keys] for row_data in data]
 
-        all_rows = []
-        with get_conn() as conn:
+        with _write_conn(_pages(values)) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                for row_data in data:
-                    values = [_prep_value(row_data.get(k)) for k in keys]
-                    cur.execute(sql, values)
-                    result = cur.fetchall()
-                    all_rows.extend(_serialize_row(dict(r)) for r in result)
+                result = execute_values(cur, sql, values, page_size=_INSERT_PAGE_SIZE, fetch=True)
 
-        return CompatResponse(data=all_rows)
+        return CompatResponse(data=[_serialize_row(dict(r)) for r in result])
 
     def _exec_update(self):
         data = self._update_data
@@ -404,17 +419,29 @@ class TableQuery:
             if k not in [c.strip() for c in conflict_cols.split(',')]:
                 update_parts.append(f'"{k}" = EXCLUDED."{k}"')
 
-        if update_parts:
+        if update_parts and not self._ignore_duplicates:
             conflict_action = f'UPDATE SET {", ".join(update_parts)}'
         else:
             conflict_action = 'NOTHING'
 
+        if conflict_action == 'NOTHING':
+            # DO NOTHING tolerates repeated keys within one statement, so
+            # send the rows as multi-row INSERTs like _exec_insert. RETURNING
+            # only yields the rows that were actually inserted.
+            sql = (f'INSERT INTO "{self._table}" ({cols}) VALUES %s '
+                   f'ON CONFLICT ({conflict_parts}) DO NOTHING RETURNING *')
+            values = [[_prep_value(row_data.get(k)) for k in keys] for row_data in data]
+            with _write_conn(_pages(values)) as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    result = execute_values(cur, sql, values, page_size=_INSERT_PAGE_SIZE, fetch=True)
+            return CompatResponse(data=[_serialize_row(dict(r)) for r in result])
+
         sql = (f'INSERT INTO "{self._table}" ({cols}) VALUES ({placeholders}) '
                f'ON CONFLICT ({conflict_parts}) DO {conflict_action} '
                f'RETURNING *')
 
         all_rows = []
-        with get_conn() as conn:
+        with _write_conn(len(data)) as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 for row_data in data:
                     values = [_prep_value(row_data.get(k)) for k in keys]
@@ -425,16 +452,38 @@ class TableQuery:
         return CompatResponse(data=all_rows)
 
 
+_INSERT_PAGE_SIZE = 100  # rows per multi-row INSERT statement
+
+
+def _pages(values: list) -> int:
+    return -(-len(values) // _INSERT_PAGE_SIZE)
+
+
+def _write_conn(statements: int):
+    """Connection for a batch write. Pooled connections are autocommit, so
+    a batch sent as several statements runs in one transaction instead:
+    a failure partway leaves nothing behind, and callers that count the
+    whole batch as failed (and retry it row by row) see the truth."""
+    return get_conn_transaction() if statements > 1 else get_conn()
+
+if orjson is not None:
+    def _json_dumps(val):
+        return orjson.dumps(val, option=orjson.OPT_NON_STR_KEYS).decode()
+else:
+    _json_dumps = json.dumps
+
+
 def _prep_value(val):
     """Prepare a Python value for psycopg2 parameter binding."""
     if isinstance(val, dict):
-        return Json(val)
+        return Json(val, dumps=_json_dumps)
     if isinstance(val, list):
         # Check if it's a list of floats (vector) or regular list
         if val and isinstance(val[0], (int, float)):
-            # Could be a pgvector embedding â€” pass as string representation
-            return str(val)
-        return Json(val)
+            # Could be a pgvector embedding â€” pass as text; '[0.1,0.2,...]'
+            # is a valid vector literal and much cheaper to build than str()
+            return _json_dumps(val)
+        return Json(val, dumps=_json_dumps)
     return val
 
 
@@ -11,6 +11,8 @@ import random
 import math
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Callable
+
+from db import query_one
 # db_compat provides the same .table() API as supabase Client
 
 
@@ -21,6 +23,9 @@ class Director:
         self._task: Optional[asyncio.Task] = None
         self._rotation_count = 0
         self._broadcast = broadcast_fn or (lambda e: None)
+        # False once global_state turns out to lack the current_* snapshot
+        # columns (migrations/global_state_current_link.sql not applied)
+        self._has_snapshot_cols = True
 
     # --- Lifecycle ----------------------------------------
 
@@ -103,30 +108,34 @@ class Director:
         link_id = state["current_link_id"]
         started_at = state.get("started_at", now.isoformat())
 
-        # Get votes since this link started showing
-        resp = self.db.table("votes").select("*").eq(
-            "link_id", link_id
-        ).gte("created_at", started_at).execute()
-        votes = resp.data or []
-
-        if not votes:
+        # Tally votes since this link started showing (aggregated in Postgres;
+        # this runs every tick, so don't ship the vote rows back)
+        tally = query_one(
+            """
+            SELECT count(*) FILTER (WHERE value = 1) AS up,
+                   count(*) FILTER (WHERE value = -1) AS down,
+                   COALESCE(max(user_down), 0) AS max_user_down
+            FROM (
+                SELECT value,
+                       count(*) FILTER (WHERE value = -1) OVER (PARTITION BY user_id) AS user_down
+                FROM votes
+                WHERE link_id = %s AND created_at >= %s
+            ) v
+            """,
+            (link_id, started_at)
+        )
+
+        upvotes, downvotes = tally["up"], tally["down"]
+        if not upvotes and not downvotes:
             return
 
-        upvotes = sum(1 for v in votes if v["value"] == 1)
-        downvotes = sum(1 for v in votes if v["value"] == -1)
-
         bonus = upvotes * self.get_weight("upvote_time_bonus_sec", 15)
         penalty = downvotes * self.get_weight("downvote_time_penalty_sec", 20)
 
         # Check per-user downvote skip
         skip_threshold = int(self.get_weight("downvote_skip_threshold", 3))
-        user_downvotes: dict = {}
-        for v in votes:
-            if v["value"] == -1:
-                uid = v["user_id"]
-                user_downvotes[uid] = user_downvotes.get(uid, 0) + 1
 
-        if any(count >= skip_threshold for count in user_downvotes.values()):
+        if tally["max_user_down"] >= skip_threshold:
             print(f"[Director] Skip triggered by user downvotes on link {link_id}")
             await self._rotate(now)
             return
@@ -203,14 +212,15 @@ class Director:
             sat["revealed"] = False
 
         # Update global state
-        self.db.table("global_state").update({
+        state_update = {
             "current_link_id": link_id,
             "started_at": now.isoformat(),
             "reveal_ends_at": (now + timedelta(seconds=reveal_duration)).isoformat(),
             "rotation_ends_at": (now + timedelta(seconds=duration)).isoformat(),
             "selection_reason": pool,
             "satellites": satellites,
-        }).eq("id", 1).execute()
+        }
+        self._update_state_with_snapshot(state_update, link_id)
 
         # Update link tracking
         self.db.table("links").update({
@@ -243,6 +253,50 @@ class Director:
 
     # --- Nominations --------------------------------------
 
+    def _current_link_snapshot(self, link_id: int) -> dict:
+        """current_* columns for global_state: the link, its tags and score
+        in one query, so /api/now can skip those lookups."""
+        row = query_one(
+            """
+            SELECT json_build_object(
+                       'id', l.id, 'url', l.url, 'title', l.title, 'meta_json', l.meta_json,
+                       'direct_score', l.direct_score, 'feed_id', l.feed_id
+                   ) AS link,
+                   COALESCE((
+                       SELECT json_agg(json_build_object('name', t.name, 'slug', t.slug))
+                       FROM feed_tags ft JOIN tags t ON t.id = ft.tag_id
+                       WHERE ft.feed_id = l.feed_id
+                   ), '[]'::json) AS tags,
+                   (SELECT COALESCE(SUM(value), 0) FROM votes WHERE link_id = l.id) AS score
+            FROM links l
+            WHERE l.id = %s
+            """,
+            (link_id,)
+        )
+        if not row:
+            return {}
+        return {
+            "current_link_json": row["link"],
+            "current_tags_json": row["tags"],
+            "current_score": int(row["score"]),
+        }
+
+    def _update_state_with_snapshot(self, state_update: dict, link_id: int):
+        snapshot = {}
+        if self._has_snapshot_cols:
+            try:
+                snapshot = self._current_link_snapshot(link_id)
+            except Exception as e:
+                print(f"[Director] Snapshot error: {e}")
+        try:
+            self.db.table("global_state").update({**state_update, **snapshot}).eq("id", 1).execute()
+        except Exception as e:
+            # 42703 = undefined_column; stop writing the snapshot
+            if not snapshot or getattr(e, "pgcode", None) != "42703":
+                raise
+            self._has_snapshot_cols = False
+            self.db.table("global_state").update(state_update).eq("id", 1).execute()
+
     def _check_nominations(self, rotation_id: str, satellites: list) -> Optional[dict]:
         """Check if any satellite has nominations; return the most-nominated one."""
         if not rotation_id or not satellites:
@@ -316,14 +370,17 @@ class Director:
         if not votes:
             return {"tags": {}, "types": {}, "total_up": 0, "total_down": 0}
 
-        total_up = sum(1 for v in votes if v["value"] == 1)
-        total_down = sum(1 for v in votes if v["value"] == -1)
-
-        # Aggregate by link to find which feeds/types are trending
+        # One pass: totals, plus per-link sums to find which feeds/types are trending
+        total_up = total_down = 0
         link_scores: dict = {}
         for v in votes:
+            value = v["value"]
+            if value == 1:
+                total_up += 1
+            elif value == -1:
+                total_down += 1
             lid = v["link_id"]
-            link_scores[lid] = link_scores.get(lid, 0) + v["value"]
+            link_scores[lid] = link_scores.get(lid, 0) + value
 
         # Get feed types for voted-on links
         if link_scores:
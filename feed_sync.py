@@ -0,0 +1,391 @@
+"""
+Feed Sync Engine
+
+Pulls feeds (YouTube, RSS, Reddit, Bluesky, websites), embeds new items
+and inserts them into links. Runs on a fixed set of asyncio worker tasks
+fed by a queue, started and stopped from the app lifespan; admin routes
+only enqueue feeds and return.
+"""
+
+import os
+import asyncio
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from db import run_db, execute
+from db_compat import CompatClient
+from ingest import (
+    parse_youtube_channel, parse_rss_feed, parse_reddit_feed,
+    parse_bluesky_feed, scrape_article, vectorize_batch, FeedNotModified,
+    normalize_reddit_url,
+)
+from scratchpad_api import normalize_url
+
+supabase = CompatClient()  # Direct postgres via psycopg2
+log = logging.getLogger(__name__)
+
+_active_syncs: dict = {}  # feed_id -> {"cancel": bool} while syncing
+# URLs a worker has passed the existence check for and is embedding /
+# inserting right now. Feeds syncing concurrently often syndicate the same
+# article; only the first one to claim a URL does the work.
+_claimed_urls: set = set()
+
+# Syncs run on a fixed set of worker tasks fed by a queue. Request
+# handlers only enqueue feeds. At most _SYNC_CONCURRENCY feeds sync at
+# once however many times Sync is clicked, and a feed that is already
+# queued or syncing is not queued again.
+
+# Sync worker tasks. Fetch/parse and embedding run in threads and DB calls
+# on the DB executor, so this bounds in-flight feeds, not the event loop.
+_SYNC_CONCURRENCY = max(1, int(os.getenv("SYNC_CONCURRENCY", "4")))
+_sync_queue: Optional[asyncio.Queue] = None
+_sync_worker_tasks: list = []
+_sync_queued: set = set()  # feed ids queued or syncing
+
+
+def enqueue_feed_sync(feed_id: int, feed: Optional[dict] = None) -> bool:
+    """Queue a feed for syncing. False if it is already queued or running."""
+    if feed_id in _sync_queued:
+        return False
+    _sync_queued.add(feed_id)
+    _sync_queue.put_nowait((feed_id, feed))
+    return True
+
+
+async def _sync_worker():
+    while True:
+        feed_id, feed = await _sync_queue.get()
+        try:
+            if feed is None:
+                await sync_feed_by_id(feed_id)
+            else:
+                await process_single_feed(feed)
+        except Exception as e:
+            log.error("Error syncing feed %s: %s", feed_id, e)
+        finally:
+            _sync_queued.discard(feed_id)
+            _sync_queue.task_done()
+
+
+def start_sync_workers():
+    global _sync_queue, _vector_index_rebuild
+    if _sync_worker_tasks:
+        return
+    _sync_queue = asyncio.Queue()
+    _sync_queued.clear()
+    for _ in range(_SYNC_CONCURRENCY):
+        _sync_worker_tasks.append(asyncio.create_task(_sync_worker()))
+    if _SYNC_DEFER_VECTOR_INDEX:
+        # A previous process may have exited mid-sync with the index dropped
+        _vector_index_rebuild = asyncio.create_task(_rebuild_vector_index_when_idle())
+
+
+def stop_sync_workers():
+    for task in _sync_worker_tasks:
+        task.cancel()
+    _sync_worker_tasks.clear()
+
+
+def cancel_all_syncs():
+    """Drop feeds still waiting in the queue, then stop the running ones."""
+    while not _sync_queue.empty():
+        feed_id, _ = _sync_queue.get_nowait()
+        _sync_queued.discard(feed_id)
+        _sync_queue.task_done()
+    for s in _active_syncs.values():
+        s["cancel"] = True
+
+
+# feeds.etag / feeds.last_modified hold the HTTP validators from the last
+# full fetch (migrations/feeds_conditional_get.sql). Turned off if the
+# columns don't exist yet.
+_has_validator_cols = True
+
+
+def _load_feeds(feed_id: Optional[int] = None) -> list:
+    """Feeds to sync, with their stored validators when available."""
+    global _has_validator_cols
+    if _has_validator_cols:
+        q = supabase.table('feeds').select('id,url,type,etag,last_modified')
+        if feed_id is not None:
+            q = q.eq('id', feed_id)
+        try:
+            return q.execute().data or []
+        except Exception as e:
+            # 42703 = undefined_column
+            if getattr(e, "pgcode", None) != "42703":
+                raise
+            _has_validator_cols = False
+    q = supabase.table('feeds').select('id,url,type')
+    if feed_id is not None:
+        q = q.eq('id', feed_id)
+    return q.execute().data or []
+
+
+async def sync_feed_by_id(feed_id: int):
+    try:
+        feeds = await run_db(_load_feeds, feed_id)
+        if not feeds:
+            return
+        await process_single_feed(feeds[0])
+    except Exception as e:
+        log.error("Error syncing feed %s: %s", feed_id, e)
+        await run_db(supabase.table('feeds').update({'status': 'error', 'last_error': str(e)[:500]}).eq('id', feed_id).execute)
+
+
+# Bulk mode: with SYNC_DEFER_VECTOR_INDEX=1, Sync All drops the HNSW
+# index on links.content_vector, lets the workers insert without index
+# maintenance, and rebuilds it once the queue drains. Off by default.
+# Nothing reads the index during a sync, but a rebuild scans every link.
+_SYNC_DEFER_VECTOR_INDEX = os.getenv("SYNC_DEFER_VECTOR_INDEX", "") == "1"
+_VECTOR_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_links_content_vector ON links "
+    "USING hnsw (content_vector vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+)
+_vector_index_rebuild: Optional[asyncio.Task] = None
+
+
+def _ensure_vector_index():
+    t0 = time.time()
+    execute(_VECTOR_INDEX_SQL)
+    log.info("Vector index ensured in %.1fs", time.time() - t0)
+
+
+async def _rebuild_vector_index_when_idle():
+    global _vector_index_rebuild
+    try:
+        await _sync_queue.join()
+        await run_db(_ensure_vector_index)
+    except Exception as e:
+        log.error("Vector index rebuild failed: %s", e)
+    finally:
+        _vector_index_rebuild = None
+
+
+async def sync_all_feeds():
+    """Queue every feed for the sync workers."""
+    global _vector_index_rebuild
+    feeds = await run_db(_load_feeds)
+    if _SYNC_DEFER_VECTOR_INDEX and _vector_index_rebuild is None:
+        await run_db(execute, "DROP INDEX IF EXISTS idx_links_content_vector")
+        _vector_index_rebuild = asyncio.create_task(_rebuild_vector_index_when_idle())
+    for feed in feeds:
+        enqueue_feed_sync(feed['id'], feed)
+
+
+def _fetch_feed_items(feed: dict, validators: Optional[dict] = None) -> list:
+    """Fetch and parse a feed's entries (blocking network I/O).
+
+    RSS fetches are conditional on validators; FeedNotModified means the
+    feed is unchanged since the last full sync.
+    """
+    ft = feed['type']
+    if ft == 'youtube':
+        return parse_youtube_channel(feed['url'])
+    elif ft == 'rss':
+        return parse_rss_feed(feed['url'], validators)
+    elif ft == 'reddit':
+        return parse_reddit_feed(feed['url'])
+    elif ft == 'bluesky':
+        return parse_bluesky_feed(feed['url'])
+    elif ft == 'website':
+        data = scrape_article(feed['url'])
+        return [{'url': feed['url'], 'title': data.get('title',''), 'content': data.get('description',''), 'meta': {'type':'website'}}]
+    return []
+
+
+# Wall-clock cap on one feed fetch + parse. Request timeouts bound each
+# socket read, not a slow-drip response or trafilatura's own download, so
+# one pathological host could otherwise hold a sync worker indefinitely.
+# A timed-out fetch thread is abandoned, not killed; it ends on its own
+# socket timeouts.
+_FETCH_TIMEOUT = float(os.getenv("SYNC_FETCH_TIMEOUT", "60"))
+
+# Per-host breaker: after _HOST_MAX_FAILURES consecutive failed fetches a
+# host is skipped for _HOST_COOLDOWN seconds instead of costing every feed
+# on it a full timeout. Only failures that say the host itself is down
+# count (timeouts, connection errors, 5xx); a 404, an unparsable feed or an
+# unresolvable channel is one feed's problem and never trips the breaker
+# for the other feeds on youtube.com / reddit.com.
+_HOST_MAX_FAILURES = 3
+_HOST_COOLDOWN = 300  # seconds
+_host_failures: dict = {}  # host -> (consecutive failures, monotonic time of last)
+
+
+def _is_host_failure(exc: BaseException) -> bool:
+    # The ingest parsers re-raise as plain Exception; look down the chain
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(exc, requests.HTTPError) and exc.response is not None \
+                and exc.response.status_code >= 500:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _breaker_key(feed: dict) -> str:
+    """The host a feed's fetch actually talks to. Reddit and Bluesky feeds
+    are often stored as bare subreddit names / handles with no host."""
+    ft = feed['type']
+    if ft == 'youtube':
+        return 'www.youtube.com'
+    if ft == 'bluesky':
+        return 'public.api.bsky.app'
+    url = normalize_reddit_url(feed['url']) if ft == 'reddit' else feed['url']
+    return urlparse(url).netloc.lower() or f"feed:{feed['id']}"
+
+
+async def _fetch_with_breaker(feed: dict, validators: Optional[dict]) -> list:
+    host = _breaker_key(feed)
+    failures, last = _host_failures.get(host, (0, 0.0))
+    if failures >= _HOST_MAX_FAILURES and time.monotonic() - last < _HOST_COOLDOWN:
+        raise RuntimeError(f"{host} skipped after {failures} consecutive failures; retrying after cooldown")
+    try:
+        items = await asyncio.wait_for(
+            asyncio.to_thread(_fetch_feed_items, feed, validators), _FETCH_TIMEOUT
+        )
+    except FeedNotModified:
+        _host_failures.pop(host, None)
+        raise
+    except asyncio.TimeoutError:
+        _host_failures[host] = (failures + 1, time.monotonic())
+        log.warning("Feed %s: fetch from %s timed out after %.0fs", feed['id'], host, _FETCH_TIMEOUT)
+        raise RuntimeError(f"fetch timed out after {_FETCH_TIMEOUT:.0f}s")
+    except Exception as e:
+        if _is_host_failure(e):
+            _host_failures[host] = (failures + 1, time.monotonic())
+        raise
+    _host_failures.pop(host, None)
+    return items
+
+
+_INSERT_BATCH_SIZE = 500  # rows per links INSERT during feed sync
+
+
+def _build_link_row(item: dict, feed_id, vector) -> dict:
+    return {
+        'url': item['url'], 'title': item.get('title',''),
+        'content': (item.get('content','') or '')[:10000],
+        'meta_json': item.get('meta', {}),
+        'content_vector': vector, 'feed_id': feed_id,
+        'processing_status': 'new',
+        'processing_priority': 1,  # Feed items = low priority
+    }
+
+
+def _insert_links(rows: list) -> int:
+    # url is UNIQUE: a link another feed (or a concurrent sync) inserted
+    # since the existence check is skipped instead of failing the insert
+    resp = supabase.table('links').upsert(rows, on_conflict='url', ignore_duplicates=True).execute()
+    return len(resp.data or [])
+
+
+async def process_single_feed(feed: dict):
+    feed_id = feed['id']
+    _active_syncs[feed_id] = {"cancel": False}
+    claimed = set()
+    await run_db(supabase.table('feeds').update({'status': 'syncing', 'last_error': None}).eq('id', feed_id).execute)
+    try:
+        validators = None
+        if _has_validator_cols:
+            validators = {'etag': feed.get('etag'), 'modified': feed.get('last_modified')}
+
+        # Fetch/parse, embedding and DB calls all run off the event loop so
+        # several feeds can sync at once (see _sync_worker)
+        try:
+            items = await _fetch_with_breaker(feed, validators)
+        except FeedNotModified:
+            await run_db(
+                execute,
+                "UPDATE feeds SET status = 'idle', last_scraped_at = now(), last_error = NULL WHERE id = %s",
+                (feed_id,),
+            )
+            log.debug("Feed %s: not modified", feed_id)
+            return
+        # Only store new validators once every item has made it in;
+        # otherwise the next sync must see the full feed again
+        complete = True
+
+        # One existence check for the whole feed instead of one per item
+        for item in items:
+            if item.get('url'):
+                item['url'] = normalize_url(item['url'])
+        urls = list({item['url'] for item in items if item.get('url')})
+        seen = set()
+        if urls:
+            existing = await run_db(supabase.table('links').select('url').in_('url', urls).execute)
+            seen = {r['url'] for r in (existing.data or [])}
+
+        new_items = []
+        for item in items:
+            url = item.get('url', '')
+            if not url or url in seen:
+                continue
+            seen.add(url)
+            if url in _claimed_urls:
+                # Another feed is ingesting it; if that fails, a later sync
+                # of this feed must offer it again
+                complete = False
+                continue
+            new_items.append(item)
+        claimed = {item['url'] for item in new_items}
+        _claimed_urls.update(claimed)
+
+        rows = []
+        if new_items and _active_syncs.get(feed_id, {}).get("cancel"):
+            complete = False
+        elif new_items:
+            texts = [f"{i.get('title','')}. {i.get('content','')}"[:5000] for i in new_items]
+            try:
+                vectors = await asyncio.to_thread(vectorize_batch, texts)
+            except Exception as e:
+                log.error("Error vectorizing %d items for feed %s: %s", len(texts), feed_id, e)
+                vectors = []
+                complete = False
+            rows = [_build_link_row(item, feed_id, vector) for item, vector in zip(new_items, vectors)]
+
+        ingested = 0
+        for i in range(0, len(rows), _INSERT_BATCH_SIZE):
+            chunk = rows[i:i + _INSERT_BATCH_SIZE]
+            try:
+                ingested += await run_db(_insert_links, chunk)
+            except Exception as e:
+                # One bad row (e.g. a NUL byte in scraped text) shouldn't
+                # cost the rest of the chunk: retry it row by row
+                log.warning("Batch insert of %d for feed %s failed, retrying per row: %s", len(chunk), feed_id, e)
+                for row in chunk:
+                    try:
+                        ingested += await run_db(_insert_links, [row])
+                    except Exception as e:
+                        log.error("Error ingesting %s for feed %s: %s", row['url'], feed_id, e)
+                        complete = False
+
+        # Recount and mark idle in one statement (one round-trip per feed)
+        set_validators, params = "", (feed_id, feed_id)
+        if validators is not None and complete:
+            set_validators = ", etag = %s, last_modified = %s"
+            params = (validators['etag'], validators['modified'], feed_id, feed_id)
+        await run_db(
+            execute,
+            f"""
+            UPDATE feeds
+            SET status = 'idle', last_scraped_at = now(), last_error = NULL{set_validators},
+                link_count = (SELECT count(*) FROM links WHERE feed_id = %s)
+            WHERE id = %s
+            """,
+            params,
+        )
+        log.info("Feed %s: %d new links", feed_id, ingested)
+    except Exception as e:
+        log.error("Error syncing feed %s: %s", feed_id, e)
+        await run_db(supabase.table('feeds').update({'status': 'error', 'last_error': str(e)[:500]}).eq('id', feed_id).execute)
+    finally:
+        _claimed_urls.difference_update(claimed)
+        _active_syncs.pop(feed_id, None)
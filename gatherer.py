@@ -58,7 +58,7 @@ class RSSGatherer:
         try:
             response = await client.get(HN_RSS)
             response.raise_for_status()
-            feed_content = response.text
+            feed_content = response.content  # bytes: feedparser sniffs the encoding
         except Exception as e:
             print(f"[Gatherer] Error fetching HN RSS: {e}")
             return []
@@ -110,7 +110,7 @@ class RSSGatherer:
         try:
             response = await client.get(REDDIT_RSS)
             response.raise_for_status()
-            feed_content = response.text
+            feed_content = response.content  # bytes: feedparser sniffs the encoding
         except Exception as e:
             print(f"[Gatherer] Error fetching Reddit RSS: {e}")
             return []
@@ -207,9 +207,9 @@ class RSSGatherer:
         """
         Ingest gathered links into the database.
         
-        For each link:
-        - Check if URL already exists (skip if so)
-        - Insert with processing_status='new', processing_priority=1
+        All links go in as one INSERT ... ON CONFLICT (url) DO NOTHING:
+        - URLs already in links (or repeated in the batch) are skipped by Postgres
+        - New rows get processing_status='new', processing_priority=1
         - Track metrics for job_run logging
         
         Returns: {items_found, items_new, items_skipped, errors}
@@ -219,47 +219,48 @@ class RSSGatherer:
         items_skipped = 0
         errors = []
 
+        rows = []
         for link_data in links:
             url = link_data.get("url")
             if not url:
                 continue
 
-            try:
-                # Check if URL already exists
-                existing = self.db.table("links").select("id").eq("url", url).limit(1).execute()
-                
-                if existing.data:
-                    items_skipped += 1
-                    continue
-
-                # Build metadata
-                meta_json = {
-                    "gather_source": source,
-                }
-                
-                if link_data.get("hn_comments_url"):
-                    meta_json["hn_comments_url"] = link_data["hn_comments_url"]
-                if link_data.get("reddit_comments_url"):
-                    meta_json["reddit_comments_url"] = link_data["reddit_comments_url"]
-                if link_data.get("subreddit"):
-                    meta_json["subreddit"] = link_data["subreddit"]
-
-                # Insert new link
-                insert_data = {
-                    "url": url,
-                    "title": link_data.get("title", ""),
-                    "meta_json": meta_json,
-                    "processing_status": "new",
-                    "processing_priority": 1,  # High priority for gathered links
-                }
-
-                self.db.table("links").insert(insert_data).execute()
-                items_new += 1
+            # Build metadata
+            meta_json = {
+                "gather_source": source,
+            }
+            
+            if link_data.get("hn_comments_url"):
+                meta_json["hn_comments_url"] = link_data["hn_comments_url"]
+            if link_data.get("reddit_comments_url"):
+                meta_json["reddit_comments_url"] = link_data["reddit_comments_url"]
+            if link_data.get("subreddit"):
+                meta_json["subreddit"] = link_data["subreddit"]
+
+            rows.append({
+                "url": url,
+                "title": link_data.get("title", ""),
+                "meta_json": meta_json,
+                "processing_status": "new",
+                "processing_priority": 1,  # High priority for gathered links
+            })
 
+        if rows:
+            try:
+                items_new = self._insert_links(rows)
+                items_skipped = len(rows) - items_new
             except Exception as e:
-                error_msg = f"Error ingesting {url}: {str(e)}"
-                print(f"[Gatherer] {error_msg}")
-                errors.append(error_msg)
+                # One bad row shouldn't cost the whole gather: retry row by row
+                print(f"[Gatherer] Batch insert of {len(rows)} links failed, retrying per row: {e}")
+                for row in rows:
+                    try:
+                        inserted = self._insert_links([row])
+                        items_new += inserted
+                        items_skipped += 1 - inserted
+                    except Exception as e:
+                        error_msg = f"Error ingesting {row['url']}: {str(e)}"
+                        print(f"[Gatherer] {error_msg}")
+                        errors.append(error_msg)
 
         print(f"[Gatherer] Ingested: {items_new} new, {items_skipped} skipped, {len(errors)} errors")
         return {
@@ -269,6 +270,13 @@ class RSSGatherer:
             "errors": errors,
         }
 
+    def _insert_links(self, rows: list) -> int:
+        """Insert gathered link rows; URLs already in links are skipped. Returns rows inserted."""
+        resp = self.db.table("links").upsert(
+            rows, on_conflict="url", ignore_duplicates=True
+        ).execute()
+        return len(resp.data or [])
+
     # --------------------------------------------------------
     # Job Run Logging
     # --------------------------------------------------------
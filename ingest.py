@@ -11,17 +11,30 @@ Handles extracting content from various feed types:
 Each parser returns a list of dicts: {url, title, content, meta}
 """
 
+import hashlib
+import io
+import json
+import logging
 import os
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional, List
 from urllib.parse import urlparse, parse_qs
+import xml.etree.ElementTree as ET
 
 import requests
+import psycopg2
+from psycopg2.extras import execute_values
 from bs4 import BeautifulSoup
 import trafilatura
 import feedparser
 from sentence_transformers import SentenceTransformer
 
+from db import query, get_conn
+
+log = logging.getLogger(__name__)
+
 MAX_ITEMS_PER_FEED = 100
 
 # Invidious instances removed (all public instances are dead)
@@ -34,14 +47,22 @@ DESCRIPTION_MAX_CHARS = 500
 
 # _parse_vtt_to_text removed (no caption extraction on this server)
 
+# One keep-alive session for every fetch in this module (feeds, oEmbed,
+# channel pages, Bluesky), shared by the sync worker threads. Page
+# downloads go through trafilatura.fetch_url, which pools on its own.
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_session.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=16))
+_session.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=16))
+
+
 class ContentExtractor:
     """Handles content extraction from various URL types."""
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session = _session
 
     @staticmethod
     def is_youtube_url(url: str) -> bool:
@@ -74,7 +95,7 @@ class ContentExtractor:
             canonical_url = f"https://www.youtube.com/watch?v={video_id}"
 
             # Use oEmbed as the primary (and only) method
-            resp = requests.get(
+            resp = self.session.get(
                 f"https://www.youtube.com/oembed?url={canonical_url}" + "&format=json",
                 timeout=10,
             )
@@ -150,7 +171,7 @@ class ContentExtractor:
                     date = metadata.date if hasattr(metadata, 'date') else None
                     sitename = metadata.sitename if hasattr(metadata, 'sitename') else None
             except Exception as meta_err:
-                print(f"[Ingest] Metadata extraction error for {url}: {meta_err}")
+                log.debug("Metadata extraction error for %s: %s", url, meta_err)
 
             # Parse HTML for OG tags (same as before)
             soup = BeautifulSoup(downloaded, 'html.parser')
@@ -199,14 +220,62 @@ class ContentExtractor:
             raise Exception(f"Error extracting website content: {str(e)}")
 
 
+# Shared instance: the extractor is stateless apart from its keep-alive session
+_extractor = ContentExtractor()
+
+
+def get_extractor() -> ContentExtractor:
+    """The shared ContentExtractor; use this instead of constructing one."""
+    return _extractor
+
+
 # ——— Feed Parsers ———————————————————————————————————————————
 
+FEED_TIMEOUT = 15  # seconds
+FEED_READ_CHUNK = 64 * 1024  # bytes per socket read
+FEED_MAX_BYTES = 10 * 1024 * 1024  # refuse feeds bigger than this
+
+
+class FeedNotModified(Exception):
+    """The server answered a conditional feed request with 304."""
+
+
+def fetch_feed_bytes(url: str, headers: Optional[Dict] = None,
+                     validators: Optional[Dict] = None) -> bytes:
+    """Download a feed body as raw bytes in 64 KB reads.
+
+    feedparser sniffs the encoding from the bytes/XML prolog itself, so the
+    body is handed over undecoded.
+
+    With validators ({'etag', 'modified'} from the previous fetch) the
+    request is conditional: a 304 raises FeedNotModified, and otherwise the
+    dict is updated in place with the response's ETag / Last-Modified.
+    """
+    if validators is not None:
+        headers = dict(headers or {})
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('modified'):
+            headers['If-Modified-Since'] = validators['modified']
+    with _session.get(url, timeout=FEED_TIMEOUT, headers=headers, stream=True) as resp:
+        if resp.status_code == 304 and validators is not None:
+            raise FeedNotModified(url)
+        resp.raise_for_status()
+        if validators is not None:
+            validators['etag'] = resp.headers.get('ETag')
+            validators['modified'] = resp.headers.get('Last-Modified')
+        buf = bytearray()
+        for chunk in resp.iter_content(chunk_size=FEED_READ_CHUNK):
+            buf += chunk
+            if len(buf) > FEED_MAX_BYTES:
+                raise Exception(f"Feed larger than {FEED_MAX_BYTES} bytes: {url}")
+        return bytes(buf)
+
+
 def resolve_youtube_channel_id(channel_url: str) -> Optional[str]:
     """Fetch a YouTube channel page and extract the channel_id from canonical URL."""
     try:
-        resp = requests.get(channel_url, timeout=15, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        resp = _session.get(channel_url, timeout=15)
         resp.raise_for_status()
         # Best: canonical URL contains /channel/UCxxxxxx
         match = re.search(r'youtube\.com/channel/(UC[\w\-]+)', resp.text)
@@ -237,28 +306,25 @@ def parse_youtube_channel(channel_url: str) -> List[Dict]:
         raise Exception(f"Could not resolve channel ID from {channel_url}")
 
     rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-    parsed = feedparser.parse(rss_url)
+    feed_title, entries = _feed_entries(fetch_feed_bytes(rss_url), "YouTube RSS")
 
-    if parsed.bozo and not parsed.entries:
-        raise Exception(f"Failed to parse YouTube RSS: {parsed.bozo_exception}")
-
-    channel_name = parsed.feed.get('title', 'Unknown Channel')
+    channel_name = feed_title or 'Unknown Channel'
     items = []
 
-    for entry in parsed.entries[:MAX_ITEMS_PER_FEED]:
+    for entry in entries:
         video_url = entry.get('link', '')
         if not video_url:
             continue
 
         # Get thumbnail from media:group
-        thumbnail = ''
-        if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-            thumbnail = entry.media_thumbnail[0].get('url', '')
+        thumbnail = entry.get('thumbnail', '')
+        if not thumbnail and entry.get('media_thumbnail'):
+            thumbnail = entry['media_thumbnail'][0].get('url', '')
 
         items.append({
             'url': video_url,
             'title': entry.get('title', ''),
-            'content': entry.get('summary', entry.get('title', '')),
+            'content': entry.get('summary') or entry.get('title', ''),
             'meta': {
                 'type': 'youtube',
                 'channel_name': channel_name,
@@ -270,15 +336,120 @@ def parse_youtube_channel(channel_url: str) -> List[Dict]:
     return items
 
 
-def parse_rss_feed(feed_url: str) -> List[Dict]:
-    """Parse a generic RSS/Atom feed. Returns list of link dicts."""
-    parsed = feedparser.parse(feed_url)
+_ATOM_NS = '{http://www.w3.org/2005/Atom}'
+_DC_NS = '{http://purl.org/dc/elements/1.1/}'
+_MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+
+
+def _xml_text(elem) -> str:
+    if elem is None:
+        return ''
+    return ''.join(elem.itertext()).strip()
+
+
+def _strip_tags(html: str) -> str:
+    return re.sub(r'<[^>]+>', '', html).strip()
+
+
+def _rss_entry(item) -> Dict:
+    link = _xml_text(item.find('link'))
+    if not link:
+        # Like feedparser: a permalink guid stands in for a missing <link>
+        guid = item.find('guid')
+        if guid is not None and guid.get('isPermaLink', 'true').lower() != 'false':
+            link = _xml_text(guid)
+    return {
+        'link': link,
+        'title': _xml_text(item.find('title')),
+        # Summaries are plain text here; feedparser's would be sanitized
+        # HTML, which every caller strips anyway
+        'summary': _strip_tags(_xml_text(item.find('description'))),
+        'published': _xml_text(item.find('pubDate')) or _xml_text(item.find(f'{_DC_NS}date')),
+        'author': _xml_text(item.find('author')) or _xml_text(item.find(f'{_DC_NS}creator')),
+    }
+
+
+def _atom_entry(entry) -> Dict:
+    link = ''
+    for el in entry.findall(f'{_ATOM_NS}link'):
+        if el.get('rel', 'alternate') == 'alternate':
+            link = el.get('href', '')
+            break
+    summary = entry.find(f'{_ATOM_NS}summary')
+    if summary is None:
+        summary = entry.find(f'{_ATOM_NS}content')
+    if summary is None:
+        # YouTube puts the video description in media:group
+        summary = entry.find(f'{_MEDIA_NS}group/{_MEDIA_NS}description')
+    thumb = entry.find(f'{_MEDIA_NS}group/{_MEDIA_NS}thumbnail')
+    return {
+        'link': link,
+        'title': _xml_text(entry.find(f'{_ATOM_NS}title')),
+        'summary': _strip_tags(_xml_text(summary)),
+        'thumbnail': thumb.get('url', '') if thumb is not None else '',
+        'published': _xml_text(entry.find(f'{_ATOM_NS}published')) or _xml_text(entry.find(f'{_ATOM_NS}updated')),
+        'author': _xml_text(entry.find(f'{_ATOM_NS}author/{_ATOM_NS}name')),
+    }
+
+
+def iterparse_feed(data: bytes, limit: int = MAX_ITEMS_PER_FEED):
+    """Pull-parse the first `limit` entries of an RSS 2.0 or Atom feed.
+
+    Stops reading once `limit` entries have been seen and clears each
+    entry element as it goes, so long feed archives are never fully built
+    in memory. Returns (feed_title, entries) with feedparser-style entry
+    keys, or None if the document isn't plain RSS 2.0/Atom or doesn't
+    parse (callers then fall back to feedparser).
+    """
+    feed_title = ''
+    entries = []
+    path = []
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(data), events=('start', 'end')):
+            if event == 'start':
+                if not path and elem.tag not in ('rss', f'{_ATOM_NS}feed'):
+                    return None
+                path.append(elem.tag)
+                continue
+            path.pop()
+            parent = path[-1] if path else None
+            if elem.tag == 'item' and parent == 'channel':
+                entries.append(_rss_entry(elem))
+            elif elem.tag == f'{_ATOM_NS}entry' and parent == f'{_ATOM_NS}feed':
+                entries.append(_atom_entry(elem))
+            else:
+                if parent in ('channel', f'{_ATOM_NS}feed') and elem.tag in ('title', f'{_ATOM_NS}title'):
+                    feed_title = _xml_text(elem)
+                continue
+            elem.clear()
+            if len(entries) >= limit:
+                break
+    except ET.ParseError:
+        return None
+    return (feed_title, entries) if entries else None
+
 
+def _feed_entries(data: bytes, what: str):
+    """(feed_title, entries) for a downloaded feed: the iterparse fast path,
+    falling back to feedparser for anything it doesn't handle."""
+    fast = iterparse_feed(data, MAX_ITEMS_PER_FEED)
+    if fast is not None:
+        return fast
+    parsed = feedparser.parse(data)
     if parsed.bozo and not parsed.entries:
-        raise Exception(f"Failed to parse RSS: {parsed.bozo_exception}")
+        raise Exception(f"Failed to parse {what}: {parsed.bozo_exception}")
+    return parsed.feed.get('title', ''), parsed.entries[:MAX_ITEMS_PER_FEED]
+
+
+def parse_rss_feed(feed_url: str, validators: Optional[Dict] = None) -> List[Dict]:
+    """Parse a generic RSS/Atom feed. Returns list of link dicts.
+
+    Pass validators to make the fetch conditional (see fetch_feed_bytes).
+    """
+    feed_title, entries = _feed_entries(fetch_feed_bytes(feed_url, validators=validators), "RSS")
 
     items = []
-    for entry in parsed.entries[:MAX_ITEMS_PER_FEED]:
+    for entry in entries:
         link = entry.get('link', '')
         if not link:
             continue
@@ -286,7 +457,7 @@ def parse_rss_feed(feed_url: str) -> List[Dict]:
         summary = entry.get('summary', entry.get('description', ''))
         # Strip HTML tags from summary
         if summary:
-            summary = re.sub(r'<[^>]+>', '', summary).strip()
+            summary = _strip_tags(summary)
 
         items.append({
             'url': link,
@@ -294,7 +465,7 @@ def parse_rss_feed(feed_url: str) -> List[Dict]:
             'content': summary,
             'meta': {
                 'type': 'rss',
-                'feed_title': parsed.feed.get('title', ''),
+                'feed_title': feed_title,
                 'published': entry.get('published', ''),
                 'author': entry.get('author', ''),
             }
@@ -325,25 +496,19 @@ def parse_reddit_feed(subreddit_url: str) -> List[Dict]:
     rss_url = normalize_reddit_url(subreddit_url)
 
     # Reddit requires a custom User-Agent
-    resp = requests.get(rss_url, timeout=15, headers={
+    feed_title, entries = _feed_entries(fetch_feed_bytes(rss_url, headers={
         'User-Agent': 'LinkDiscovery/1.0 (feed aggregator)'
-    })
-    resp.raise_for_status()
-
-    parsed = feedparser.parse(resp.text)
-
-    if parsed.bozo and not parsed.entries:
-        raise Exception(f"Failed to parse Reddit RSS: {parsed.bozo_exception}")
+    }), "Reddit RSS")
 
     items = []
-    for entry in parsed.entries[:MAX_ITEMS_PER_FEED]:
+    for entry in entries:
         link = entry.get('link', '')
         if not link:
             continue
 
         summary = entry.get('summary', '')
         if summary:
-            summary = re.sub(r'<[^>]+>', '', summary).strip()
+            summary = _strip_tags(summary)
             # Reddit summaries can be very long; truncate
             summary = summary[:2000]
 
@@ -355,7 +520,7 @@ def parse_reddit_feed(subreddit_url: str) -> List[Dict]:
             'content': f"{title}. {summary}" if summary else title,
             'meta': {
                 'type': 'reddit',
-                'subreddit': parsed.feed.get('title', ''),
+                'subreddit': feed_title,
                 'published': entry.get('published', ''),
                 'author': entry.get('author', ''),
             }
@@ -376,7 +541,7 @@ def parse_bluesky_feed(handle_or_url: str) -> List[Dict]:
     handle = handle.lstrip('@')
 
     api_url = f"https://public.api.bsky.app/xrpc/app.bsky.feed.getAuthorFeed?actor={handle}&limit={MAX_ITEMS_PER_FEED}"
-    resp = requests.get(api_url, timeout=15)
+    resp = _session.get(api_url, timeout=15)
     resp.raise_for_status()
     data = resp.json()
 
@@ -434,8 +599,7 @@ def parse_bluesky_feed(handle_or_url: str) -> List[Dict]:
 # ——— Legacy helpers (kept for compatibility) ————————————————
 
 def scrape_youtube(url: str) -> Dict:
-    extractor = ContentExtractor()
-    result = extractor.extract_youtube_content(url)
+    result = _extractor.extract_youtube_content(url)
     return {
         'title': result['title'],
         'description': result['transcript'],  # Legacy: returns video description
@@ -447,8 +611,7 @@ def scrape_youtube(url: str) -> Dict:
 
 
 def scrape_article(url: str) -> Dict:
-    extractor = ContentExtractor()
-    result = extractor.extract_website_content(url)
+    result = _extractor.extract_website_content(url)
     return {
         'title': result['title'],
         'description': result['main_text'],  # Legacy: returns full main_text
@@ -459,22 +622,191 @@ def scrape_article(url: str) -> Dict:
 
 # ——— Vectorization ——————————————————————————————————————————
 
+# Decimal places kept per embedding component (~float16 precision is 3).
+# Rounding in float64 makes each value print as a short literal
+# ("0.03125" instead of "0.031249999068677425"), roughly halving the
+# vector text sent to Postgres on every insert; cosine scores move by <1e-4.
+EMBED_DECIMALS = 5
+
+
+def _round_embedding(emb) -> List[float]:
+    return emb.astype('float64').round(EMBED_DECIMALS).tolist()
+
+
+# Model and output settings. Each one changes the stored vectors, so all
+# of them are folded into the embedding cache key (see _embed_key).
+EMBED_MODEL = 'all-MiniLM-L6-v2'
+EMBED_NORMALIZE = True
+
+# Texts per forward pass. Larger batches amortize per-call overhead; 32-64
+# suits CPU, go higher on a GPU.
+EMBED_BATCH_SIZE = int(os.getenv('EMBED_BATCH_SIZE', '32'))
+
+
 class TextVectorizer:
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    # Embeddings come out unit-length (all-MiniLM-L6-v2 already ends in a
+    # Normalize layer; the flag keeps that true for any other model), so
+    # the HNSW cosine index on links.content_vector sees comparable norms.
+    def __init__(self, model_name: str = EMBED_MODEL):
         self.model = SentenceTransformer(model_name)
+        # torch already spreads one encode() over all cores; concurrent
+        # callers (sync workers, scratchpad ingests) take turns instead of
+        # oversubscribing the CPU
+        self._encode_lock = threading.Lock()
 
     def vectorize(self, text: str) -> List[float]:
         if not text or not text.strip():
             return [0.0] * 384
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        with self._encode_lock:
+            embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=EMBED_NORMALIZE)
+        return _round_embedding(embedding)
+
+    def vectorize_batch(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[List[float]]:
+        """Encode many texts in one model call. Blank texts get zero vectors."""
+        results = [[0.0] * 384 for _ in texts]
+        idx = [i for i, t in enumerate(texts) if t and t.strip()]
+        if idx:
+            with self._encode_lock:
+                embeddings = self.model.encode([texts[i] for i in idx], batch_size=batch_size,
+                                               convert_to_numpy=True, normalize_embeddings=EMBED_NORMALIZE)
+            for i, emb in zip(idx, embeddings):
+                results[i] = _round_embedding(emb)
+        return results
 
 
 _vectorizer = None
+_vectorizer_lock = threading.Lock()
 
 
-def vectorize(text: str) -> List[float]:
+def _get_vectorizer() -> TextVectorizer:
+    # Feed syncs run in worker threads; load the model only once
     global _vectorizer
     if _vectorizer is None:
-        _vectorizer = TextVectorizer()
-    return _vectorizer.vectorize(text)
+        with _vectorizer_lock:
+            if _vectorizer is None:
+                _vectorizer = TextVectorizer()
+    return _vectorizer
+
+
+EMBED_MAX_BYTES = 5000  # the model only reads ~256 tokens anyway
+_EMBED_CACHE_MAX = 4096
+
+# _embed_key(text) -> vector; feeds repost the same text across syncs
+_embed_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+_embed_cache_lock = threading.Lock()
+
+
+def _clip_utf8(text: str, max_bytes: int = EMBED_MAX_BYTES) -> str:
+    """Truncate to at most max_bytes of UTF-8 without splitting a character."""
+    if len(text) * 4 <= max_bytes:
+        return text
+    # Every char is at least one byte, so never encode more than max_bytes chars
+    data = text[:max_bytes].encode('utf-8')
+    if len(data) <= max_bytes:
+        return text[:max_bytes]
+    return data[:max_bytes].decode('utf-8', 'ignore')
+
+
+# Prefixed to every hashed text, so vectors cached in embeddings_cache by
+# an older model or output config are never served after a change.
+_EMBED_KEY_PREFIX = f"{EMBED_MODEL}|normalize={EMBED_NORMALIZE}|decimals={EMBED_DECIMALS}\n".encode('utf-8')
+
+
+def _embed_key(text: str) -> bytes:
+    h = hashlib.blake2b(_EMBED_KEY_PREFIX, digest_size=16)
+    h.update(text.encode('utf-8'))
+    return h.digest()
+
+
+def _cache_get(key: bytes) -> Optional[List[float]]:
+    with _embed_cache_lock:
+        vec = _embed_cache.get(key)
+        if vec is not None:
+            _embed_cache.move_to_end(key)
+        return vec
+
+
+def _cache_put(key: bytes, vec: List[float]):
+    with _embed_cache_lock:
+        _embed_cache[key] = vec
+        _embed_cache.move_to_end(key)
+        while len(_embed_cache) > _EMBED_CACHE_MAX:
+            _embed_cache.popitem(last=False)
+
+
+# Second tier: embeddings_cache table (migrations/embeddings_cache.sql),
+# shared across processes and restarts. None = not probed yet.
+_embeddings_table_exists = None
+
+
+def _db_cache_get(keys: List[bytes]) -> Dict[bytes, List[float]]:
+    global _embeddings_table_exists
+    if _embeddings_table_exists is False or not keys:
+        return {}
+    try:
+        rows = query(
+            "SELECT hash, vector::text AS vector FROM embeddings_cache WHERE hash = ANY(%s)",
+            ([psycopg2.Binary(k) for k in keys],)
+        )
+        _embeddings_table_exists = True
+        return {bytes(r['hash']): json.loads(r['vector']) for r in rows}
+    except Exception as e:
+        # 42P01 = undefined_table; otherwise just embed without the cache
+        if getattr(e, 'pgcode', None) == '42P01':
+            _embeddings_table_exists = False
+        else:
+            log.warning("Embedding cache lookup failed: %s", e)
+        return {}
+
+
+def _db_cache_put(vectors: Dict[bytes, List[float]]):
+    if not _embeddings_table_exists or not vectors:
+        return
+    try:
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    "INSERT INTO embeddings_cache (hash, vector) VALUES %s ON CONFLICT (hash) DO NOTHING",
+                    [(psycopg2.Binary(k), json.dumps(v, separators=(',', ':'))) for k, v in vectors.items()],
+                    template="(%s, %s::vector)",
+                )
+    except Exception as e:
+        log.warning("Embedding cache store failed: %s", e)
+
+
+def _embed(pending: Dict[bytes, str]) -> Dict[bytes, List[float]]:
+    """Embed texts keyed by hash: process LRU, then embeddings_cache, then the model."""
+    found = {}
+    for key in pending:
+        vec = _cache_get(key)
+        if vec is not None:
+            found[key] = vec
+    misses = {k: t for k, t in pending.items() if k not in found}
+    if misses:
+        stored = _db_cache_get(list(misses))
+        for key, vec in stored.items():
+            _cache_put(key, vec)
+        found.update(stored)
+        misses = {k: t for k, t in misses.items() if k not in stored}
+    if misses:
+        computed = dict(zip(misses, _get_vectorizer().vectorize_batch(list(misses.values()))))
+        for key, vec in computed.items():
+            _cache_put(key, vec)
+        _db_cache_put(computed)
+        found.update(computed)
+    return found
+
+
+def vectorize(text: str) -> List[float]:
+    text = _clip_utf8(text or '')
+    key = _embed_key(text)
+    return _embed({key: text})[key]
+
+
+def vectorize_batch(texts: List[str]) -> List[List[float]]:
+    """Embed many texts, skipping ones already embedded (or repeated in the batch)."""
+    texts = [_clip_utf8(t or '') for t in texts]
+    keys = [_embed_key(t) for t in texts]
+    found = _embed(dict(zip(keys, texts)))
+    return [found[k] for k in keys]
@@ -4,10 +4,15 @@ Feed Ingestion System + Director -- FastAPI Application
 
 import os
 import json
+import logging
+import logging.handlers
+import queue
 import uuid
 import asyncio
+import hashlib
+import heapq
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from typing import Optional
@@ -15,28 +20,47 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, BackgroundTasks, Form, Request, Response, HTTPException, Depends
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 import secrets
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import StreamingResponse
 from db_compat import CompatClient
+from db import run_db, get_pool, close_pool, query, query_one, execute, get_conn_transaction
+from psycopg2.errors import UniqueViolation
 from pydantic import BaseModel
 
-from ingest import (
-    parse_youtube_channel, parse_rss_feed, parse_reddit_feed,
-    parse_bluesky_feed, scrape_article, vectorize
-)
+from ingest import vectorize
 from director import Director
 from gatherer import RSSGatherer, GatherScheduler
-from worker import start_background_worker, stop_background_worker, get_worker_status, run_processing_batch, is_worker_running
+from worker import start_background_worker, stop_background_worker, get_worker_status, run_processing_batch, is_worker_running, _get_batch_lock
+from backoff import get_backoff_status_many
+from ai_engine import AIEngine as _AIEngine, _personas_list_cache
+from feed_sync import start_sync_workers, stop_sync_workers, enqueue_feed_sync, sync_all_feeds, cancel_all_syncs
 from scratchpad_routes import register_scratchpad_routes
 from user_utils import generate_display_name
 
 import ingest as ingest_module
-from scratchpad_api import router as scratchpad_router, init as scratchpad_init, normalize_url, get_reddit_api_status
+from scratchpad_api import router as scratchpad_router, init as scratchpad_init, get_reddit_api_status
 from ai_routes import create_ai_router
 
 load_dotenv()
 
+# The app's module loggers hand records to a queue; a listener thread
+# does the stdout writes, so sync workers and the event loop never block
+# on log I/O. LOG_LEVEL=DEBUG brings back per-feed chatter. Only these
+# loggers are configured: the root logger and third-party libraries
+# (httpx, urllib3, sentence-transformers) keep their defaults.
+_APP_LOGGERS = ("feed_sync", "ingest")
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("[%(name)s] %(levelname)s %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_handler = logging.handlers.QueueHandler(_log_queue)
+for _name in _APP_LOGGERS:
+    _logger = logging.getLogger(_name)
+    _logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    _logger.addHandler(_log_handler)
+    _logger.propagate = False
+
 supabase = CompatClient()  # Direct postgres via psycopg2
 
 # ============================================================
@@ -81,19 +105,39 @@ gather_scheduler = GatherScheduler(gatherer, interval_hours=4.0)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Open the DB pool before serving so the first requests (and the
+    # director's first tick) don't pay for connection setup
+    await run_db(get_pool)
+    _log_listener.start()
     # Auto-start the director, gather scheduler, and background worker
     director.start()
     gather_scheduler.start()
     start_background_worker(interval_seconds=90)  # Run processing batch every 90 seconds
+    start_ai_dispatcher()
+    start_sync_workers()
     print("[App] Ready. Director, GatherScheduler, and Worker auto-started.")
     yield
     director.stop()
     gather_scheduler.stop()
     stop_background_worker()
+    stop_ai_dispatcher()
+    stop_sync_workers()
     await gatherer.close()
+    if _ai_engine is not None:
+        await _ai_engine.close()
+    close_pool()
+    _log_listener.stop()
 
 
-app = FastAPI(title="Linksite", lifespan=lifespan)
+# orjson encodes JSON responses several times faster than the stdlib;
+# fall back to JSONResponse where it isn't installed yet.
+try:
+    import orjson  # noqa: F401 -- required by ORJSONResponse
+    _default_response_class = ORJSONResponse
+except ImportError:
+    _default_response_class = JSONResponse
+
+app = FastAPI(title="Linksite", lifespan=lifespan, default_response_class=_default_response_class)
 
 # ============================================================
 # Admin Authentication (HTTP Basic Auth)
@@ -143,6 +187,74 @@ app.include_router(ai_router)
 
 # --- User Identity Middleware ---
 
+# user_id -> display_name for users known to exist, so repeat requests skip
+# the users lookup. Bounded LRU; evicted ids are just looked up again.
+_known_users = OrderedDict()
+_KNOWN_USERS_MAX = 10000
+# user_id -> (insert task, display_name) for users rows still being
+# created. An id only moves into _known_users once its row exists.
+_user_inserts: dict = {}
+
+
+def _remember_user(user_id: str, display_name: str):
+    _known_users[user_id] = display_name
+    _known_users.move_to_end(user_id)
+    while len(_known_users) > _KNOWN_USERS_MAX:
+        _known_users.popitem(last=False)
+
+
+def _insert_user(user_id: str, display_name: str):
+    try:
+        supabase.table("users").insert({
+            "id": user_id,
+            "display_name": display_name,
+        }).execute()
+    except UniqueViolation:
+        pass  # Already exists
+
+
+def _create_user_later(user_id: str, display_name: str):
+    """Insert the users row without holding up the response."""
+    task = asyncio.create_task(run_db(_insert_user, user_id, display_name))
+    _user_inserts[user_id] = (task, display_name)
+
+    def _done(t):
+        _user_inserts.pop(user_id, None)
+        if t.cancelled():
+            return
+        if t.exception() is not None:
+            # Not remembered: the next request looks the user up again
+            # and recreates the row
+            print(f"[Users] Creating user {user_id} failed: {t.exception()}")
+        else:
+            _remember_user(user_id, display_name)
+
+    task.add_done_callback(_done)
+
+
+async def _ensure_user_row(user_id: str):
+    """Wait for this user's row before writing rows that reference it.
+
+    A first vote or nomination can arrive while the background insert is
+    still running; if that insert failed, try it once more inline."""
+    pending = _user_inserts.get(user_id)
+    if pending is None:
+        return
+    task, display_name = pending
+    try:
+        await asyncio.shield(task)
+    except Exception:
+        await run_db(_insert_user, user_id, display_name)
+        _remember_user(user_id, display_name)
+
+
+def _lookup_display_name(user_id: str) -> Optional[str]:
+    resp = supabase.table("users").select("display_name").eq("id", user_id).execute()
+    if resp.data:
+        return resp.data[0].get("display_name") or "Anonymous"
+    return None
+
+
 @app.middleware("http")
 async def user_identity_middleware(request: Request, call_next):
     user_id = request.cookies.get("user_id")
@@ -153,30 +265,23 @@ async def user_identity_middleware(request: Request, call_next):
         user_id = str(uuid.uuid4())
         display_name = generate_display_name()
         new_user = True
-        try:
-            supabase.table("users").insert({
-                "id": user_id,
-                "display_name": display_name,
-            }).execute()
-        except Exception:
-            pass  # May already exist
+        _create_user_later(user_id, display_name)
+    elif user_id in _known_users:
+        display_name = _known_users[user_id]
+        _known_users.move_to_end(user_id)
+    elif user_id in _user_inserts:
+        display_name = _user_inserts[user_id][1]
     else:
         # Verify user exists, fetch display_name
         try:
-            resp = supabase.table("users").select("display_name").eq("id", user_id).execute()
-            if resp.data:
-                display_name = resp.data[0].get("display_name", "Anonymous")
+            display_name = await run_db(_lookup_display_name, user_id)
+            if display_name is not None:
+                _remember_user(user_id, display_name)
             else:
-                # Cookie references a deleted user â€” recreate
+                # Cookie references a deleted user — recreate
                 display_name = generate_display_name()
                 new_user = True
-                try:
-                    supabase.table("users").insert({
-                        "id": user_id,
-                        "display_name": display_name,
-                    }).execute()
-                except Exception:
-                    pass
+                _create_user_later(user_id, display_name)
         except Exception:
             display_name = "Anonymous"
 
@@ -217,10 +322,10 @@ async def api_create_user():
     user_id = str(uuid.uuid4())
     display_name = generate_display_name()
     try:
-        resp = supabase.table("users").insert({
+        resp = await run_db(supabase.table("users").insert({
             "id": user_id,
             "display_name": display_name,
-        }).execute()
+        }).execute)
         user = resp.data[0] if resp.data else {"id": user_id, "display_name": display_name}
     except Exception as e:
         raise HTTPException(500, f"Failed to create user: {e}")
@@ -230,7 +335,7 @@ async def api_create_user():
 @app.get("/api/user/{user_id}")
 async def api_get_user(user_id: str):
     """Get a user by ID. Used to verify a stored user still exists."""
-    resp = supabase.table("users").select("id, display_name, created_at, claimed").eq("id", user_id).execute()
+    resp = await run_db(supabase.table("users").select("id, display_name, created_at, claimed").eq("id", user_id).execute)
     if not resp.data:
         raise HTTPException(404, "User not found")
     return {"user": resp.data[0]}
@@ -297,8 +402,7 @@ input[type="text"], input[type="url"], input[type="number"], select {
 .log-entry { font-size: 13px; padding: 4px 0; border-bottom: 1px solid #f1f5f9; color: #475569; }
 """
 
-def _nav():
-    return """<nav>
+_NAV_HTML = """<nav>
         <span class="brand">Linksite</span>
         <a href="/browse">Browse</a>
         <a href="/add">+ Add</a>
@@ -309,25 +413,40 @@ def _nav():
         <a href="/" style="margin-left:auto;background:#2563eb;color:#fff;padding:6px 16px;border-radius:6px;font-size:14px;">Frontend &#10132;</a>
     </nav>"""
 
-
-def _page(title: str, body: str) -> str:
-    return f"""<!DOCTYPE html>
+# Page shell pieces around the title and body, built once at import time
+# (the CSS alone is several KB; no need to re-format it per request).
+_PAGE_HEAD_START = """<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1">
-<title>{title} - Linksite</title>
+<title>"""
+_PAGE_HEAD_END = f""" - Linksite</title>
 <style>{_CSS}</style>
 </head>
 <body>
-{_nav()}
+{_NAV_HTML}
 <div class="container">
-{body}
+"""
+_PAGE_TAIL = """
 </div>
 </body>
 </html>"""
 
 
+def _nav():
+    return _NAV_HTML
+
+
+def _page(title: str, body: str) -> str:
+    return "".join((_PAGE_HEAD_START, title, _PAGE_HEAD_END, body, _PAGE_TAIL))
+
+
+def _page_shell(title: str) -> tuple:
+    """(head, tail) of the admin page around the body, for streamed pages."""
+    return _PAGE_HEAD_START + title + _PAGE_HEAD_END, _PAGE_TAIL
+
+
 def _messages(message: Optional[str], error: Optional[str] = None) -> str:
     parts = []
     if message:
@@ -342,11 +461,26 @@ def _esc(s: str) -> str:
     return (s or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
 
 
+try:
+    from ciso8601 import parse_datetime as _parse_iso  # C parser, accepts "Z"
+except ImportError:
+    _parse_iso = None
+
+
+def _parse_ts(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp from the DB or global_state JSON."""
+    if _parse_iso is not None:
+        return _parse_iso(value)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
 # ============================================================
 # SSE Stream: GET /api/stream
 # ============================================================
 
-async def get_stream_state() -> dict:
+def get_stream_state() -> dict:
     """Build the full state snapshot for SSE heartbeat."""
     now = datetime.now(timezone.utc)
 
@@ -375,7 +509,7 @@ async def get_stream_state() -> dict:
         time_remaining = 0
         total_duration = int(_get_weight("rotation_default_sec", 120))
         if rotation_ends:
-            ends = datetime.fromisoformat(rotation_ends.replace("Z", "+00:00"))
+            ends = _parse_ts(rotation_ends)
             time_remaining = max(0, (ends - now).total_seconds())
 
         if link_data:
@@ -401,17 +535,17 @@ async def get_stream_state() -> dict:
         reveal_at = sat.get("reveal_at")
         revealed = True
         if reveal_at:
-            revealed = now >= datetime.fromisoformat(reveal_at.replace("Z", "+00:00"))
+            revealed = now >= _parse_ts(reveal_at)
 
         # Get nomination count for this satellite in current rotation
         nom_count = 0
         sat_link_id = sat.get("link_id")
         if sat_link_id:
             try:
-                nom_resp = supabase.table("nominations").select("id").eq(
+                nom_resp = supabase.table("nominations").select("id", count="exact", head=True).eq(
                     "link_id", sat_link_id
                 ).eq("rotation_id", rotation_id).execute()
-                nom_count = len(nom_resp.data or [])
+                nom_count = nom_resp.count or 0
             except Exception:
                 pass
 
@@ -475,7 +609,7 @@ async def event_stream():
                 except asyncio.TimeoutError:
                     # Heartbeat: send full state
                     try:
-                        state = await get_stream_state()
+                        state = await run_db(get_stream_state)
                         yield f"event: state\ndata: {json.dumps(state)}\n\n"
                     except Exception as e:
                         print(f"[SSE] Error in get_stream_state: {e}")
@@ -510,6 +644,115 @@ async def event_stream():
 # API: Reactions (vote/react)
 # ============================================================
 
+def _link_score(link_id: int) -> int:
+    """Sum of vote values for a link, aggregated in Postgres."""
+    row = query_one("SELECT COALESCE(SUM(value), 0) AS score FROM votes WHERE link_id = %s", (link_id,))
+    return int(row["score"])
+
+
+def _query_my_votes(link_id: int, user_id: str) -> dict:
+    """The user's vote count and last vote on a link (no link score).
+
+    For callers that already have the score from global_state's
+    current_score snapshot; reads only the user's own rows."""
+    row = query_one(
+        """
+        SELECT count(*) AS n, max(created_at) AS last_at
+        FROM votes WHERE link_id = %s AND user_id = %s
+        """,
+        (link_id, user_id)
+    )
+    last_at = row["last_at"]
+    return {
+        "my_votes_count": row["n"],
+        "my_last_vote_at": last_at.isoformat() if last_at else None,
+    }
+
+
+def _query_vote_summary(link_id: int, user_id: str) -> dict:
+    """Link score plus the user's vote count and last vote, in one query."""
+    row = query_one(
+        """
+        SELECT COALESCE(SUM(value), 0) AS score,
+               count(*) FILTER (WHERE user_id = %s) AS n,
+               max(created_at) FILTER (WHERE user_id = %s) AS last_at
+        FROM votes WHERE link_id = %s
+        """,
+        (user_id, user_id, link_id)
+    )
+    last_at = row["last_at"]
+    return {
+        "score": int(row["score"]),
+        "my_votes_count": row["n"],
+        "my_last_vote_at": last_at.isoformat() if last_at else None,
+    }
+
+
+# Polling clients hit /api/now and /votes every few seconds for the same
+# link; a short TTL collapses those into one query per (link, user).
+_vote_summary_cache = {}  # (link_id, user_id, with_score) -> (expires_at, summary)
+_VOTE_SUMMARY_TTL = 2  # seconds
+_VOTE_SUMMARY_MAX = 4096
+
+
+async def _vote_summary(link_id: int, user_id: str, with_score: bool = True) -> dict:
+    """Cached vote summary; with_score=False skips summing the link's votes."""
+    key = (link_id, user_id, with_score)
+    now = time.monotonic()
+    hit = _vote_summary_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+    fn = _query_vote_summary if with_score else _query_my_votes
+    summary = await run_db(fn, link_id, user_id)
+    if len(_vote_summary_cache) >= _VOTE_SUMMARY_MAX:
+        for k in [k for k, (exp, _) in _vote_summary_cache.items() if exp <= now]:
+            del _vote_summary_cache[k]
+        if len(_vote_summary_cache) >= _VOTE_SUMMARY_MAX:
+            _vote_summary_cache.clear()
+    _vote_summary_cache[key] = (now + _VOTE_SUMMARY_TTL, summary)
+    return summary
+
+
+def _insert_vote_if_cooled_down(user_id: str, link_id: int, value: int, cooldown_sec: float) -> bool:
+    """Insert a vote unless the user voted within the cooldown. True if inserted.
+
+    The check and insert share one transaction under a per-user advisory
+    lock, so concurrent requests from the same user can't both pass."""
+    with get_conn_transaction() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT pg_advisory_xact_lock(hashtext(%s));
+                INSERT INTO votes (user_id, link_id, value)
+                SELECT %s, %s, %s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM votes
+                    WHERE user_id = %s AND created_at > now() - make_interval(secs => %s)
+                )
+                RETURNING id
+                """,
+                (user_id, user_id, link_id, value, user_id, cooldown_sec)
+            )
+            return cur.fetchone() is not None
+
+
+def _update_current_score(link_id: int, score: int):
+    """Keep global_state's current-link snapshot in step with votes on it."""
+    if director._has_snapshot_cols:
+        try:
+            execute(
+                """
+                UPDATE global_state
+                SET current_score = %s,
+                    current_link_json = jsonb_set(current_link_json, '{direct_score}', to_jsonb(%s))
+                WHERE id = 1 AND current_link_id = %s AND current_link_json IS NOT NULL
+                """,
+                (score, score, link_id)
+            )
+        except Exception as e:
+            print(f"[Votes] Snapshot update failed: {e}")
+
+
 @app.post("/api/links/{link_id}/react")
 async def react_to_link(link_id: int, vote: VoteRequest, request: Request):
     """React to a link: +1 (like) or -1 (dislike). Affects score and timer."""
@@ -517,29 +760,27 @@ async def react_to_link(link_id: int, vote: VoteRequest, request: Request):
         raise HTTPException(400, "value must be 1 or -1")
 
     user_id = request.state.user_id
+    await _ensure_user_row(user_id)
 
     # Cooldown check
-    cooldown_sec = _get_weight("vote_cooldown_sec", 10)
-    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=cooldown_sec)).isoformat()
-    recent = supabase.table("votes").select("id").eq(
-        "user_id", user_id
-    ).gte("created_at", cutoff).limit(1).execute()
-
-    if recent.data:
+    cooldown_sec = await run_db(_get_weight, "vote_cooldown_sec", 10)
+
+    def _apply_vote():
+        if not _insert_vote_if_cooled_down(user_id, link_id, vote.value, cooldown_sec):
+            return None
+        # Update direct_score on the link
+        score = _link_score(link_id)
+        supabase.table("links").update({"direct_score": score}).eq("id", link_id).execute()
+        _update_current_score(link_id, score)
+        return score
+
+    new_score = await run_db(_apply_vote)
+    # voter sees their vote at once
+    _vote_summary_cache.pop((link_id, user_id, True), None)
+    _vote_summary_cache.pop((link_id, user_id, False), None)
+    if new_score is None:
         raise HTTPException(429, f"Cooldown: wait {cooldown_sec}s between votes")
 
-    # Insert vote
-    supabase.table("votes").insert({
-        "user_id": user_id,
-        "link_id": link_id,
-        "value": vote.value,
-    }).execute()
-
-    # Update direct_score on the link
-    all_votes = supabase.table("votes").select("value").eq("link_id", link_id).execute()
-    new_score = sum(v["value"] for v in (all_votes.data or []))
-    supabase.table("links").update({"direct_score": new_score}).eq("id", link_id).execute()
-
     # Broadcast reaction event
     record_action({
         "type": "react",
@@ -562,20 +803,7 @@ async def vote_on_link(link_id: int, vote: VoteRequest, request: Request):
 async def get_link_votes(link_id: int, request: Request):
     user_id = request.state.user_id
 
-    # Total score
-    all_votes = supabase.table("votes").select("value").eq("link_id", link_id).execute()
-    score = sum(v["value"] for v in (all_votes.data or []))
-
-    # My votes on this link
-    my_votes = supabase.table("votes").select("value, created_at").eq(
-        "link_id", link_id
-    ).eq("user_id", user_id).order("created_at", desc=True).execute()
-
-    return {
-        "score": score,
-        "my_votes_count": len(my_votes.data or []),
-        "my_last_vote_at": my_votes.data[0]["created_at"] if my_votes.data else None,
-    }
+    return dict(await _vote_summary(link_id, user_id))
 
 
 # ============================================================
@@ -586,52 +814,56 @@ async def get_link_votes(link_id: int, request: Request):
 async def nominate_link(link_id: int, body: NominateRequest, request: Request):
     """Nominate a satellite link to be featured next."""
     user_id = body.user_id or request.state.user_id
+    await _ensure_user_row(user_id)
 
-    # Get current rotation_id (started_at from global_state)
-    state = supabase.table("global_state").select("started_at, satellites").eq("id", 1).execute()
-    gs = state.data[0] if state.data else {}
-    rotation_id = gs.get("started_at", "")
+    def _apply_nomination():
+        # Get current rotation_id (started_at from global_state)
+        state = supabase.table("global_state").select("started_at, satellites").eq("id", 1).execute()
+        gs = state.data[0] if state.data else {}
+        rotation_id = gs.get("started_at", "")
 
-    if not rotation_id:
-        raise HTTPException(400, "No active rotation")
+        if not rotation_id:
+            raise HTTPException(400, "No active rotation")
 
-    # Check that link_id is actually a satellite in the current rotation
-    satellites = gs.get("satellites") or []
-    sat_ids = [s.get("link_id") for s in satellites]
-    if link_id not in sat_ids:
-        raise HTTPException(400, "Link is not a current satellite")
+        # Check that link_id is actually a satellite in the current rotation
+        satellites = gs.get("satellites") or []
+        sat_ids = [s.get("link_id") for s in satellites]
+        if link_id not in sat_ids:
+            raise HTTPException(400, "Link is not a current satellite")
 
-    # Check if user already nominated in this rotation
-    existing = supabase.table("nominations").select("id").eq(
-        "user_id", user_id
-    ).eq("rotation_id", rotation_id).execute()
+        # Check if user already nominated in this rotation
+        existing = supabase.table("nominations").select("id").eq(
+            "user_id", user_id
+        ).eq("rotation_id", rotation_id).execute()
 
-    if existing.data:
-        # Update existing nomination to new link
-        supabase.table("nominations").update({
-            "link_id": link_id,
-        }).eq("id", existing.data[0]["id"]).execute()
-    else:
-        # Insert new nomination
-        supabase.table("nominations").insert({
-            "link_id": link_id,
-            "user_id": user_id,
-            "rotation_id": rotation_id,
-        }).execute()
+        if existing.data:
+            # Update existing nomination to new link
+            supabase.table("nominations").update({
+                "link_id": link_id,
+            }).eq("id", existing.data[0]["id"]).execute()
+        else:
+            # Insert new nomination
+            supabase.table("nominations").insert({
+                "link_id": link_id,
+                "user_id": user_id,
+                "rotation_id": rotation_id,
+            }).execute()
 
-    # Apply +0.5 score boost to the nominated link
-    link_resp = supabase.table("links").select("direct_score").eq("id", link_id).execute()
-    if link_resp.data:
-        current_score = link_resp.data[0].get("direct_score", 0) or 0
-        supabase.table("links").update({
-            "direct_score": current_score + 0.5
-        }).eq("id", link_id).execute()
+        # Apply +0.5 score boost to the nominated link
+        link_resp = supabase.table("links").select("direct_score").eq("id", link_id).execute()
+        if link_resp.data:
+            current_score = link_resp.data[0].get("direct_score", 0) or 0
+            supabase.table("links").update({
+                "direct_score": current_score + 0.5
+            }).eq("id", link_id).execute()
+
+        # Get nomination count for this link in this rotation
+        nom_resp = supabase.table("nominations").select("id", count="exact", head=True).eq(
+            "link_id", link_id
+        ).eq("rotation_id", rotation_id).execute()
+        return nom_resp.count or 0
 
-    # Get nomination count for this link in this rotation
-    nom_resp = supabase.table("nominations").select("id").eq(
-        "link_id", link_id
-    ).eq("rotation_id", rotation_id).execute()
-    nom_count = len(nom_resp.data or [])
+    nom_count = await run_db(_apply_nomination)
 
     # Broadcast nomination event
     record_action({
@@ -646,15 +878,16 @@ async def nominate_link(link_id: int, body: NominateRequest, request: Request):
 @app.get("/api/links/{link_id}/nominations")
 async def get_link_nominations(link_id: int):
     """Get nomination count for a link in the current rotation."""
-    state = supabase.table("global_state").select("started_at").eq("id", 1).execute()
-    gs = state.data[0] if state.data else {}
-    rotation_id = gs.get("started_at", "")
+    def _count():
+        state = supabase.table("global_state").select("started_at").eq("id", 1).execute()
+        gs = state.data[0] if state.data else {}
+        rotation_id = gs.get("started_at", "")
 
-    nom_resp = supabase.table("nominations").select("id").eq(
-        "link_id", link_id
-    ).eq("rotation_id", rotation_id).execute()
+        return supabase.table("nominations").select("id", count="exact", head=True).eq(
+            "link_id", link_id
+        ).eq("rotation_id", rotation_id).execute().count or 0
 
-    return {"link_id": link_id, "nominations": len(nom_resp.data or [])}
+    return {"link_id": link_id, "nominations": await run_db(_count)}
 
 
 # ============================================================
@@ -666,68 +899,80 @@ async def api_now(request: Request):
     user_id = request.state.user_id
     now = datetime.now(timezone.utc)
 
-    state = supabase.table("global_state").select("*").eq("id", 1).execute()
+    state = await run_db(supabase.table("global_state").select("*").eq("id", 1).execute)
     if not state.data or not state.data[0].get("current_link_id"):
         return {"link": None, "message": "Director not running or no link selected"}
 
     gs = state.data[0]
     link_id = gs["current_link_id"]
-
-    # Get current link
-    link_resp = supabase.table("links").select(
-        "id, url, title, meta_json, direct_score, feed_id"
-    ).eq("id", link_id).execute()
-    link = link_resp.data[0] if link_resp.data else None
-
-    # Get tags via feed_tags
-    tags = []
-    if link and link.get("feed_id"):
-        ft_resp = supabase.table("feed_tags").select(
-            "tag_id"
-        ).eq("feed_id", link["feed_id"]).execute()
-        tag_ids = [ft["tag_id"] for ft in (ft_resp.data or [])]
-        if tag_ids:
-            tags_resp = supabase.table("tags").select(
-                "name, slug"
-            ).in_("id", tag_ids).execute()
-            tags = tags_resp.data or []
-
-    # Get satellites with reveal status and nomination counts
     satellites = gs.get("satellites") or []
     rotation_id = gs.get("started_at", "")
+
+    def _fetch_link_and_tags():
+        # Get current link, then its tags via feed_tags
+        link_resp = supabase.table("links").select(
+            "id, url, title, meta_json, direct_score, feed_id"
+        ).eq("id", link_id).execute()
+        link = link_resp.data[0] if link_resp.data else None
+
+        tags = []
+        if link and link.get("feed_id"):
+            ft_resp = supabase.table("feed_tags").select(
+                "tag_id"
+            ).eq("feed_id", link["feed_id"]).execute()
+            tag_ids = [ft["tag_id"] for ft in (ft_resp.data or [])]
+            if tag_ids:
+                tags_resp = supabase.table("tags").select(
+                    "name, slug"
+                ).in_("id", tag_ids).execute()
+                tags = tags_resp.data or []
+        return link, tags
+
+    def _nomination_count(sat_link_id):
+        try:
+            return supabase.table("nominations").select("id", count="exact", head=True).eq(
+                "link_id", sat_link_id
+            ).eq("rotation_id", rotation_id).execute().count or 0
+        except Exception:
+            return 0
+
+    # Everything below depends only on global_state -- fetch concurrently
+    sat_link_ids = [sat.get("link_id") for sat in satellites if sat.get("link_id")]
+    snapshot = gs.get("current_link_json")
+    if snapshot and snapshot.get("id") == link_id:
+        # Director stored the link, tags and score with the rotation;
+        # only the caller's own votes need reading
+        link, tags = snapshot, gs.get("current_tags_json") or []
+        votes, *nom_counts = await asyncio.gather(
+            _vote_summary(link_id, user_id, with_score=False),
+            *(run_db(_nomination_count, sid) for sid in sat_link_ids),
+        )
+        score = gs.get("current_score") or 0
+    else:
+        (link, tags), votes, *nom_counts = await asyncio.gather(
+            run_db(_fetch_link_and_tags),
+            _vote_summary(link_id, user_id),
+            *(run_db(_nomination_count, sid) for sid in sat_link_ids),
+        )
+        score = votes["score"]
+    noms_by_link = dict(zip(sat_link_ids, nom_counts))
+
+    # Satellites with reveal status and nomination counts
     for sat in satellites:
         reveal_at = sat.get("reveal_at")
         if reveal_at:
-            sat["revealed"] = now >= datetime.fromisoformat(
-                reveal_at.replace("Z", "+00:00")
-            )
+            sat["revealed"] = now >= _parse_ts(reveal_at)
         else:
             sat["revealed"] = True
 
-        # Add nomination count
-        sat_link_id = sat.get("link_id")
-        if sat_link_id:
-            try:
-                nom_resp = supabase.table("nominations").select("id").eq(
-                    "link_id", sat_link_id
-                ).eq("rotation_id", rotation_id).execute()
-                sat["nominations"] = len(nom_resp.data or [])
-            except Exception:
-                sat["nominations"] = 0
-
-    # Vote counts
-    all_votes = supabase.table("votes").select("value").eq("link_id", link_id).execute()
-    score = sum(v["value"] for v in (all_votes.data or []))
-
-    my_votes = supabase.table("votes").select("created_at").eq(
-        "link_id", link_id
-    ).eq("user_id", user_id).order("created_at", desc=True).execute()
+        if sat.get("link_id"):
+            sat["nominations"] = noms_by_link.get(sat["link_id"], 0)
 
     # Timers
     rotation_ends = gs.get("rotation_ends_at")
     seconds_remaining = 0
     if rotation_ends:
-        ends = datetime.fromisoformat(rotation_ends.replace("Z", "+00:00"))
+        ends = _parse_ts(rotation_ends)
         seconds_remaining = max(0, int((ends - now).total_seconds()))
 
     return {
@@ -742,8 +987,8 @@ async def api_now(request: Request):
         },
         "votes": {
             "score": score,
-            "my_votes_count": len(my_votes.data or []),
-            "my_last_vote_at": my_votes.data[0]["created_at"] if my_votes.data else None,
+            "my_votes_count": votes["my_votes_count"],
+            "my_last_vote_at": votes["my_last_vote_at"],
         },
         "selection_reason": gs.get("selection_reason"),
         "viewer_count": len(connected_clients),
@@ -754,24 +999,37 @@ async def api_now(request: Request):
 # API: Tags
 # ============================================================
 
+# Tag scores only move when the director propagates; serve from memory
+_top_tags_cache = {"data": None, "ts": 0}
+_TOP_TAGS_TTL = 30  # seconds
+
+
 @app.get("/api/tags/top")
-async def top_tags():
-    resp = supabase.table("tags").select("*").order("score", desc=True).limit(20).execute()
-    return resp.data or []
+async def top_tags(response: Response):
+    response.headers["Cache-Control"] = f"public, max-age={_TOP_TAGS_TTL}"
+    if _top_tags_cache["data"] is not None and (time.time() - _top_tags_cache["ts"]) < _TOP_TAGS_TTL:
+        return _top_tags_cache["data"]
+    resp = await run_db(supabase.table("tags").select("*").order("score", desc=True).limit(20).execute)
+    _top_tags_cache["data"] = resp.data or []
+    _top_tags_cache["ts"] = time.time()
+    return _top_tags_cache["data"]
 
 
 @app.get("/api/links/{link_id}/tags")
 async def link_tags(link_id: int):
-    link = supabase.table("links").select("feed_id").eq("id", link_id).execute()
-    if not link.data or not link.data[0].get("feed_id"):
-        return []
-    feed_id = link.data[0]["feed_id"]
-    ft = supabase.table("feed_tags").select("tag_id").eq("feed_id", feed_id).execute()
-    tag_ids = [r["tag_id"] for r in (ft.data or [])]
-    if not tag_ids:
-        return []
-    tags = supabase.table("tags").select("name, slug, score").in_("id", tag_ids).execute()
-    return tags.data or []
+    def _fetch():
+        link = supabase.table("links").select("feed_id").eq("id", link_id).execute()
+        if not link.data or not link.data[0].get("feed_id"):
+            return []
+        feed_id = link.data[0]["feed_id"]
+        ft = supabase.table("feed_tags").select("tag_id").eq("feed_id", feed_id).execute()
+        tag_ids = [r["tag_id"] for r in (ft.data or [])]
+        if not tag_ids:
+            return []
+        tags = supabase.table("tags").select("name, slug, score").in_("id", tag_ids).execute()
+        return tags.data or []
+
+    return await run_db(_fetch)
 
 
 # ============================================================
@@ -798,18 +1056,19 @@ async def admin_director_skip(admin: str = Depends(verify_admin)):
 
 @app.post("/admin/propagate")
 async def admin_propagate(admin: str = Depends(verify_admin)):
-    director._propagate_scores()
+    await run_db(director._propagate_scores)
+    _top_tags_cache["data"] = None
     return RedirectResponse(url="/admin?message=Scores propagated", status_code=303)
 
 
 @app.get("/admin/director/status")
 async def admin_director_status(admin: str = Depends(verify_admin)):
-    state = supabase.table("global_state").select("*").eq("id", 1).execute()
+    state = await run_db(supabase.table("global_state").select("*").eq("id", 1).execute)
     gs = state.data[0] if state.data else {}
 
-    log = supabase.table("director_log").select("*").order(
+    log = await run_db(supabase.table("director_log").select("*").order(
         "selected_at", desc=True
-    ).limit(10).execute()
+    ).limit(10).execute)
 
     return {
         "running": director.running,
@@ -836,7 +1095,6 @@ async def admin_worker_run(
     admin: str = Depends(verify_admin)
 ):
     """Manually trigger a processing batch (waits for completion, respects lock)."""
-    from worker import _get_batch_lock
     lock = _get_batch_lock()
     
     if lock.locked():
@@ -870,12 +1128,11 @@ async def admin_worker_stop(admin: str = Depends(verify_admin)):
 # ============================================================
 
 @app.get("/api/admin/links-needing-summary")
-async def admin_links_needing_summary(
+def admin_links_needing_summary(
     limit: int = 5,
     admin: str = Depends(verify_admin)
 ):
     """Get links that have content but no summary (for manual summarization)."""
-    from db import query
     
     links = query(
         """
@@ -907,7 +1164,7 @@ class BatchSummaryItem(BaseModel):
     summary: str
 
 @app.patch("/api/admin/link/{link_id}/summary")
-async def admin_set_link_summary(
+def admin_set_link_summary(
     link_id: int,
     body: SummaryUpdate,
     admin: str = Depends(verify_admin)
@@ -924,7 +1181,7 @@ async def admin_set_link_summary(
 
 
 @app.post("/api/admin/summaries/batch")
-async def admin_batch_summaries(
+def admin_batch_summaries(
     summaries: List[BatchSummaryItem],
     admin: str = Depends(verify_admin)
 ):
@@ -995,7 +1252,7 @@ async def admin_gather_all(background_tasks: BackgroundTasks, admin: str = Depen
 
 
 @app.get("/api/admin/gather/status")
-async def admin_gather_status(admin: str = Depends(verify_admin)):
+def admin_gather_status(admin: str = Depends(verify_admin)):
     """Get gatherer status, scheduler info, and recent job runs."""
     # Get scheduler status with next gather ETA
     scheduler_status = gather_scheduler.get_status()
@@ -1018,52 +1275,62 @@ async def admin_gather_status(admin: str = Depends(verify_admin)):
     }
 
 
+# Whether the job_runs table exists (None = not probed yet). Deployments
+# without it would otherwise pay a failing query on every request.
+_job_runs_table_exists: Optional[bool] = None
+
+
 @app.get("/api/admin/job-runs")
-async def admin_job_runs(
+def admin_job_runs(
     limit: int = 20,
     job_type: Optional[str] = None,
     admin: str = Depends(verify_admin)
 ):
-    """Get recent job runs with optional filtering. Includes link details for expandable view."""
+    """Get recent job runs with optional filtering. Includes link details for expandable view.
+
+    Postgres builds the whole runs array (json_agg), durations and the
+    processed links' titles included, so this is one query however many
+    runs are listed and the rows are never turned into Python dicts."""
+    global _job_runs_table_exists
+    if _job_runs_table_exists is False:
+        return {"runs": [], "scheduler": gather_scheduler.get_status()}
     try:
-        query = supabase.table("job_runs").select("*").order("started_at", desc=True).limit(limit)
-        if job_type:
-            query = query.eq("job_type", job_type)
-        result = query.execute()
-        runs = result.data or []
-        
-        # Enrich runs with link titles for processed links
-        for run in runs:
-            # Calculate duration from started_at and completed_at
-            if run.get("started_at") and run.get("completed_at"):
-                try:
-                    start = datetime.fromisoformat(run["started_at"].replace("Z", "+00:00"))
-                    end = datetime.fromisoformat(run["completed_at"].replace("Z", "+00:00"))
-                    run["duration_seconds"] = round((end - start).total_seconds(), 1)
-                except Exception:
-                    run["duration_seconds"] = None
-            else:
-                run["duration_seconds"] = None
-            
-            # Get link details for links_processed
-            links_processed = run.get("links_processed") or []
-            if links_processed and isinstance(links_processed, list) and len(links_processed) > 0:
-                try:
-                    links_resp = supabase.table("links").select("id, title, url").in_("id", links_processed).execute()
-                    run["links_details"] = links_resp.data or []
-                except Exception:
-                    run["links_details"] = []
-            else:
-                run["links_details"] = []
-        
+        # duration_seconds is NULL while a run is in progress
+        runs_json = query_one(
+            """
+            SELECT COALESCE(json_agg(j ORDER BY j.started_at DESC), '[]')::text AS runs
+            FROM (
+                SELECT r.*,
+                       round(EXTRACT(EPOCH FROM r.completed_at - r.started_at)::numeric, 1)::float AS duration_seconds,
+                       COALESCE(ld.links, '[]') AS links_details
+                FROM (
+                    SELECT * FROM job_runs
+                    WHERE %(job_type)s::text IS NULL OR job_type = %(job_type)s
+                    ORDER BY started_at DESC
+                    LIMIT %(limit)s
+                ) r
+                LEFT JOIN LATERAL (
+                    SELECT json_agg(json_build_object('id', l.id, 'title', l.title, 'url', l.url)) AS links
+                    FROM links l
+                    WHERE jsonb_typeof(r.links_processed) = 'array'
+                      AND l.id IN (SELECT jsonb_array_elements_text(r.links_processed)::bigint)
+                ) ld ON true
+            ) j
+            """,
+            {"job_type": job_type, "limit": limit},
+        )["runs"]
+        _job_runs_table_exists = True
+
         # Get scheduler status for next gather ETA
-        scheduler_status = gather_scheduler.get_status()
-        
-        return {
-            "runs": runs,
-            "scheduler": scheduler_status,
-        }
+        scheduler = json.dumps(gather_scheduler.get_status())
+        return Response(
+            content='{"runs":' + runs_json + ',"scheduler":' + scheduler + '}',
+            media_type="application/json",
+        )
     except Exception as e:
+        # 42P01 = undefined_table; anything else may be transient
+        if getattr(e, "pgcode", None) == "42P01":
+            _job_runs_table_exists = False
         return {"error": str(e), "runs": [], "scheduler": None}
 
 
@@ -1075,18 +1342,18 @@ async def admin_job_runs(
 async def admin_add_feed_tag(feed_id: int, tag: str = Form(...), admin: str = Depends(verify_admin)):
     slug = tag.lower().strip().replace(" ", "-")
     # Create or get tag
-    existing = supabase.table("tags").select("id").eq("slug", slug).execute()
+    existing = await run_db(supabase.table("tags").select("id").eq("slug", slug).execute)
     if existing.data:
         tag_id = existing.data[0]["id"]
     else:
-        resp = supabase.table("tags").insert({"name": tag.strip(), "slug": slug}).execute()
+        resp = await run_db(supabase.table("tags").insert({"name": tag.strip(), "slug": slug}).execute)
         tag_id = resp.data[0]["id"]
 
     # Create feed_tag
     try:
-        supabase.table("feed_tags").insert({
+        await run_db(supabase.table("feed_tags").insert({
             "feed_id": feed_id, "tag_id": tag_id
-        }).execute()
+        }).execute)
     except Exception:
         pass  # Already exists
 
@@ -1095,11 +1362,11 @@ async def admin_add_feed_tag(feed_id: int, tag: str = Form(...), admin: str = De
 
 @app.post("/admin/feeds/{feed_id}/tags/{slug}/delete")
 async def admin_remove_feed_tag(feed_id: int, slug: str, admin: str = Depends(verify_admin)):
-    tag = supabase.table("tags").select("id").eq("slug", slug).execute()
+    tag = await run_db(supabase.table("tags").select("id").eq("slug", slug).execute)
     if tag.data:
-        supabase.table("feed_tags").delete().eq(
+        await run_db(supabase.table("feed_tags").delete().eq(
             "feed_id", feed_id
-        ).eq("tag_id", tag.data[0]["id"]).execute()
+        ).eq("tag_id", tag.data[0]["id"]).execute)
     return RedirectResponse(url=f"/admin?message=Tag removed", status_code=303)
 
 
@@ -1109,15 +1376,16 @@ async def admin_remove_feed_tag(feed_id: int, slug: str, admin: str = Depends(ve
 
 @app.get("/api/weights")
 async def get_weights():
-    resp = supabase.table("score_weights").select("*").execute()
+    resp = await run_db(supabase.table("score_weights").select("*").execute)
     return resp.data or []
 
 
 @app.post("/api/weights/{key}")
 async def update_weight(key: str, value: float = Form(...)):
-    supabase.table("score_weights").update(
+    await run_db(supabase.table("score_weights").update(
         {"value": value}
-    ).eq("key", key).execute()
+    ).eq("key", key).execute)
+    _weight_cache.pop(key, None)
     return RedirectResponse(url="/admin?message=Weight updated", status_code=303)
 
 
@@ -1125,11 +1393,21 @@ async def update_weight(key: str, value: float = Form(...)):
 # Helper
 # ============================================================
 
+# Weights change only via the admin form; cache lookups briefly
+_weight_cache = {}  # key -> (value or None if unset, fetched_at)
+_WEIGHT_CACHE_TTL = 30  # seconds
+
+
 def _get_weight(key: str, default: float = 0.0) -> float:
+    hit = _weight_cache.get(key)
+    if hit and (time.time() - hit[1]) < _WEIGHT_CACHE_TTL:
+        return default if hit[0] is None else hit[0]
     try:
         resp = supabase.table("score_weights").select("value").eq("key", key).execute()
-        if resp.data:
-            return float(resp.data[0]["value"])
+        value = float(resp.data[0]["value"]) if resp.data else None
+        _weight_cache[key] = (value, time.time())
+        if value is not None:
+            return value
     except Exception:
         pass
     return default
@@ -1139,18 +1417,59 @@ def _get_weight(key: str, default: float = 0.0) -> float:
 # HTML Pages
 # ============================================================
 
-import threading
-_active_syncs: dict = {}
-_sync_all_cancel = threading.Event()
-
-
 @app.get("/")
 async def root():
     return RedirectResponse(url="/add")
 
 
+_LINKS_TABLE_OPEN = """<div class="card" style="padding:0;overflow-x:auto">
+            <table>
+            <thead><tr>
+                <th>Title / URL</th>
+                <th>Feed</th>
+                <th style="text-align:center">Score</th>
+                <th style="text-align:center">Shown</th>
+                <th style="width:50px"></th>
+            </tr></thead>
+            <tbody>"""
+_LINKS_TABLE_CLOSE = """</tbody>
+            </table>
+        </div>"""
+
+
+_links_summary_view_exists = None  # None = unknown, probed on first use
+
+
+def _fetch_links_summary(feed_id: Optional[int] = None) -> list:
+    """Newest 200 links for /admin/links, read through the links_summary view
+    (see migrations/links_summary_view.sql) so vectors and content never
+    leave the database. Falls back to a projected read of links until the
+    view has been created."""
+    global _links_summary_view_exists
+    cols = 'id, url, title, direct_score, times_shown, feed_id, created_at'
+    if _links_summary_view_exists is not False:
+        try:
+            query = supabase.table('links_summary').select(cols).order('created_at', desc=True).limit(200)
+            if feed_id:
+                query = query.eq('feed_id', feed_id)
+            data = query.execute().data or []
+            _links_summary_view_exists = True
+            return data
+        except Exception as e:
+            # 42P01 = undefined_table; anything else is a real error
+            if getattr(e, "pgcode", None) != "42P01":
+                raise
+            _links_summary_view_exists = False
+    query = supabase.table('links').select(cols).order('created_at', desc=True).limit(200)
+    if feed_id:
+        query = query.eq('feed_id', feed_id)
+    return query.execute().data or []
+
+
 @app.get("/admin/links", response_class=HTMLResponse)
-async def view_links(message: Optional[str] = None, feed_id: Optional[int] = None, admin: str = Depends(verify_admin)):
+def view_links(message: Optional[str] = None, feed_id: Optional[int] = None, admin: str = Depends(verify_admin)):
+    # Plain def: FastAPI runs it in its threadpool, so the blocking DB
+    # reads below don't stall the event loop
     try:
         # Get all feeds for the filter bar
         feeds_resp = supabase.table('feeds').select('id, url, type').order('id').execute()
@@ -1164,14 +1483,11 @@ async def view_links(message: Optional[str] = None, feed_id: Optional[int] = Non
             name = u.split("/")[-1] or u.split("/")[-2] if "/" in u else u
             if len(name) > 30:
                 name = name[:30] + "..."
-            feed_map[f["id"]] = {"name": name, "type": f.get("type", "?")}
+            # Escaped once here rather than once per link row
+            feed_map[f["id"]] = {"name": _esc(name), "type": f.get("type", "?")}
 
         # Fetch links (optionally filtered by feed)
-        query = supabase.table('links').select('id, url, title, direct_score, times_shown, feed_id, created_at').order('created_at', desc=True).limit(200)
-        if feed_id:
-            query = query.eq('feed_id', feed_id)
-        response = query.execute()
-        links = response.data or []
+        links = _fetch_links_summary(feed_id)
 
         # --- Filter bar ---
         filter_html = '<div class="filter-bar"><span style="font-size:13px;color:#64748b;">Filter:</span>'
@@ -1180,22 +1496,22 @@ async def view_links(message: Optional[str] = None, feed_id: Optional[int] = Non
         for f in feeds:
             active_cls = ' active' if feed_id == f["id"] else ''
             fname = feed_map[f["id"]]["name"]
-            filter_html += f'<a href="/admin/links?feed_id={f["id"]}" class="{active_cls}">{_esc(fname)}</a>'
+            filter_html += f'<a href="/admin/links?feed_id={f["id"]}" class="{active_cls}">{fname}</a>'
         filter_html += '</div>'
 
         # --- Table ---
-        rows = ""
-        for l in links:
-            lid = l.get("id", "?")
-            title = _esc(l.get("title") or "(untitled)")
-            url = l.get("url", "")
-            url_display = _esc(url[:70] + ("..." if len(url) > 70 else ""))
-            fid = l.get("feed_id")
-            fname = _esc(feed_map.get(fid, {}).get("name", "-")) if fid else "-"
-            score = l.get("direct_score", 0) or 0
-            shown = l.get("times_shown", 0) or 0
-            score_cls = 'color:#16a34a' if score > 0 else ('color:#dc2626' if score < 0 else 'color:#94a3b8')
-            rows += f"""<tr>
+        def _rows():
+            for l in links:
+                lid = l.get("id", "?")
+                title = _esc(l.get("title") or "(untitled)")
+                url = l.get("url", "")
+                url_display = _esc(url[:70] + ("..." if len(url) > 70 else ""))
+                fid = l.get("feed_id")
+                fname = feed_map.get(fid, {}).get("name", "-") if fid else "-"
+                score = l.get("direct_score", 0) or 0
+                shown = l.get("times_shown", 0) or 0
+                score_cls = 'color:#16a34a' if score > 0 else ('color:#dc2626' if score < 0 else 'color:#94a3b8')
+                yield f"""<tr>
                 <td><strong>{title}</strong><br><a href="{_esc(url)}" target="_blank" class="truncate">{url_display}</a></td>
                 <td>{fname}</td>
                 <td style="{score_cls};font-weight:600;text-align:center">{score}</td>
@@ -1208,100 +1524,276 @@ async def view_links(message: Optional[str] = None, feed_id: Optional[int] = Non
                 </td>
             </tr>"""
 
-        body = _messages(message)
-        body += f'<h1 style="margin-bottom:12px">Links ({len(links)})</h1>'
-        body += filter_html
-        body += f"""<div class="card" style="padding:0;overflow-x:auto">
-            <table>
-            <thead><tr>
-                <th>Title / URL</th>
-                <th>Feed</th>
-                <th style="text-align:center">Score</th>
-                <th style="text-align:center">Shown</th>
-                <th style="width:50px"></th>
-            </tr></thead>
-            <tbody>{rows}</tbody>
-            </table>
-        </div>"""
-
-        if not links:
-            body += '<p style="color:#94a3b8;text-align:center;padding:32px">No links found.</p>'
-
-        return HTMLResponse(_page("Links", body))
+        # Stream the page: shell and header first, then one chunk per row
+        def _body():
+            head, tail = _page_shell("Links")
+            yield head
+            yield _messages(message)
+            yield f'<h1 style="margin-bottom:12px">Links ({len(links)})</h1>'
+            yield filter_html
+            yield _LINKS_TABLE_OPEN
+            yield from _rows()
+            yield _LINKS_TABLE_CLOSE
+            if not links:
+                yield '<p style="color:#94a3b8;text-align:center;padding:32px">No links found.</p>'
+            yield tail
+
+        return StreamingResponse(_body(), media_type="text/html; charset=utf-8")
     except Exception as e:
         return HTMLResponse(_page("Error", f'<div class="msg-err">Error: {_esc(str(e))}</div>'))
 
 
 @app.post("/admin/links/delete/{link_id}")
 async def delete_link(link_id: int, admin: str = Depends(verify_admin)):
-    supabase.table('links').delete().eq('id', link_id).execute()
+    await run_db(supabase.table('links').delete().eq('id', link_id).execute)
     return RedirectResponse(url="/admin/links?message=Deleted", status_code=303)
 
 
-@app.get("/admin", response_class=HTMLResponse)
-async def admin_dashboard(message: Optional[str] = None, error: Optional[str] = None, admin: str = Depends(verify_admin)):
-    try:
-        feeds = supabase.table('feeds').select('*').order('created_at', desc=True).execute().data or []
-        state = supabase.table("global_state").select("*").eq("id", 1).execute()
-        gs = state.data[0] if state.data else {}
-
-        # Get current link details
-        current_link = None
-        current_link_id = gs.get("current_link_id")
-        if current_link_id:
-            cl_resp = supabase.table("links").select("id, title, url").eq("id", current_link_id).execute()
-            current_link = cl_resp.data[0] if cl_resp.data else None
+# Static fragments for the admin dashboard, built once at import time.
+_ADMIN_FEED_FORM_HTML = """<form method="POST" action="/admin/add-feed" style="display:flex;gap:6px;flex-wrap:wrap;margin-bottom:14px">
+                <input type="url" name="url" placeholder="Feed URL" required style="flex:1;min-width:200px">
+                <select name="type">
+                    <option value="youtube">YouTube</option>
+                    <option value="rss">RSS</option>
+                    <option value="reddit">Reddit</option>
+                    <option value="bluesky">Bluesky</option>
+                    <option value="website">Website</option>
+                </select>
+                <button class="btn btn-primary btn-sm">Add Feed</button>
+            </form>
+            <div style="margin-bottom:12px">
+                <form method="POST" action="/admin/sync" class="inline-form"><button class="btn btn-sm">Sync All</button></form>
+                <form method="POST" action="/admin/cancel-all" class="inline-form"><button class="btn btn-sm btn-danger">Cancel All</button></form>
+            </div>"""
 
-        # Time remaining
-        now = datetime.now(timezone.utc)
-        time_remaining = "-"
-        rotation_ends = gs.get("rotation_ends_at")
-        if rotation_ends:
-            try:
-                ends_at = datetime.fromisoformat(rotation_ends.replace("Z", "+00:00"))
-                secs = max(0, int((ends_at - now).total_seconds()))
-                time_remaining = f"{secs // 60}m {secs % 60}s" if secs > 0 else "Expired"
-            except Exception:
-                time_remaining = "?"
+_ADMIN_TRIGGERS_HTML = """<div class="card">
+            <h2>&#9889; Manual Triggers</h2>
+            <p style="font-size:13px;color:#64748b;margin-bottom:12px">Run jobs manually (results shown on refresh)</p>
+            <div style="display:flex;flex-wrap:wrap;gap:8px">
+                <button class="btn btn-sm" onclick="triggerJob('/api/admin/gather/hn', this)">&#129412; Gather HN</button>
+                <button class="btn btn-sm" onclick="triggerJob('/api/admin/gather/reddit', this)">&#129302; Gather Reddit</button>
+                <button class="btn btn-sm btn-primary" onclick="triggerJob('/api/admin/worker/run', this)">&#10024; Run Processing</button>
+            </div>
+            <div id="trigger-result" style="margin-top:12px;font-size:13px;color:#64748b"></div>
+        </div>
+        <script>
+        function triggerJob(url, btn) {
+            btn.disabled = true;
+            btn.textContent = 'Running...';
+            fetch(url, {method: 'POST'})
+                .then(r => r.json())
+                .then(d => {
+                    document.getElementById('trigger-result').innerHTML = 
+                        '<span style="color:#16a34a">&#10003; ' + (d.message || 'Job started') + '</span>';
+                    btn.disabled = false;
+                    btn.textContent = btn.textContent.replace('Running...', '');
+                    location.reload();
+                })
+                .catch(e => {
+                    document.getElementById('trigger-result').innerHTML = 
+                        '<span style="color:#dc2626">&#10007; Error: ' + e.message + '</span>';
+                    btn.disabled = false;
+                });
+        }
+        </script>"""
+
+_ADMIN_JOBS_SCRIPT = """<style>
+            .job-row.expandable:hover { background: #f8fafc; }
+            .job-row .expand-icon { display: inline-block; width: 16px; transition: transform 0.2s; }
+            .job-row.expanded .expand-icon { transform: rotate(90deg); }
+            .job-details { border-left: 3px solid #2563eb; }
+            </style>
+            <script>
+            // Toggle job details expansion
+            function toggleJobDetails(rowId) {
+                const row = document.getElementById(rowId);
+                const detailsRow = document.getElementById(rowId + '-details');
+                if (!detailsRow) return;
+                
+                const isExpanded = row.classList.contains('expanded');
+                if (isExpanded) {
+                    row.classList.remove('expanded');
+                    detailsRow.style.display = 'none';
+                } else {
+                    row.classList.add('expanded');
+                    detailsRow.style.display = 'table-row';
+                    // Load link details if not already loaded
+                    const linksDiv = document.getElementById(rowId + '-links');
+                    if (linksDiv && linksDiv.textContent === 'Loading...') {
+                        loadJobLinkDetails(rowId);
+                    }
+                }
+            }
+            
+            // Load link details for a job
+            async function loadJobLinkDetails(rowId) {
+                const linksDiv = document.getElementById(rowId + '-links');
+                try {
+                    const response = await fetch('/api/admin/job-runs?limit=20');
+                    const data = await response.json();
+                    // Find the matching job by index (rowId is job-row-N)
+                    const idx = parseInt(rowId.replace('job-row-', ''));
+                    const job = data.runs[idx];
+                    if (job && job.links_details && job.links_details.length > 0) {
+                        linksDiv.innerHTML = job.links_details.map(link => 
+                            `<div style="padding:4px 0;border-bottom:1px solid #e2e8f0">
+                                <a href="/link/${link.id}" target="_blank" style="font-weight:500">#${link.id}</a>
+                                ${link.title ? ' — ' + link.title.substring(0, 60) : ''}
+                            </div>`
+                        ).join('');
+                    } else {
+                        linksDiv.innerHTML = '<span style="color:#94a3b8">No link details available</span>';
+                    }
+                } catch (e) {
+                    linksDiv.innerHTML = '<span style="color:#dc2626">Error loading details</span>';
+                }
+            }
+            
+            // Live refresh job runs every 10 seconds
+            let refreshInterval;
+            async function refreshJobRuns() {
+                const indicator = document.getElementById('jobs-refresh-indicator');
+                const tbody = document.getElementById('job-runs-tbody');
+                const countdown = document.getElementById('next-gather-countdown');
+                
+                try {
+                    indicator.textContent = '(refreshing...)';
+                    const response = await fetch('/api/admin/job-runs?limit=10');
+                    const data = await response.json();
+                    
+                    if (data.runs && data.runs.length > 0) {
+                        // Update the table with new data (simplified - just show indicator)
+                        indicator.textContent = '(auto-refresh active)';
+                    }
+                    
+                    // Update next gather countdown
+                    if (data.scheduler && data.scheduler.seconds_until_next !== undefined) {
+                        const sec = data.scheduler.seconds_until_next;
+                        const hr = Math.floor(sec / 3600);
+                        const min = Math.floor((sec % 3600) / 60);
+                        if (hr > 0) {
+                            countdown.textContent = hr + 'h ' + min + 'm';
+                        } else if (min > 0) {
+                            countdown.textContent = min + 'm';
+                        } else {
+                            countdown.textContent = sec + 's';
+                        }
+                    }
+                    
+                    setTimeout(() => { indicator.textContent = ''; }, 2000);
+                } catch (e) {
+                    indicator.textContent = '(refresh error)';
+                }
+            }
+            
+            // Start auto-refresh
+            refreshInterval = setInterval(refreshJobRuns, 10000);
+            
+            // Countdown timer for next gather (updates every second)
+            let nextGatherSec = parseInt(document.getElementById('next-gather-countdown').dataset.sec, 10) || 0;
+            setInterval(() => {
+                if (nextGatherSec > 0) {
+                    nextGatherSec--;
+                    const countdown = document.getElementById('next-gather-countdown');
+                    if (countdown) {
+                        const hr = Math.floor(nextGatherSec / 3600);
+                        const min = Math.floor((nextGatherSec % 3600) / 60);
+                        const sec = nextGatherSec % 60;
+                        if (hr > 0) {
+                            countdown.textContent = hr + 'h ' + min + 'm';
+                        } else if (min > 0) {
+                            countdown.textContent = min + 'm ' + sec + 's';
+                        } else {
+                            countdown.textContent = sec + 's';
+                        }
+                    }
+                }
+            }, 1000);
+            </script>"""
+
+
+@app.get("/admin", response_class=HTMLResponse)
+def admin_dashboard(message: Optional[str] = None, error: Optional[str] = None, admin: str = Depends(verify_admin)):
+    # Plain def (threadpool) for the same reason as view_links
+    try:
+        # Feeds with their tags in one round-trip
+        feeds = query(
+            """
+            SELECT f.id, f.type, f.url, f.status, f.link_count, f.trust_score,
+                   f.last_error, f.last_scraped_at::text AS last_scraped_at,
+                   COALESCE(t.tags, '[]') AS tags
+            FROM feeds f
+            LEFT JOIN LATERAL (
+                SELECT json_agg(json_build_object('name', tg.name, 'slug', tg.slug)) AS tags
+                FROM feed_tags ft JOIN tags tg ON tg.id = ft.tag_id
+                WHERE ft.feed_id = f.id
+            ) t ON true
+            ORDER BY f.created_at DESC
+            """
+        )
+        state = supabase.table("global_state").select("*").eq("id", 1).execute()
+        gs = state.data[0] if state.data else {}
+
+        # Get current link details
+        current_link = None
+        current_link_id = gs.get("current_link_id")
+        if current_link_id:
+            cl_resp = supabase.table("links").select("id, title, url").eq("id", current_link_id).execute()
+            current_link = cl_resp.data[0] if cl_resp.data else None
+
+        # Time remaining
+        now = datetime.now(timezone.utc)
+        time_remaining = "-"
+        rotation_ends = gs.get("rotation_ends_at")
+        if rotation_ends:
+            try:
+                ends_at = _parse_ts(rotation_ends)
+                secs = max(0, int((ends_at - now).total_seconds()))
+                time_remaining = f"{secs // 60}m {secs % 60}s" if secs > 0 else "Expired"
+            except Exception:
+                time_remaining = "?"
 
         # Satellites
         satellites = gs.get("satellites") or []
-        sat_html = ""
+        sat_parts = []
         if satellites:
             for s in satellites:
                 revealed = "Yes" if s.get("revealed") else "No"
                 sat_title = _esc(s.get("title", "?")[:40])
-                sat_html += f'<div class="log-entry">[{_esc(s.get("position","?"))}] {sat_title} &mdash; revealed: {revealed}</div>'
+                sat_parts.append(f'<div class="log-entry">[{_esc(s.get("position","?"))}] {sat_title} &mdash; revealed: {revealed}</div>')
+            sat_html = "".join(sat_parts)
         else:
             sat_html = '<span style="color:#94a3b8">None</span>'
 
         # Recent log
         log_resp = supabase.table("director_log").select("*").order("selected_at", desc=True).limit(8).execute()
         log_entries = log_resp.data or []
-        log_html = ""
+        log_parts = []
         for entry in log_entries:
             ts = (entry.get("selected_at") or "")[:19]
             reason = _esc(entry.get("reason", "?"))
             eid = entry.get("link_id", "?")
             dur = entry.get("duration_seconds", "?")
-            log_html += f'<div class="log-entry">{ts} &mdash; link #{eid}, pool: {reason}, dur: {dur}s</div>'
+            log_parts.append(f'<div class="log-entry">{ts} &mdash; link #{eid}, pool: {reason}, dur: {dur}s</div>')
+        log_html = "".join(log_parts)
         if not log_html:
             log_html = '<span style="color:#94a3b8">No entries yet</span>'
 
         # Score weights
         weights_resp = supabase.table("score_weights").select("*").execute()
         weights = weights_resp.data or []
-        weights_html = ""
+        weights_parts = []
         for w in weights:
             wkey = _esc(w.get("key", "?"))
             wval = w.get("value", 0)
-            weights_html += f"""<div style="display:flex;align-items:center;gap:8px;padding:4px 0;border-bottom:1px solid #f1f5f9">
+            weights_parts.append(f"""<div style="display:flex;align-items:center;gap:8px;padding:4px 0;border-bottom:1px solid #f1f5f9">
                 <span style="flex:1;font-size:13px;font-family:monospace">{wkey}</span>
                 <form method="POST" action="/api/weights/{wkey}" style="display:flex;gap:4px;align-items:center">
                     <input type="number" name="value" value="{wval}" step="any" style="width:80px">
                     <button class="btn-sm">Save</button>
                 </form>
-            </div>"""
+            </div>""")
+        weights_html = "".join(weights_parts)
 
         # --- Director card ---
         status_cls = "status-running" if director.running else "status-stopped"
@@ -1339,23 +1831,9 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
         </div>"""
 
         # --- Feeds card ---
-        feeds_html = f"""<div class="card">
+        feed_parts = [f"""<div class="card">
             <h2>Feeds ({len(feeds)})</h2>
-            <form method="POST" action="/admin/add-feed" style="display:flex;gap:6px;flex-wrap:wrap;margin-bottom:14px">
-                <input type="url" name="url" placeholder="Feed URL" required style="flex:1;min-width:200px">
-                <select name="type">
-                    <option value="youtube">YouTube</option>
-                    <option value="rss">RSS</option>
-                    <option value="reddit">Reddit</option>
-                    <option value="bluesky">Bluesky</option>
-                    <option value="website">Website</option>
-                </select>
-                <button class="btn btn-primary btn-sm">Add Feed</button>
-            </form>
-            <div style="margin-bottom:12px">
-                <form method="POST" action="/admin/sync" class="inline-form"><button class="btn btn-sm">Sync All</button></form>
-                <form method="POST" action="/admin/cancel-all" class="inline-form"><button class="btn btn-sm btn-danger">Cancel All</button></form>
-            </div>"""
+            {_ADMIN_FEED_FORM_HTML}"""]
 
         for f in feeds:
             fid = f["id"]
@@ -1367,13 +1845,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
             ferror = f.get("last_error")
             flast = (f.get("last_scraped_at") or "-")[:19]
 
-            # Feed tags
-            ft = supabase.table("feed_tags").select("tag_id").eq("feed_id", fid).execute()
-            tag_ids = [t["tag_id"] for t in (ft.data or [])]
-            feed_tag_names = []
-            if tag_ids:
-                tags = supabase.table("tags").select("name,slug").in_("id", tag_ids).execute()
-                feed_tag_names = tags.data or []
+            feed_tag_names = f["tags"]
 
             tags_html = " ".join(
                 f'<span class="tag">{_esc(t["name"])}'
@@ -1384,7 +1856,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
             status_color = "#16a34a" if fstatus == "idle" else ("#f59e0b" if fstatus == "syncing" else "#dc2626")
             error_line = f'<div style="color:#dc2626;font-size:12px;margin-top:4px">Error: {_esc(ferror[:100])}</div>' if ferror else ""
 
-            feeds_html += f"""<div class="feed-box">
+            feed_parts.append(f"""<div class="feed-box">
                 <div style="display:flex;justify-content:space-between;align-items:start;flex-wrap:wrap;gap:6px">
                     <div>
                         <strong>[{ftype}]</strong> {furl}
@@ -1410,9 +1882,10 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
                         </form>
                     </div>
                 </div>
-            </div>"""
+            </div>""")
 
-        feeds_html += "</div>"
+        feed_parts.append("</div>")
+        feeds_html = "".join(feed_parts)
 
         # --- Weights card ---
         weights_card = f"""<div class="card">
@@ -1441,8 +1914,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
 
             r_last_search_str = "-"
             if r_last_search:
-                import time as _admin_time
-                ago = _admin_time.time() - r_last_search
+                ago = time.time() - r_last_search
                 if ago < 60:
                     r_last_search_str = f"{int(ago)}s ago"
                 elif ago < 3600:
@@ -1470,16 +1942,20 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
 
         # --- Processing Queue Status ---
         try:
-            # Count links by processing status (using direct count if available)
-            new_links = supabase.table("links").select("id").eq("processing_status", "new").execute()
-            processing_links = supabase.table("links").select("id").eq("processing_status", "processing").execute()
-            
-            # Priority breakdown
-            user_submitted = supabase.table("links").select("id").eq("source", "scratchpad").eq("processing_status", "new").execute()
-            
-            new_count = len(new_links.data or [])
-            processing_count = len(processing_links.data or [])
-            user_count = len(user_submitted.data or [])
+            # Count links by processing status, with the priority breakdown,
+            # in one pass over the (status, source) index
+            counts = query_one(
+                """
+                SELECT count(*) FILTER (WHERE processing_status = 'new') AS new,
+                       count(*) FILTER (WHERE processing_status = 'processing') AS processing,
+                       count(*) FILTER (WHERE processing_status = 'new' AND source = 'scratchpad') AS user_submitted
+                FROM links
+                WHERE processing_status IN ('new', 'processing')
+                """
+            )
+            new_count = counts["new"]
+            processing_count = counts["processing"]
+            user_count = counts["user_submitted"]
             rss_count = new_count - user_count
             
             queue_html = f"""<div class="card">
@@ -1502,12 +1978,12 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
 
         # --- API Health / Backoff Status ---
         try:
-            from backoff import get_backoff_status
             apis = ["anthropic", "reddit", "hackernews"]
-            api_rows = ""
+            api_parts = []
+            statuses = get_backoff_status_many(apis)
             
             for api_name in apis:
-                status = get_backoff_status(api_name)
+                status = statuses[api_name]
                 is_backing_off = status.get("is_backing_off", False)
                 failures = status.get("consecutive_failures", 0)
                 backoff_until = status.get("backoff_until")
@@ -1525,7 +2001,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
                 if last_error:
                     error_info = f'<br><span style="font-size:11px;color:#dc2626">{_esc(last_error[:50])}...</span>'
                 
-                api_rows += f"""<div style="display:flex;align-items:center;justify-content:space-between;padding:8px 0;border-bottom:1px solid #f1f5f9">
+                api_parts.append(f"""<div style="display:flex;align-items:center;justify-content:space-between;padding:8px 0;border-bottom:1px solid #f1f5f9">
                     <div>
                         <strong style="font-size:14px">{api_name.title()}</strong>
                         {error_info}
@@ -1535,11 +2011,11 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
                         {backoff_info}
                         <br><span style="font-size:11px;color:#64748b">Failures: {failures}</span>
                     </div>
-                </div>"""
+                </div>""")
             
             api_health_html = f"""<div class="card">
                 <h2>&#128161; API Health</h2>
-                {api_rows}
+                {''.join(api_parts)}
             </div>"""
         except Exception as e:
             api_health_html = f'<div class="card"><h2>&#128161; API Health</h2><div class="msg-err">Error: {_esc(str(e))}</div></div>'
@@ -1547,9 +2023,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
         # --- Monthly AI Budget ---
         try:
             month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            usage_resp = supabase.table("ai_token_usage").select("estimated_cost_usd").gte("created_at", month_start.isoformat()).execute()
-            
-            total_cost = sum(float(r.get("estimated_cost_usd", 0) or 0) for r in (usage_resp.data or []))
+            total_cost = _month_ai_spend(month_start)
             budget = 50.0
             percentage = min((total_cost / budget) * 100, 100)
             warning = total_cost > (budget * 0.8)
@@ -1608,15 +2082,15 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
             for run in runs:
                 if run.get("started_at") and run.get("completed_at"):
                     try:
-                        start = datetime.fromisoformat(run["started_at"].replace("Z", "+00:00"))
-                        end = datetime.fromisoformat(run["completed_at"].replace("Z", "+00:00"))
+                        start = _parse_ts(run["started_at"])
+                        end = _parse_ts(run["completed_at"])
                         run["duration_seconds"] = round((end - start).total_seconds(), 1)
                     except Exception:
                         run["duration_seconds"] = None
                 else:
                     run["duration_seconds"] = None
             
-            runs_rows = ""
+            runs_parts = []
             for idx, run in enumerate(runs[:10]):
                 r_id = run.get("id", "")[:8]
                 r_type = _esc(run.get("type") or run.get("job_type") or "?")
@@ -1637,23 +2111,24 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
                 row_class = "job-row expandable" if has_details else "job-row"
                 row_id = f"job-row-{idx}"
                 
-                runs_rows += f"""<tr class="{row_class}" data-job-id="{_esc(r_id)}" id="{row_id}" onclick="toggleJobDetails('{row_id}')" style="cursor:{'pointer' if has_details else 'default'}">
+                runs_parts.append(f"""<tr class="{row_class}" data-job-id="{_esc(r_id)}" id="{row_id}" onclick="toggleJobDetails('{row_id}')" style="cursor:{'pointer' if has_details else 'default'}">
                     <td style="font-weight:500"><span class="expand-icon">{expand_icon}</span> {r_type}</td>
                     <td><span style="color:{s_color};font-weight:600">{_esc(r_status)}</span></td>
                     <td style="font-size:12px;color:#64748b">{r_started}</td>
                     <td style="text-align:center">{dur_str}</td>
                     <td style="text-align:center">{r_items}</td>
-                </tr>"""
+                </tr>""")
                 
                 # Add hidden details row
                 if has_details:
-                    runs_rows += f"""<tr class="job-details" id="{row_id}-details" style="display:none;background:#f8fafc">
+                    runs_parts.append(f"""<tr class="job-details" id="{row_id}-details" style="display:none;background:#f8fafc">
                         <td colspan="5" style="padding:12px 16px">
                             <strong style="font-size:12px;color:#64748b">Links Processed:</strong>
                             <div id="{row_id}-links" style="margin-top:8px;font-size:13px">Loading...</div>
                         </td>
-                    </tr>"""
+                    </tr>""")
             
+            runs_rows = "".join(runs_parts)
             if not runs_rows:
                 runs_rows = '<tr><td colspan="5" style="color:#94a3b8;text-align:center;padding:16px">No job runs yet</td></tr>'
             
@@ -1662,7 +2137,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
                 <div style="display:flex;gap:16px;margin-bottom:12px;flex-wrap:wrap">
                     <div style="background:#f0f9ff;padding:8px 12px;border-radius:6px;font-size:13px">
                         <span style="color:#64748b">Next gather:</span> 
-                        <span id="next-gather-countdown" style="font-weight:600;color:#1e40af">{next_gather_str}</span>
+                        <span id="next-gather-countdown" data-sec="{next_gather_sec}" style="font-weight:600;color:#1e40af">{next_gather_str}</span>
                     </div>
                     <div style="background:#f0fdf4;padding:8px 12px;border-radius:6px;font-size:13px">
                         <span style="color:#64748b">Last gather:</span> 
@@ -1682,173 +2157,23 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
                 </table>
                 </div>
             </div>
-            <style>
-            .job-row.expandable:hover {{ background: #f8fafc; }}
-            .job-row .expand-icon {{ display: inline-block; width: 16px; transition: transform 0.2s; }}
-            .job-row.expanded .expand-icon {{ transform: rotate(90deg); }}
-            .job-details {{ border-left: 3px solid #2563eb; }}
-            </style>
-            <script>
-            // Toggle job details expansion
-            function toggleJobDetails(rowId) {{
-                const row = document.getElementById(rowId);
-                const detailsRow = document.getElementById(rowId + '-details');
-                if (!detailsRow) return;
-                
-                const isExpanded = row.classList.contains('expanded');
-                if (isExpanded) {{
-                    row.classList.remove('expanded');
-                    detailsRow.style.display = 'none';
-                }} else {{
-                    row.classList.add('expanded');
-                    detailsRow.style.display = 'table-row';
-                    // Load link details if not already loaded
-                    const linksDiv = document.getElementById(rowId + '-links');
-                    if (linksDiv && linksDiv.textContent === 'Loading...') {{
-                        loadJobLinkDetails(rowId);
-                    }}
-                }}
-            }}
-            
-            // Load link details for a job
-            async function loadJobLinkDetails(rowId) {{
-                const linksDiv = document.getElementById(rowId + '-links');
-                try {{
-                    const response = await fetch('/api/admin/job-runs?limit=20');
-                    const data = await response.json();
-                    // Find the matching job by index (rowId is job-row-N)
-                    const idx = parseInt(rowId.replace('job-row-', ''));
-                    const job = data.runs[idx];
-                    if (job && job.links_details && job.links_details.length > 0) {{
-                        linksDiv.innerHTML = job.links_details.map(link => 
-                            `<div style="padding:4px 0;border-bottom:1px solid #e2e8f0">
-                                <a href="/link/${{link.id}}" target="_blank" style="font-weight:500">#${{link.id}}</a>
-                                ${{link.title ? ' — ' + link.title.substring(0, 60) : ''}}
-                            </div>`
-                        ).join('');
-                    }} else {{
-                        linksDiv.innerHTML = '<span style="color:#94a3b8">No link details available</span>';
-                    }}
-                }} catch (e) {{
-                    linksDiv.innerHTML = '<span style="color:#dc2626">Error loading details</span>';
-                }}
-            }}
-            
-            // Live refresh job runs every 10 seconds
-            let refreshInterval;
-            async function refreshJobRuns() {{
-                const indicator = document.getElementById('jobs-refresh-indicator');
-                const tbody = document.getElementById('job-runs-tbody');
-                const countdown = document.getElementById('next-gather-countdown');
-                
-                try {{
-                    indicator.textContent = '(refreshing...)';
-                    const response = await fetch('/api/admin/job-runs?limit=10');
-                    const data = await response.json();
-                    
-                    if (data.runs && data.runs.length > 0) {{
-                        // Update the table with new data (simplified - just show indicator)
-                        indicator.textContent = '(auto-refresh active)';
-                    }}
-                    
-                    // Update next gather countdown
-                    if (data.scheduler && data.scheduler.seconds_until_next !== undefined) {{
-                        const sec = data.scheduler.seconds_until_next;
-                        const hr = Math.floor(sec / 3600);
-                        const min = Math.floor((sec % 3600) / 60);
-                        if (hr > 0) {{
-                            countdown.textContent = hr + 'h ' + min + 'm';
-                        }} else if (min > 0) {{
-                            countdown.textContent = min + 'm';
-                        }} else {{
-                            countdown.textContent = sec + 's';
-                        }}
-                    }}
-                    
-                    setTimeout(() => {{ indicator.textContent = ''; }}, 2000);
-                }} catch (e) {{
-                    indicator.textContent = '(refresh error)';
-                }}
-            }}
-            
-            // Start auto-refresh
-            refreshInterval = setInterval(refreshJobRuns, 10000);
-            
-            // Countdown timer for next gather (updates every second)
-            let nextGatherSec = {next_gather_sec};
-            setInterval(() => {{
-                if (nextGatherSec > 0) {{
-                    nextGatherSec--;
-                    const countdown = document.getElementById('next-gather-countdown');
-                    if (countdown) {{
-                        const hr = Math.floor(nextGatherSec / 3600);
-                        const min = Math.floor((nextGatherSec % 3600) / 60);
-                        const sec = nextGatherSec % 60;
-                        if (hr > 0) {{
-                            countdown.textContent = hr + 'h ' + min + 'm';
-                        }} else if (min > 0) {{
-                            countdown.textContent = min + 'm ' + sec + 's';
-                        }} else {{
-                            countdown.textContent = sec + 's';
-                        }}
-                    }}
-                }}
-            }}, 1000);
-            </script>"""
+            {_ADMIN_JOBS_SCRIPT}"""
         except Exception as e:
             import traceback
             traceback.print_exc()
             jobs_html = f'<div class="card"><h2>&#128203; Recent Job Runs</h2><div class="msg-err">Error: {_esc(str(e))}</div></div>'
 
-        # --- Manual Triggers ---
-        triggers_html = """<div class="card">
-            <h2>&#9889; Manual Triggers</h2>
-            <p style="font-size:13px;color:#64748b;margin-bottom:12px">Run jobs manually (results shown on refresh)</p>
-            <div style="display:flex;flex-wrap:wrap;gap:8px">
-                <button class="btn btn-sm" onclick="triggerJob('/api/admin/gather/hn', this)">&#129412; Gather HN</button>
-                <button class="btn btn-sm" onclick="triggerJob('/api/admin/gather/reddit', this)">&#129302; Gather Reddit</button>
-                <button class="btn btn-sm btn-primary" onclick="triggerJob('/api/admin/worker/run', this)">&#10024; Run Processing</button>
-            </div>
-            <div id="trigger-result" style="margin-top:12px;font-size:13px;color:#64748b"></div>
-        </div>
-        <script>
-        function triggerJob(url, btn) {
-            btn.disabled = true;
-            btn.textContent = 'Running...';
-            fetch(url, {method: 'POST'})
-                .then(r => r.json())
-                .then(d => {
-                    document.getElementById('trigger-result').innerHTML = 
-                        '<span style="color:#16a34a">&#10003; ' + (d.message || 'Job started') + '</span>';
-                    btn.disabled = false;
-                    btn.textContent = btn.textContent.replace('Running...', '');
-                    location.reload();
-                })
-                .catch(e => {
-                    document.getElementById('trigger-result').innerHTML = 
-                        '<span style="color:#dc2626">&#10007; Error: ' + e.message + '</span>';
-                    btn.disabled = false;
-                });
-        }
-        </script>"""
 
         # --- Assemble ---
-        body = _messages(message, error)
-        body += director_html
-        body += '<div class="grid-2">'
-        body += feeds_html
-        body += weights_card
-        body += '</div>'
-        body += '<div class="grid-2">'
-        body += queue_html
-        body += budget_html
-        body += '</div>'
-        body += '<div class="grid-2">'
-        body += api_health_html
-        body += triggers_html
-        body += '</div>'
-        body += jobs_html
-        body += reddit_html
+        body = "".join([
+            _messages(message, error),
+            director_html,
+            '<div class="grid-2">', feeds_html, weights_card, '</div>',
+            '<div class="grid-2">', queue_html, budget_html, '</div>',
+            '<div class="grid-2">', api_health_html, _ADMIN_TRIGGERS_HTML, '</div>',
+            jobs_html,
+            reddit_html,
+        ])
 
         return HTMLResponse(_page("Admin", body))
     except Exception as e:
@@ -1856,7 +2181,7 @@ async def admin_dashboard(message: Optional[str] = None, error: Optional[str] =
 
 
 @app.get("/admin/api-status", response_class=HTMLResponse)
-async def admin_api_status(request: Request, admin: str = Depends(verify_admin)):
+def admin_api_status(request: Request, admin: str = Depends(verify_admin)):
     """HTML page showing current API status (same data as /api/now but in HTML format)."""
     try:
         user_id = request.state.user_id
@@ -1892,33 +2217,30 @@ async def admin_api_status(request: Request, admin: str = Depends(verify_admin))
         for sat in satellites:
             reveal_at = sat.get("reveal_at")
             if reveal_at:
-                sat["revealed"] = now >= datetime.fromisoformat(reveal_at.replace("Z", "+00:00"))
+                sat["revealed"] = now >= _parse_ts(reveal_at)
             else:
                 sat["revealed"] = True
 
             sat_link_id = sat.get("link_id")
             if sat_link_id:
                 try:
-                    nom_resp = supabase.table("nominations").select("id").eq(
+                    nom_resp = supabase.table("nominations").select("id", count="exact", head=True).eq(
                         "link_id", sat_link_id
                     ).eq("rotation_id", rotation_id).execute()
-                    sat["nominations"] = len(nom_resp.data or [])
+                    sat["nominations"] = nom_resp.count or 0
                 except Exception:
                     sat["nominations"] = 0
 
         # Vote counts
-        all_votes = supabase.table("votes").select("value").eq("link_id", link_id).execute()
-        score = sum(v["value"] for v in (all_votes.data or []))
-
-        my_votes = supabase.table("votes").select("created_at").eq(
-            "link_id", link_id
-        ).eq("user_id", user_id).order("created_at", desc=True).execute()
+        votes = _query_vote_summary(link_id, user_id)
+        score = votes["score"]
+        my_votes_count, my_last_vote_at = votes["my_votes_count"], votes["my_last_vote_at"]
 
         # Timers
         rotation_ends = gs.get("rotation_ends_at")
         seconds_remaining = 0
         if rotation_ends:
-            ends = datetime.fromisoformat(rotation_ends.replace("Z", "+00:00"))
+            ends = _parse_ts(rotation_ends)
             seconds_remaining = max(0, int((ends - now).total_seconds()))
 
         # Build HTML
@@ -1948,8 +2270,8 @@ async def admin_api_status(request: Request, admin: str = Depends(verify_admin))
         votes_html = f"""<div class="card">
             <h2>&#128077; Votes</h2>
             <div class="kv"><span class="label">Total Score</span><span style="font-weight:700">{score}</span></div>
-            <div class="kv"><span class="label">My Votes Count</span><span>{len(my_votes.data or [])}</span></div>
-            <div class="kv"><span class="label">My Last Vote</span><span>{(my_votes.data[0]["created_at"][:19] if my_votes.data else "-")}</span></div>
+            <div class="kv"><span class="label">My Votes Count</span><span>{my_votes_count}</span></div>
+            <div class="kv"><span class="label">My Last Vote</span><span>{(my_last_vote_at[:19] if my_last_vote_at else "-")}</span></div>
         </div>"""
 
         sat_rows = ""
@@ -1998,13 +2320,13 @@ async def admin_api_status(request: Request, admin: str = Depends(verify_admin))
 @app.post("/admin/add-feed")
 async def add_feed(url: str = Form(...), type: str = Form(...), admin: str = Depends(verify_admin)):
     try:
-        existing = supabase.table('feeds').select('id').eq('url', url).execute()
+        existing = await run_db(supabase.table('feeds').select('id').eq('url', url).execute)
         if existing.data:
             return RedirectResponse(url="/admin?error=Feed exists", status_code=303)
-        supabase.table('feeds').insert({
+        await run_db(supabase.table('feeds').insert({
             'url': url, 'type': type, 'status': 'idle',
             'last_scraped_at': None, 'link_count': 0,
-        }).execute()
+        }).execute)
         return RedirectResponse(url="/admin?message=Feed added", status_code=303)
     except Exception as e:
         return RedirectResponse(url=f"/admin?error={e}", status_code=303)
@@ -2012,129 +2334,199 @@ async def add_feed(url: str = Form(...), type: str = Form(...), admin: str = Dep
 
 @app.post("/admin/delete-feed/{feed_id}")
 async def delete_feed(feed_id: int, admin: str = Depends(verify_admin)):
-    supabase.table('links').delete().eq('feed_id', feed_id).execute()
-    supabase.table('feed_tags').delete().eq('feed_id', feed_id).execute()
-    supabase.table('feeds').delete().eq('id', feed_id).execute()
+    await run_db(supabase.table('links').delete().eq('feed_id', feed_id).execute)
+    await run_db(supabase.table('feed_tags').delete().eq('feed_id', feed_id).execute)
+    await run_db(supabase.table('feeds').delete().eq('id', feed_id).execute)
     return RedirectResponse(url="/admin?message=Feed deleted", status_code=303)
 
 
 @app.post("/admin/sync")
-async def sync_feeds(background_tasks: BackgroundTasks, admin: str = Depends(verify_admin)):
-    _sync_all_cancel.clear()
-    background_tasks.add_task(sync_all_feeds)
+async def sync_feeds(admin: str = Depends(verify_admin)):
+    await sync_all_feeds()
     return RedirectResponse(url="/admin?message=Sync started", status_code=303)
 
 
 @app.post("/admin/sync-feed/{feed_id}")
-async def sync_single_feed(feed_id: int, background_tasks: BackgroundTasks, admin: str = Depends(verify_admin)):
-    background_tasks.add_task(sync_feed_by_id, feed_id)
+async def sync_single_feed(feed_id: int, admin: str = Depends(verify_admin)):
+    enqueue_feed_sync(feed_id)
     return RedirectResponse(url="/admin?message=Syncing...", status_code=303)
 
 
 @app.post("/admin/cancel-all")
-async def cancel_all_syncs(admin: str = Depends(verify_admin)):
-    _sync_all_cancel.set()
-    for s in _active_syncs.values():
-        s["cancel"] = True
+async def admin_cancel_all(admin: str = Depends(verify_admin)):
+    cancel_all_syncs()
     return RedirectResponse(url="/admin?message=Cancelled", status_code=303)
 
 
 # ============================================================
-# Sync Engine (unchanged)
+# Admin: AI Content Engine
 # ============================================================
 
-async def sync_feed_by_id(feed_id: int):
-    try:
-        resp = supabase.table('feeds').select('*').eq('id', feed_id).execute()
-        if not resp.data:
-            return
-        await process_single_feed(resp.data[0])
-    except Exception as e:
-        print(f"Error syncing feed {feed_id}: {e}")
-        supabase.table('feeds').update({'status': 'error', 'last_error': str(e)[:500]}).eq('id', feed_id).execute()
+_ai_engine = None
 
 
-async def sync_all_feeds():
-    resp = supabase.table('feeds').select('*').execute()
-    for feed in (resp.data or []):
-        if _sync_all_cancel.is_set():
-            break
-        await process_single_feed(feed)
-
+def _get_ai_engine():
+    """Get a shared AI engine instance.
 
-async def process_single_feed(feed: dict):
-    feed_id = feed['id']
-    _active_syncs[feed_id] = {"cancel": False}
-    supabase.table('feeds').update({'status': 'syncing', 'last_error': None}).eq('id', feed_id).execute()
+    One engine per process so its httpx client (and the keep-alive TLS
+    connections to the Anthropic/Brave APIs) and persona cache are reused
+    across requests; closed in lifespan.
+    """
+    global _ai_engine
+    if _ai_engine is None:
+        _ai_engine = _AIEngine(supabase)
+    return _ai_engine
+
+
+# Static fragments for the AI dashboard, built once at import time.
+_AI_DISCOVER_HTML = """<div class="card">
+    <h2>&#128269; Discover Links</h2>
+    <form method="POST" action="/admin/ai/discover" style="display:flex;flex-direction:column;gap:10px">
+        <div style="display:flex;gap:8px;flex-wrap:wrap;align-items:end">
+            <div style="flex:1;min-width:200px">
+                <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Topic (optional)</label>
+                <input type="text" name="topic" placeholder="e.g. AI safety, Rust programming..." style="width:100%">
+            </div>
+            <div>
+                <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Count</label>
+                <input type="number" name="count" value="5" min="1" max="20" style="width:70px">
+            </div>
+            <div>
+                <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Source</label>
+                <select name="source">
+                    <option value="web">Web (Brave)</option>
+                    <option value="hn" selected>Hacker News</option>
+                    <option value="reddit">Reddit</option>
+                </select>
+            </div>
+            <button class="btn btn-primary" type="submit">&#9889; Discover</button>
+        </div>
+    </form>
+</div>"""
+
+_AI_ENRICH_HTML = """<div class="card">
+    <h2>&#10024; Enrich Links</h2>
+    <form method="POST" action="/admin/ai/enrich" style="display:flex;flex-direction:column;gap:10px">
+        <div style="display:flex;gap:12px;flex-wrap:wrap;align-items:end">
+            <div>
+                <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Limit</label>
+                <input type="number" name="limit" value="5" min="1" max="50" style="width:70px">
+            </div>
+            <div style="display:flex;gap:12px;align-items:center;padding-top:18px">
+                <label style="font-size:13px"><input type="checkbox" name="types" value="description" checked> Descriptions</label>
+                <label style="font-size:13px"><input type="checkbox" name="types" value="tags" checked> Tags</label>
+                <label style="font-size:13px"><input type="checkbox" name="types" value="comments" checked> Comments</label>
+            </div>
+            <button class="btn btn-primary" type="submit">&#10024; Enrich Batch</button>
+        </div>
+    </form>
+</div>"""
+
+_AI_GEN_COMMENT_HTML = """<div class="card">
+    <h2>&#128172; Generate Comment</h2>
+    <p style="font-size:13px;color:#64748b;margin-bottom:12px">Manually generate AI comments for a specific link.</p>
+    <form method="POST" action="/admin/ai/generate-comment" style="display:flex;gap:8px;flex-wrap:wrap;align-items:end">
+        <div style="flex:1;min-width:150px">
+            <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Link ID</label>
+            <input type="number" name="link_id" placeholder="123" required style="width:100%">
+        </div>
+        <button class="btn btn-primary" type="submit">&#128172; Generate Comment</button>
+    </form>
+</div>"""
+
+_AI_CONTROLS_HTML = '<div>' + _AI_DISCOVER_HTML + _AI_ENRICH_HTML + _AI_GEN_COMMENT_HTML + '</div>'
+
+_AI_RUNS_THEAD = """<thead><tr>
+    <th>ID</th>
+    <th>Type</th>
+    <th>Status</th>
+    <th style="text-align:right">Tokens</th>
+    <th style="text-align:center">Results</th>
+    <th>Model</th>
+    <th>Created</th>
+</tr></thead>"""
+
+_AI_CONTENT_THEAD = """<thead><tr>
+    <th>Link</th>
+    <th>Type</th>
+    <th>Author</th>
+    <th>Preview</th>
+    <th>Created</th>
+</tr></thead>"""
+
+_AI_PERSONAS_THEAD = """<thead><tr>
+    <th>ID</th>
+    <th>Author</th>
+    <th>Model</th>
+    <th>Description</th>
+    <th style="text-align:center">Priority</th>
+    <th style="text-align:center">Usage</th>
+    <th style="text-align:center">Custom</th>
+</tr></thead>"""
+
+_AI_NO_RUNS_ROW = '<tr><td colspan="7" style="color:#94a3b8;text-align:center;padding:24px">No runs yet</td></tr>'
+_AI_NO_CONTENT_ROW = '<tr><td colspan="5" style="color:#94a3b8;text-align:center;padding:24px">No AI-generated content yet</td></tr>'
+_AI_NO_PERSONAS_ROW = '<tr><td colspan="7" style="color:#94a3b8;text-align:center;padding:24px">No personas configured</td></tr>'
+_AI_NO_DATA = '<span style="color:#94a3b8">No data</span>'
+
+
+def _ai_dashboard_etag(message: str = None, error: str = None) -> Optional[str]:
+    """Cheap validator for /admin/ai: changes whenever a run starts or
+    finishes, new AI content lands, or the persona cache is refreshed."""
     try:
-        ft = feed['type']
-        if ft == 'youtube':
-            items = parse_youtube_channel(feed['url'])
-        elif ft == 'rss':
-            items = parse_rss_feed(feed['url'])
-        elif ft == 'reddit':
-            items = parse_reddit_feed(feed['url'])
-        elif ft == 'bluesky':
-            items = parse_bluesky_feed(feed['url'])
-        elif ft == 'website':
-            data = scrape_article(feed['url'])
-            items = [{'url': feed['url'], 'title': data.get('title',''), 'content': data.get('description',''), 'meta': {'type':'website'}}]
-        else:
-            items = []
-
-        ingested = 0
-        for item in items:
-            if _active_syncs.get(feed_id, {}).get("cancel"):
-                break
-            url = item.get('url', '')
-            if not url:
-                continue
-            url = normalize_url(url)
-            existing = supabase.table('links').select('id').eq('url', url).execute()
-            if existing.data:
-                continue
-            try:
-                text = f"{item.get('title','')}. {item.get('content','')}"
-                vector = vectorize(text[:5000])
-                supabase.table('links').insert({
-                    'url': url, 'title': item.get('title',''),
-                    'content': (item.get('content','') or '')[:10000],
-                    'meta_json': item.get('meta', {}),
-                    'content_vector': vector, 'feed_id': feed_id,
-                    'processing_status': 'new',
-                    'processing_priority': 1,  # Feed items = low priority
-                }).execute()
-                ingested += 1
-            except Exception as e:
-                print(f"  Error ingesting {url}: {e}")
-
-        link_count = len(supabase.table('links').select('id').eq('feed_id', feed_id).execute().data or [])
-        supabase.table('feeds').update({
-            'status': 'idle', 'last_scraped_at': datetime.now(timezone.utc).isoformat(),
-            'last_error': None, 'link_count': link_count,
-        }).eq('id', feed_id).execute()
-        print(f"Feed {feed_id}: {ingested} new links")
+        row = query_one(
+            """
+            SELECT
+                (SELECT max(created_at) FROM ai_runs) AS runs_ts,
+                (SELECT count(*) FROM ai_runs WHERE status = 'running') AS running,
+                (SELECT max(created_at) FROM ai_generated_content) AS content_ts
+            """
+        )
     except Exception as e:
-        print(f"Error syncing feed {feed_id}: {e}")
-        supabase.table('feeds').update({'status': 'error', 'last_error': str(e)[:500]}).eq('id', feed_id).execute()
-    finally:
-        _active_syncs.pop(feed_id, None)
-
-
-
-# ============================================================
-# Admin: AI Content Engine
-# ============================================================
-
-from ai_engine import AIEngine as _AIEngine
-
-def _get_ai_engine():
-    """Get a shared AI engine instance."""
-    return _AIEngine(supabase)
+        print(f"[AI Dashboard] ETag query failed: {e}")
+        return None
+    # The hour bucket keeps the 24h / 7d windows from going stale
+    hour = datetime.now(timezone.utc).strftime("%Y%m%d%H")
+    key = "|".join(str(v) for v in (
+        row["runs_ts"], row["running"], row["content_ts"],
+        _personas_list_cache["ts"], hour, message, error,
+    ))
+    return '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+
+def _ai_usage_rows() -> list[dict]:
+    """Token usage rows for the AI dashboard: rolled-up tiles plus the raw
+    completed runs newer than the rollup watermark (migrations/ai_runs_rollup.sql).
+    Each row has created_at, model, type, tokens_used and runs."""
+    try:
+        return query(
+            """
+            SELECT bucket AS created_at, model, type, tokens_used, runs
+            FROM ai_runs_rollup
+            UNION ALL
+            SELECT created_at, model, type, tokens_used, 1
+            FROM ai_runs
+            WHERE status = 'completed'
+              AND created_at >= COALESCE(
+                  (SELECT rolled_up_to FROM ai_runs_rollup_state WHERE id = 1),
+                  '-infinity'::timestamptz)
+            """
+        )
+    except Exception:
+        # Rollup tables not migrated yet -- aggregate the raw runs
+        return query(
+            "SELECT created_at, model, type, tokens_used, 1 AS runs "
+            "FROM ai_runs WHERE status = 'completed'"
+        )
 
 
 @app.get("/admin/ai", response_class=HTMLResponse)
-async def admin_ai_dashboard(message: str = None, error: str = None, admin: str = Depends(verify_admin)):
+async def admin_ai_dashboard(request: Request, message: str = None, error: str = None, admin: str = Depends(verify_admin)):
+    etag = await run_db(_ai_dashboard_etag, message, error)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else None
+    if etag and etag in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=cache_headers)
+
     try:
         engine = _get_ai_engine()
 
@@ -2158,21 +2550,19 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
         </div>"""
 
         # --- Token Usage Stats ---
-        all_runs = supabase.table("ai_runs").select(
-            "type, status, results_count, tokens_used, model, created_at"
-        ).order("created_at", desc=True).execute()
-        runs_data = all_runs.data or []
+        # Rolled-up tiles plus recent completed runs (each row carries a run count)
+        completed_runs = await run_db(_ai_usage_rows)
 
         now = datetime.now(timezone.utc)
-        day_ago = (now - timedelta(hours=24)).isoformat()
-        week_ago = (now - timedelta(days=7)).isoformat()
+        day_ago = now - timedelta(hours=24)
+        week_ago = now - timedelta(days=7)
 
-        completed_runs = [r for r in runs_data if r.get("status") == "completed"]
         total_tokens_all = sum(r.get("tokens_used", 0) or 0 for r in completed_runs)
         total_tokens_24h = sum(r.get("tokens_used", 0) or 0 for r in completed_runs
-                               if (r.get("created_at") or "") >= day_ago)
+                               if r.get("created_at") and r["created_at"] >= day_ago)
         total_tokens_7d = sum(r.get("tokens_used", 0) or 0 for r in completed_runs
-                              if (r.get("created_at") or "") >= week_ago)
+                              if r.get("created_at") and r["created_at"] >= week_ago)
+        completed_count = sum(r.get("runs", 0) or 0 for r in completed_runs)
 
         # Tokens by model
         tokens_by_model = {}
@@ -2206,17 +2596,15 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
             return str(n)
 
         model_rows = ""
-        for model in sorted(tokens_by_model.keys()):
-            tok = tokens_by_model[model]
-            cost = cost_by_model.get(model, 0)
+        for model, tok in sorted(tokens_by_model.items()):
+            cost = cost_by_model[model]
             model_rows += f"""<div class="kv">
                 <span class="label">{_esc(model)}</span>
                 <span>{_fmt_tokens(tok)} tokens &middot; ~${cost:.4f}</span>
             </div>"""
 
         type_rows = ""
-        for rtype in sorted(tokens_by_type.keys()):
-            tok = tokens_by_type[rtype]
+        for rtype, tok in sorted(tokens_by_type.items()):
             type_rows += f"""<div class="kv">
                 <span class="label">{_esc(rtype)}</span>
                 <span>{_fmt_tokens(tok)} tokens</span>
@@ -2225,13 +2613,12 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
         # Daily breakdown (last 7 days)
         daily_usage = {}
         for r in completed_runs:
-            dt = (r.get("created_at") or "")[:10]
-            if dt:
+            if r.get("created_at"):
+                dt = r["created_at"].astimezone(timezone.utc).strftime("%Y-%m-%d")
                 daily_usage[dt] = daily_usage.get(dt, 0) + (r.get("tokens_used", 0) or 0)
 
         daily_html = ""
-        for day in sorted(daily_usage.keys(), reverse=True)[:7]:
-            tok = daily_usage[day]
+        for day, tok in heapq.nlargest(7, daily_usage.items(), key=lambda kv: kv[0]):
             daily_html += f'<div class="kv"><span class="label">{day}</span><span>{_fmt_tokens(tok)}</span></div>'
         if not daily_html:
             daily_html = '<span style="color:#94a3b8">No usage yet</span>'
@@ -2258,17 +2645,17 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
                     <div style="font-size:12px;color:#64748b">Est. Total Cost</div>
                 </div>
                 <div style="background:#fff1f2;padding:12px;border-radius:8px;text-align:center">
-                    <div style="font-size:20px;font-weight:700;color:#be123c">{len(completed_runs)}</div>
+                    <div style="font-size:20px;font-weight:700;color:#be123c">{completed_count}</div>
                     <div style="font-size:12px;color:#64748b">Completed Runs</div>
                 </div>
             </div>
             <details style="margin-top:8px">
                 <summary style="cursor:pointer;font-weight:600;font-size:14px;color:#475569">By Model</summary>
-                <div style="margin-top:8px">{model_rows if model_rows else '<span style="color:#94a3b8">No data</span>'}</div>
+                <div style="margin-top:8px">{model_rows if model_rows else _AI_NO_DATA}</div>
             </details>
             <details style="margin-top:8px">
                 <summary style="cursor:pointer;font-weight:600;font-size:14px;color:#475569">By Run Type</summary>
-                <div style="margin-top:8px">{type_rows if type_rows else '<span style="color:#94a3b8">No data</span>'}</div>
+                <div style="margin-top:8px">{type_rows if type_rows else _AI_NO_DATA}</div>
             </details>
             <details style="margin-top:8px">
                 <summary style="cursor:pointer;font-weight:600;font-size:14px;color:#475569">Daily Breakdown</summary>
@@ -2276,53 +2663,10 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
             </details>
         </div>"""
 
-        # --- Discovery Controls ---
-        discover_html = f"""<div class="card">
-            <h2>&#128269; Discover Links</h2>
-            <form method="POST" action="/admin/ai/discover" style="display:flex;flex-direction:column;gap:10px">
-                <div style="display:flex;gap:8px;flex-wrap:wrap;align-items:end">
-                    <div style="flex:1;min-width:200px">
-                        <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Topic (optional)</label>
-                        <input type="text" name="topic" placeholder="e.g. AI safety, Rust programming..." style="width:100%">
-                    </div>
-                    <div>
-                        <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Count</label>
-                        <input type="number" name="count" value="5" min="1" max="20" style="width:70px">
-                    </div>
-                    <div>
-                        <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Source</label>
-                        <select name="source">
-                            <option value="web">Web (Brave)</option>
-                            <option value="hn" selected>Hacker News</option>
-                            <option value="reddit">Reddit</option>
-                        </select>
-                    </div>
-                    <button class="btn btn-primary" type="submit">&#9889; Discover</button>
-                </div>
-            </form>
-        </div>"""
-
-        # --- Enrichment Controls ---
-        enrich_html = f"""<div class="card">
-            <h2>&#10024; Enrich Links</h2>
-            <form method="POST" action="/admin/ai/enrich" style="display:flex;flex-direction:column;gap:10px">
-                <div style="display:flex;gap:12px;flex-wrap:wrap;align-items:end">
-                    <div>
-                        <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Limit</label>
-                        <input type="number" name="limit" value="5" min="1" max="50" style="width:70px">
-                    </div>
-                    <div style="display:flex;gap:12px;align-items:center;padding-top:18px">
-                        <label style="font-size:13px"><input type="checkbox" name="types" value="description" checked> Descriptions</label>
-                        <label style="font-size:13px"><input type="checkbox" name="types" value="tags" checked> Tags</label>
-                        <label style="font-size:13px"><input type="checkbox" name="types" value="comments" checked> Comments</label>
-                    </div>
-                    <button class="btn btn-primary" type="submit">&#10024; Enrich Batch</button>
-                </div>
-            </form>
-        </div>"""
-
         # --- Recent Runs ---
-        recent_runs = runs_data[:20]
+        recent_runs = (await run_db(supabase.table("ai_runs").select(
+            "id, type, status, tokens_used, results_count, model, created_at, error"
+        ).order("created_at", desc=True).limit(20).execute)).data or []
         runs_rows = ""
         for r in recent_runs:
             rid = (r.get("id") or "?")[:8]
@@ -2354,30 +2698,22 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
             </tr>"""
 
         if not runs_rows:
-            runs_rows = '<tr><td colspan="7" style="color:#94a3b8;text-align:center;padding:24px">No runs yet</td></tr>'
+            runs_rows = _AI_NO_RUNS_ROW
 
         runs_html = f"""<div class="card">
             <h2>&#128203; Recent Runs</h2>
             <div style="overflow-x:auto">
             <table>
-            <thead><tr>
-                <th>ID</th>
-                <th>Type</th>
-                <th>Status</th>
-                <th style="text-align:right">Tokens</th>
-                <th style="text-align:center">Results</th>
-                <th>Model</th>
-                <th>Created</th>
-            </tr></thead>
+            {_AI_RUNS_THEAD}
             <tbody>{runs_rows}</tbody>
             </table>
             </div>
         </div>"""
 
         # --- Recent AI Content ---
-        content_resp = supabase.table("ai_generated_content").select(
+        content_resp = await run_db(supabase.table("ai_generated_content").select(
             "id, link_id, content_type, content, author, model_used, tokens_used, created_at"
-        ).order("created_at", desc=True).limit(20).execute()
+        ).order("created_at", desc=True).limit(20).execute)
         content_items = content_resp.data or []
 
         content_rows = ""
@@ -2407,19 +2743,13 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
             </tr>"""
 
         if not content_rows:
-            content_rows = '<tr><td colspan="5" style="color:#94a3b8;text-align:center;padding:24px">No AI-generated content yet</td></tr>'
+            content_rows = _AI_NO_CONTENT_ROW
 
         content_html = f"""<div class="card">
             <h2>&#128172; Recent AI Content</h2>
             <div style="overflow-x:auto">
             <table>
-            <thead><tr>
-                <th>Link</th>
-                <th>Type</th>
-                <th>Author</th>
-                <th>Preview</th>
-                <th>Created</th>
-            </tr></thead>
+            {_AI_CONTENT_THEAD}
             <tbody>{content_rows}</tbody>
             </table>
             </div>
@@ -2451,22 +2781,14 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
                 </tr>"""
             
             if not persona_rows:
-                persona_rows = '<tr><td colspan="7" style="color:#94a3b8;text-align:center;padding:24px">No personas configured</td></tr>'
+                persona_rows = _AI_NO_PERSONAS_ROW
             
             personas_html = f"""<div class="card">
                 <h2>&#129302; AI Personas</h2>
                 <p style="font-size:13px;color:#64748b;margin-bottom:12px">AI personas generate diverse comments from different perspectives.</p>
                 <div style="overflow-x:auto">
                 <table>
-                <thead><tr>
-                    <th>ID</th>
-                    <th>Author</th>
-                    <th>Model</th>
-                    <th>Description</th>
-                    <th style="text-align:center">Priority</th>
-                    <th style="text-align:center">Usage</th>
-                    <th style="text-align:center">Custom</th>
-                </tr></thead>
+                {_AI_PERSONAS_THEAD}
                 <tbody>{persona_rows}</tbody>
                 </table>
                 </div>
@@ -2474,31 +2796,18 @@ async def admin_ai_dashboard(message: str = None, error: str = None, admin: str
         except Exception as e:
             personas_html = f'<div class="card"><h2>&#129302; AI Personas</h2><div class="msg-err">Error loading personas: {_esc(str(e))}</div></div>'
 
-        # --- Generate Comment for Specific Link ---
-        gen_comment_html = """<div class="card">
-            <h2>&#128172; Generate Comment</h2>
-            <p style="font-size:13px;color:#64748b;margin-bottom:12px">Manually generate AI comments for a specific link.</p>
-            <form method="POST" action="/admin/ai/generate-comment" style="display:flex;gap:8px;flex-wrap:wrap;align-items:end">
-                <div style="flex:1;min-width:150px">
-                    <label style="font-size:12px;color:#64748b;display:block;margin-bottom:2px">Link ID</label>
-                    <input type="number" name="link_id" placeholder="123" required style="width:100%">
-                </div>
-                <button class="btn btn-primary" type="submit">&#128172; Generate Comment</button>
-            </form>
-        </div>"""
-
         # --- Assemble ---
         body = _messages(message, error)
         body += health_html
         body += '<div class="grid-2">'
         body += token_html
-        body += '<div>' + discover_html + enrich_html + gen_comment_html + '</div>'
+        body += _AI_CONTROLS_HTML
         body += '</div>'
         body += personas_html
         body += runs_html
         body += content_html
 
-        return HTMLResponse(_page("AI Engine", body))
+        return HTMLResponse(_page("AI Engine", body), headers=cache_headers)
 
     except Exception as e:
         import traceback
@@ -2607,74 +2916,143 @@ async def admin_ai_generate_comment_form(
 # Admin API Endpoints (JSON)
 # ============================================================
 
-from backoff import get_backoff_status
+# Short-lived cache for the admin polling endpoints: {key: (expires_at, value)}
+_admin_poll_cache = {}
+_admin_poll_locks = {}
+_ADMIN_POLL_TTL = 5  # seconds
+
+
+async def _admin_cached(key: str, compute):
+    """Return compute()'s result, reusing it for _ADMIN_POLL_TTL seconds.
+    Concurrent misses on the same key wait for a single computation."""
+    hit = _admin_poll_cache.get(key)
+    if hit and time.monotonic() < hit[0]:
+        return hit[1]
+    lock = _admin_poll_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        hit = _admin_poll_cache.get(key)
+        if hit and time.monotonic() < hit[0]:
+            return hit[1]
+        value = await compute()
+        _admin_poll_cache[key] = (time.monotonic() + _ADMIN_POLL_TTL, value)
+        return value
+
+
+def _estimate_links(status: str) -> int:
+    """Planner estimate of links in a processing status (no scan)."""
+    return supabase.table("links").select(
+        "id", count="estimated", head=True
+    ).eq("processing_status", status).execute().count or 0
+
+
+async def _queue_status(precise: bool = False) -> dict:
+    # The active buckets are small and index-backed, so count them exactly.
+    # completed/failed grow without bound: use planner estimates for those
+    # unless the caller asks for ?precise=1.
+    where = "" if precise else "WHERE processing_status IN ('new', 'processing')"
+    rows_task = run_db(
+        query,
+        f"""
+        SELECT processing_status, (source = 'scratchpad') AS user_submitted, count(*) AS n
+        FROM links
+        {where}
+        GROUP BY 1, 2
+        """
+    )
+
+    queue = {"new": 0, "processing": 0, "completed": 0, "failed": 0}
+    if precise:
+        rows = await rows_task
+    else:
+        rows, queue["completed"], queue["failed"] = await asyncio.gather(
+            rows_task,
+            run_db(_estimate_links, "completed"),
+            run_db(_estimate_links, "failed"),
+        )
+
+    # Priority breakdown - user-submitted vs RSS (new links only)
+    priority_breakdown = {"user_submitted": 0, "rss_feeds": 0}
+    for r in rows:
+        status = r["processing_status"]
+        if status in queue:
+            queue[status] += r["n"]
+        if status == "new":
+            # NULL source is neither (matches the old eq/neq filters)
+            if r["user_submitted"] is True:
+                priority_breakdown["user_submitted"] += r["n"]
+            elif r["user_submitted"] is False:
+                priority_breakdown["rss_feeds"] += r["n"]
+
+    return {
+        "queue": queue,
+        "priority_breakdown": priority_breakdown,
+        "estimated": [] if precise else ["completed", "failed"],
+    }
+
 
 @app.get("/api/admin/queue-status")
-async def api_admin_queue_status(admin: str = Depends(verify_admin)):
-    """Get processing queue status."""
+async def api_admin_queue_status(precise: bool = False, admin: str = Depends(verify_admin)):
+    """Get processing queue status (completed/failed are estimates unless ?precise=1)."""
     try:
-        # Count links by processing status
-        new_count = supabase.table("links").select("id", count="exact").eq("processing_status", "new").execute()
-        processing_count = supabase.table("links").select("id", count="exact").eq("processing_status", "processing").execute()
-        completed_count = supabase.table("links").select("id", count="exact").eq("processing_status", "completed").execute()
-        failed_count = supabase.table("links").select("id", count="exact").eq("processing_status", "failed").execute()
-        
-        # Priority breakdown - user-submitted vs RSS
-        user_submitted = supabase.table("links").select("id", count="exact").eq("source", "scratchpad").eq("processing_status", "new").execute()
-        rss_links = supabase.table("links").select("id", count="exact").neq("source", "scratchpad").eq("processing_status", "new").execute()
-        
-        return {
-            "queue": {
-                "new": new_count.count if hasattr(new_count, 'count') else len(new_count.data or []),
-                "processing": processing_count.count if hasattr(processing_count, 'count') else len(processing_count.data or []),
-                "completed": completed_count.count if hasattr(completed_count, 'count') else len(completed_count.data or []),
-                "failed": failed_count.count if hasattr(failed_count, 'count') else len(failed_count.data or []),
-            },
-            "priority_breakdown": {
-                "user_submitted": user_submitted.count if hasattr(user_submitted, 'count') else len(user_submitted.data or []),
-                "rss_feeds": rss_links.count if hasattr(rss_links, 'count') else len(rss_links.data or []),
-            }
-        }
+        key = "queue_status_precise" if precise else "queue_status"
+        return await _admin_cached(key, lambda: _queue_status(precise))
     except Exception as e:
         return {"error": str(e)}
 
 
+def _api_health() -> dict:
+    apis = ["anthropic", "reddit", "hackernews"]
+    health = {}
+    statuses = get_backoff_status_many(apis)
+
+    for api_name in apis:
+        status = statuses[api_name]
+        health[api_name] = {
+            "status": "backing_off" if status.get("is_backing_off") else "ok",
+            "consecutive_failures": status.get("consecutive_failures", 0),
+            "backoff_until": status.get("backoff_until"),
+            "last_success_at": str(status.get("last_success_at")) if status.get("last_success_at") else None,
+            "last_failure_at": str(status.get("last_failure_at")) if status.get("last_failure_at") else None,
+            "last_error": status.get("last_error"),
+        }
+
+    return {"apis": health}
+
+
 @app.get("/api/admin/api-health")
 async def api_admin_api_health(admin: str = Depends(verify_admin)):
     """Get API health/backoff status for all tracked APIs."""
     try:
-        apis = ["anthropic", "reddit", "hackernews"]
-        health = {}
-        
-        for api_name in apis:
-            status = get_backoff_status(api_name)
-            health[api_name] = {
-                "status": "backing_off" if status.get("is_backing_off") else "ok",
-                "consecutive_failures": status.get("consecutive_failures", 0),
-                "backoff_until": status.get("backoff_until"),
-                "last_success_at": str(status.get("last_success_at")) if status.get("last_success_at") else None,
-                "last_failure_at": str(status.get("last_failure_at")) if status.get("last_failure_at") else None,
-                "last_error": status.get("last_error"),
-            }
-        
-        return {"apis": health}
+        return await _admin_cached("api_health", lambda: run_db(_api_health))
     except Exception as e:
         return {"error": str(e)}
 
 
+def _month_ai_spend(month_start: datetime) -> float:
+    """Total estimated AI spend (USD) for the month starting at month_start.
+
+    Reads the trigger-maintained ai_spend_monthly counter
+    (migrations/ai_spend_monthly.sql); falls back to summing
+    ai_token_usage if that table hasn't been created yet."""
+    try:
+        row = query_one("SELECT total FROM ai_spend_monthly WHERE month = %s", (month_start.date(),))
+    except Exception:
+        row = query_one(
+            "SELECT COALESCE(SUM(estimated_cost_usd), 0) AS total FROM ai_token_usage WHERE created_at >= %s",
+            (month_start,)
+        )
+    return float(row["total"]) if row else 0.0
+
+
 @app.get("/api/admin/budget-status")
-async def api_admin_budget_status(admin: str = Depends(verify_admin)):
+def api_admin_budget_status(admin: str = Depends(verify_admin)):
     """Get monthly AI budget status."""
     try:
         # Get current month's usage from ai_token_usage
         now = datetime.now(timezone.utc)
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         
-        usage_resp = supabase.table("ai_token_usage").select(
-            "estimated_cost_usd"
-        ).gte("created_at", month_start.isoformat()).execute()
-        
-        total_cost = sum(float(r.get("estimated_cost_usd", 0) or 0) for r in (usage_resp.data or []))
+        total_cost = _month_ai_spend(month_start)
         budget = 50.0  # $50 monthly budget
         
         return {
@@ -2689,102 +3067,110 @@ async def api_admin_budget_status(admin: str = Depends(verify_admin)):
         return {"error": str(e)}
 
 
-@app.get("/api/admin/job-runs")
-async def api_admin_job_runs(limit: int = 20, admin: str = Depends(verify_admin)):
-    """Get recent job runs."""
-    try:
-        # Try job_runs table first (if exists), fall back to ai_runs
+# --- AI trigger dispatcher ---
+# The manual AI triggers below start their job straight away as a task;
+# a job that is already queued or running is refused with a 409 rather
+# than started twice. At most _AI_JOB_CONCURRENCY jobs call the API at
+# once, so a burst of clicks queues on the semaphore instead of fanning
+# out, but a quick comment job never waits behind a long discover run
+# unless every slot is busy.
+
+_AI_JOB_CONCURRENCY = 4
+_ai_job_slots: Optional[asyncio.Semaphore] = None
+_ai_job_tasks: set = set()
+_ai_jobs_inflight: set = set()  # (kind, arg) queued or running
+
+
+async def _submit_ai_job(kind: str, arg=None):
+    """Start an AI job. Returns a 409 response if the same job is already
+    queued or running (double-clicks, two admins), else None."""
+    key = (kind, arg)
+    if key in _ai_jobs_inflight:
+        label = f"{kind} {arg}" if arg is not None else kind
+        return JSONResponse(status_code=409, content={
+            "status": "already_running",
+            "message": f"{label} is already queued or running",
+        })
+    _ai_jobs_inflight.add(key)
+    task = asyncio.create_task(_run_ai_job(kind, arg))
+    _ai_job_tasks.add(task)
+    task.add_done_callback(_ai_job_tasks.discard)
+    task.add_done_callback(lambda _t: _ai_jobs_inflight.discard(key))
+    return None
+
+
+def _ai_job_coro(engine, kind: str, arg=None):
+    if kind == "discover":
+        return engine.discover_links(source=arg, count=10)
+    if kind == "enrich":
+        return engine.enrich_batch(limit=5, types=["summary", "description", "comments"])
+    if kind == "comment":
+        return engine.enrich_link(arg, types=["comments"])
+    raise ValueError(f"Unknown AI job kind: {kind}")
+
+
+async def _run_ai_job(kind: str, arg=None):
+    async with _ai_job_slots:
         try:
-            runs_resp = supabase.table("job_runs").select("*").order("started_at", desc=True).limit(limit).execute()
-            runs = runs_resp.data or []
-        except Exception:
-            # Fall back to ai_runs table
-            runs_resp = supabase.table("ai_runs").select(
-                "id, type, status, results_count, tokens_used, created_at, completed_at, error"
-            ).order("created_at", desc=True).limit(limit).execute()
-            runs = []
-            for r in (runs_resp.data or []):
-                # Calculate duration if both timestamps exist
-                duration = None
-                if r.get("created_at") and r.get("completed_at"):
-                    try:
-                        start = datetime.fromisoformat(r["created_at"].replace("Z", "+00:00"))
-                        end = datetime.fromisoformat(r["completed_at"].replace("Z", "+00:00"))
-                        duration = int((end - start).total_seconds())
-                    except Exception:
-                        pass
-                
-                runs.append({
-                    "id": r.get("id"),
-                    "type": r.get("type"),
-                    "status": r.get("status"),
-                    "started_at": r.get("created_at"),
-                    "completed_at": r.get("completed_at"),
-                    "duration_seconds": duration,
-                    "items_processed": r.get("results_count"),
-                    "error": r.get("error"),
-                })
-        
-        return {"job_runs": runs}
-    except Exception as e:
-        return {"error": str(e)}
+            await _ai_job_coro(_get_ai_engine(), kind, arg)
+        except Exception as e:
+            print(f"[AI Dispatch] {kind} {arg or ''} failed: {e}")
+
+
+def start_ai_dispatcher():
+    global _ai_job_slots
+    _ai_job_slots = asyncio.Semaphore(_AI_JOB_CONCURRENCY)
+    _ai_jobs_inflight.clear()
+
+
+def stop_ai_dispatcher():
+    for task in list(_ai_job_tasks):
+        task.cancel()
 
 
 @app.post("/api/admin/ai-discover/hn")
-async def api_admin_ai_discover_hn(background_tasks: BackgroundTasks, admin: str = Depends(verify_admin)):
+async def api_admin_ai_discover_hn(admin: str = Depends(verify_admin)):
     """Manually trigger AI-based Hacker News link discovery (web search, not RSS)."""
     try:
-        engine = _get_ai_engine()
-        
-        async def _run():
-            return await engine.discover_links(source="hn", count=10)
-        
-        background_tasks.add_task(_run)
+        conflict = await _submit_ai_job("discover", "hn")
+        if conflict:
+            return conflict
         return {"status": "started", "message": "AI HN discovery started in background"}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 
 @app.post("/api/admin/ai-discover/reddit")
-async def api_admin_ai_discover_reddit(background_tasks: BackgroundTasks, admin: str = Depends(verify_admin)):
+async def api_admin_ai_discover_reddit(admin: str = Depends(verify_admin)):
     """Manually trigger AI-based Reddit link discovery (web search, not RSS)."""
     try:
-        engine = _get_ai_engine()
-        
-        async def _run():
-            return await engine.discover_links(source="reddit", count=10)
-        
-        background_tasks.add_task(_run)
+        conflict = await _submit_ai_job("discover", "reddit")
+        if conflict:
+            return conflict
         return {"status": "started", "message": "AI Reddit discovery started in background"}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 
 @app.post("/api/admin/ai/enrich")
-async def api_admin_ai_enrich(background_tasks: BackgroundTasks, admin: str = Depends(verify_admin)):
+async def api_admin_ai_enrich(admin: str = Depends(verify_admin)):
     """Manually trigger AI enrichment batch (summaries, descriptions, comments via AI engine)."""
     try:
-        engine = _get_ai_engine()
-        
-        async def _run():
-            return await engine.enrich_batch(limit=5, types=["summary", "description", "comments"])
-        
-        background_tasks.add_task(_run)
+        conflict = await _submit_ai_job("enrich")
+        if conflict:
+            return conflict
         return {"status": "started", "message": "AI enrichment batch started in background"}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 
 @app.post("/api/admin/generate-comment/{link_id}")
-async def api_admin_generate_comment(link_id: int, background_tasks: BackgroundTasks, admin: str = Depends(verify_admin)):
+async def api_admin_generate_comment(link_id: int, admin: str = Depends(verify_admin)):
     """Manually generate AI comment for a specific link."""
     try:
-        engine = _get_ai_engine()
-        
-        async def _run():
-            return await engine.enrich_link(link_id, types=["comments"])
-        
-        background_tasks.add_task(_run)
+        conflict = await _submit_ai_job("comment", link_id)
+        if conflict:
+            return conflict
         return {"status": "started", "message": f"Generating comment for link {link_id}"}
     except Exception as e:
         return {"status": "error", "error": str(e)}
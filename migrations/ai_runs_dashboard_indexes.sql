@@ -0,0 +1,19 @@
+-- ============================================================
+-- AI Runs Dashboard Indexes Migration
+-- Run in Supabase SQL Editor (CONCURRENTLY cannot run inside a
+-- transaction block, so run each statement on its own)
+-- ============================================================
+
+-- 1. Covering partial index for the /admin/ai token stats query
+--    (completed runs only, newest first). INCLUDE lets the planner answer
+--    the stats projection with an index-only scan.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ai_runs_completed_recent
+ON ai_runs (created_at DESC)
+INCLUDE (tokens_used, model, type)
+WHERE status = 'completed';
+
+-- 2. The "Recent Runs" table (ORDER BY created_at DESC LIMIT 20) is already
+--    served by idx_ai_runs_created from schema_ai.sql; recreate it here in
+--    case that migration predates the index.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ai_runs_created
+ON ai_runs (created_at DESC);
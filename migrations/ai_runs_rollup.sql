@@ -0,0 +1,81 @@
+-- ============================================================
+-- AI Runs Rollup Migration
+-- Run in Supabase SQL Editor
+--
+-- Completed ai_runs older than 24h are summed into hourly tiles,
+-- and hourly tiles older than 30 days are folded into daily tiles.
+-- The /admin/ai token stats read the tiles plus only the raw runs
+-- newer than the rollup watermark.
+--
+-- Raw ai_runs rows are NOT deleted: ai_generated_content.run_id is
+-- ON DELETE CASCADE, and the recent-runs / job-runs views read them.
+-- ============================================================
+
+-- 1. Tiles: one row per (granularity, bucket, model, type)
+CREATE TABLE IF NOT EXISTS ai_runs_rollup (
+    granularity text NOT NULL CHECK (granularity IN ('hour', 'day')),
+    bucket timestamptz NOT NULL,
+    model text NOT NULL,
+    type text NOT NULL,
+    runs integer NOT NULL DEFAULT 0,
+    tokens_used bigint NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket, model, type)
+);
+
+COMMENT ON TABLE ai_runs_rollup IS 'Hourly/daily token usage tiles for completed ai_runs older than the rollup watermark';
+
+-- 2. Watermark: completed runs created before rolled_up_to live in the tiles
+CREATE TABLE IF NOT EXISTS ai_runs_rollup_state (
+    id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    rolled_up_to timestamptz NOT NULL
+);
+
+-- 3. Rollup function (idempotent; safe to run more often than nightly)
+CREATE OR REPLACE FUNCTION rollup_ai_runs()
+RETURNS void AS $$
+DECLARE
+    watermark timestamptz;
+    cutoff timestamptz := date_trunc('hour', now() - interval '24 hours');
+    day_cutoff timestamptz := date_trunc('day', now() - interval '30 days');
+BEGIN
+    SELECT rolled_up_to INTO watermark FROM ai_runs_rollup_state WHERE id = 1 FOR UPDATE;
+    watermark := COALESCE(watermark, '-infinity'::timestamptz);
+
+    IF cutoff > watermark THEN
+        INSERT INTO ai_runs_rollup (granularity, bucket, model, type, runs, tokens_used)
+        SELECT 'hour', date_trunc('hour', created_at),
+               COALESCE(model, 'unknown'), COALESCE(type, 'unknown'),
+               count(*), COALESCE(sum(tokens_used), 0)
+        FROM ai_runs
+        WHERE status = 'completed'
+          AND created_at >= watermark
+          AND created_at < cutoff
+        GROUP BY 2, 3, 4
+        ON CONFLICT (granularity, bucket, model, type) DO UPDATE
+            SET runs = ai_runs_rollup.runs + EXCLUDED.runs,
+                tokens_used = ai_runs_rollup.tokens_used + EXCLUDED.tokens_used;
+
+        INSERT INTO ai_runs_rollup_state (id, rolled_up_to) VALUES (1, cutoff)
+        ON CONFLICT (id) DO UPDATE SET rolled_up_to = EXCLUDED.rolled_up_to;
+    END IF;
+
+    -- Fold hourly tiles older than 30 days into daily tiles
+    INSERT INTO ai_runs_rollup (granularity, bucket, model, type, runs, tokens_used)
+    SELECT 'day', date_trunc('day', bucket), model, type, sum(runs), sum(tokens_used)
+    FROM ai_runs_rollup
+    WHERE granularity = 'hour' AND bucket < day_cutoff
+    GROUP BY 2, 3, 4
+    ON CONFLICT (granularity, bucket, model, type) DO UPDATE
+        SET runs = ai_runs_rollup.runs + EXCLUDED.runs,
+            tokens_used = ai_runs_rollup.tokens_used + EXCLUDED.tokens_used;
+
+    DELETE FROM ai_runs_rollup WHERE granularity = 'hour' AND bucket < day_cutoff;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 4. Initial rollup
+SELECT rollup_ai_runs();
+
+-- 5. Nightly schedule (requires the pg_cron extension; enable it under
+--    Database > Extensions first, or call rollup_ai_runs() from any cron)
+-- SELECT cron.schedule('rollup-ai-runs', '15 3 * * *', $$SELECT rollup_ai_runs()$$);
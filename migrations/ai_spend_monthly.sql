@@ -0,0 +1,40 @@
+-- ============================================================
+-- AI Spend Monthly Counter Migration
+-- Run in Supabase SQL Editor
+-- ============================================================
+
+-- 1. Rolling per-month spend counter (months are UTC)
+CREATE TABLE IF NOT EXISTS ai_spend_monthly (
+    month date PRIMARY KEY,
+    total numeric(12,6) NOT NULL DEFAULT 0,
+    updated_at timestamptz DEFAULT now()
+);
+
+COMMENT ON TABLE ai_spend_monthly IS 'Running total of ai_token_usage.estimated_cost_usd per UTC month (maintained by trigger)';
+
+-- 2. Bump the counter on every ai_token_usage insert
+CREATE OR REPLACE FUNCTION bump_monthly_spend()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO ai_spend_monthly (month, total, updated_at)
+    VALUES (date_trunc('month', NEW.created_at AT TIME ZONE 'UTC')::date,
+            COALESCE(NEW.estimated_cost_usd, 0), now())
+    ON CONFLICT (month) DO UPDATE
+        SET total = ai_spend_monthly.total + EXCLUDED.total,
+            updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS ai_token_usage_monthly_spend ON ai_token_usage;
+CREATE TRIGGER ai_token_usage_monthly_spend
+    AFTER INSERT ON ai_token_usage
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_monthly_spend();
+
+-- 3. Backfill existing usage
+INSERT INTO ai_spend_monthly (month, total)
+SELECT date_trunc('month', created_at AT TIME ZONE 'UTC')::date, COALESCE(SUM(estimated_cost_usd), 0)
+FROM ai_token_usage
+GROUP BY 1
+ON CONFLICT (month) DO UPDATE SET total = EXCLUDED.total, updated_at = now();
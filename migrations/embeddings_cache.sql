@@ -0,0 +1,17 @@
+-- ============================================================
+-- Embeddings Cache Migration
+-- Run in Supabase SQL Editor
+-- ============================================================
+
+-- Content-addressed store of text embeddings. ingest.vectorize /
+-- vectorize_batch key it by blake2b-128 of the model id, the output
+-- settings (normalization, rounding) and the (clipped) input text, so a
+-- text that was embedded once -- reposted by another feed, re-synced, or
+-- re-submitted -- is never sent through the model again, and changing the
+-- model or those settings just starts filling fresh keys.
+-- all-MiniLM-L6-v2 embeddings are 384-dimensional.
+CREATE TABLE IF NOT EXISTS embeddings_cache (
+    hash BYTEA PRIMARY KEY,
+    vector vector(384) NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
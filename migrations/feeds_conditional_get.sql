@@ -0,0 +1,10 @@
+-- ============================================================
+-- Feeds Conditional GET Migration
+-- Run in Supabase SQL Editor
+-- ============================================================
+
+-- HTTP validators from the last complete fetch of each feed. Feed sync
+-- sends them back as If-None-Match / If-Modified-Since; a 304 means the
+-- feed is unchanged and the sync skips download, parsing and embedding.
+ALTER TABLE feeds ADD COLUMN IF NOT EXISTS etag TEXT;
+ALTER TABLE feeds ADD COLUMN IF NOT EXISTS last_modified TEXT;
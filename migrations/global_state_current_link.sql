@@ -0,0 +1,16 @@
+-- ============================================================
+-- Global State Current Link Snapshot Migration
+-- Run in Supabase SQL Editor
+-- ============================================================
+
+-- Denormalized copy of the featured link, written by the director at
+-- rotation time so /api/now can answer from the single global_state row
+-- instead of reading links, feed_tags, tags and summing votes.
+
+ALTER TABLE global_state ADD COLUMN IF NOT EXISTS current_link_json JSONB;
+ALTER TABLE global_state ADD COLUMN IF NOT EXISTS current_tags_json JSONB DEFAULT '[]'::jsonb;
+ALTER TABLE global_state ADD COLUMN IF NOT EXISTS current_score INTEGER DEFAULT 0;
+
+COMMENT ON COLUMN global_state.current_link_json IS 'Snapshot of the current link (id, url, title, meta_json, direct_score, feed_id), set by the director on rotation';
+COMMENT ON COLUMN global_state.current_tags_json IS 'Tags (name, slug) of the current link''s feed, set by the director on rotation';
+COMMENT ON COLUMN global_state.current_score IS 'SUM(votes.value) for the current link; refreshed on rotation and after each vote on it';
@@ -0,0 +1,21 @@
+-- ============================================================
+-- Links List Indexes Migration
+-- Run in Supabase SQL Editor (CONCURRENTLY cannot run inside a
+-- transaction block, so run each statement on its own)
+-- ============================================================
+
+-- 1. /admin/links (all feeds): ORDER BY created_at DESC LIMIT 200.
+--    Walks the index newest-first and stops after the limit instead of
+--    sorting the whole table. INCLUDE carries the rendered columns so
+--    this can be an index-only scan on a well-vacuumed table.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_links_created_desc
+ON links(created_at DESC)
+INCLUDE (id, url, title, direct_score, times_shown, feed_id);
+
+-- 2. /admin/links?feed_id=N: WHERE feed_id = ? ORDER BY created_at DESC.
+--    Supersedes idx_links_feed_id for these reads (the feed link_count
+--    head count can use either).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_links_feed_created
+ON links(feed_id, created_at DESC);
+
+ANALYZE links;
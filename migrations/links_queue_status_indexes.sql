@@ -0,0 +1,20 @@
+-- ============================================================
+-- Links Queue Status Indexes Migration
+-- Run in Supabase SQL Editor (CONCURRENTLY cannot run inside a
+-- transaction block, so run each statement on its own)
+-- ============================================================
+
+-- 1. Backs /api/admin/queue-status: the GROUP BY processing_status,
+--    (source = 'scratchpad') aggregation and the per-status planner
+--    estimates. Covering both columns allows an index-only scan.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_links_status_source
+ON links(processing_status, source);
+
+-- 2. Small partial index for the "new" bucket split by source
+--    (user-submitted vs feed links in the priority breakdown)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_links_new_source
+ON links(source)
+WHERE processing_status = 'new';
+
+-- Refresh planner statistics so count='estimated' has good numbers
+ANALYZE links;
@@ -0,0 +1,13 @@
+-- ============================================================
+-- Links Summary View Migration
+-- Run in Supabase SQL Editor
+-- ============================================================
+
+-- Narrow projection of links for list pages (/admin/links). Leaves out
+-- content, content_vector and comment_vector so a 200-row page never
+-- drags ~1024 floats per row over the wire or through the JSON encoder.
+-- Plain (non-materialized) view: the planner inlines it, so
+-- idx_links_created_desc / idx_links_feed_created still apply.
+CREATE OR REPLACE VIEW links_summary AS
+SELECT id, url, title, direct_score, times_shown, feed_id, created_at
+FROM links;
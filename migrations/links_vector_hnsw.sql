@@ -0,0 +1,14 @@
+-- ============================================================
+-- Links Vector HNSW Migration
+-- Run in Supabase SQL Editor
+-- ============================================================
+
+-- Replace the ivfflat index on links.content_vector with HNSW (pgvector
+-- 0.5+). ivfflat was built with lists = 100 against whatever rows existed
+-- at creation time and its recall drifts as links grow; HNSW needs no
+-- training and keeps recall without a periodic rebuild. Embeddings are
+-- L2-normalized at ingest, so cosine and inner-product rankings agree.
+DROP INDEX IF EXISTS idx_links_content_vector;
+CREATE INDEX IF NOT EXISTS idx_links_content_vector
+    ON links USING hnsw (content_vector vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
@@ -0,0 +1,27 @@
+-- ============================================================
+-- Votes Indexes Migration
+-- Run in Supabase SQL Editor (CONCURRENTLY cannot run inside a
+-- transaction block, so run each statement on its own)
+-- ============================================================
+
+-- 1. Vote cooldown: WHERE user_id = ? AND created_at > now() - cooldown
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_votes_user_created
+ON votes(user_id, created_at DESC);
+
+-- 2. A user's votes on a link (count + latest created_at for
+--    my_votes_count / my_last_vote_at). Leading link_id also serves
+--    lookups by link alone.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_votes_link_user_created
+ON votes(link_id, user_id, created_at DESC);
+
+-- 3. Link score: SUM(value) WHERE link_id = ?. Carrying value lets
+--    this be an index-only scan.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_votes_link_value
+ON votes(link_id) INCLUDE (value);
+
+ANALYZE votes;
+
+-- Verify with:
+-- EXPLAIN ANALYZE SELECT 1 FROM votes WHERE user_id = '<uuid>' AND created_at > now() - interval '10 seconds';
+-- EXPLAIN ANALYZE SELECT COALESCE(SUM(value), 0) FROM votes WHERE link_id = 1;
+-- EXPLAIN ANALYZE SELECT count(*), max(created_at) FROM votes WHERE link_id = 1 AND user_id = '<uuid>';
@@ -15,7 +15,7 @@ CREATE TABLE IF NOT EXISTS links (
 
 -- Create indexes for faster queries
 CREATE INDEX IF NOT EXISTS idx_links_url ON links(url);
-CREATE INDEX IF NOT EXISTS idx_links_content_vector ON links USING ivfflat (content_vector vector_cosine_ops) WITH (lists = 100);
+CREATE INDEX IF NOT EXISTS idx_links_content_vector ON links USING hnsw (content_vector vector_cosine_ops) WITH (m = 16, ef_construction = 64);
 CREATE INDEX IF NOT EXISTS idx_links_comment_vector ON links USING ivfflat (comment_vector vector_cosine_ops) WITH (lists = 100);
 
 -- Create a function to automatically update the updated_at timestamp
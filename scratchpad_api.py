@@ -320,7 +320,7 @@ def ingest_link_async(link_id: int, url: str):
     """Run content extraction in background thread."""
     def _ingest():
         try:
-            extractor = ingest_module.ContentExtractor()
+            extractor = ingest_module.get_extractor()
             parsed = urlparse(url)
             domain = parsed.netloc.lower()
 
@@ -373,8 +373,7 @@ def ingest_link_async(link_id: int, url: str):
                 try:
                     text = update.get("content") or update.get("description") or ""
                     if text:
-                        vectorizer = ingest_module.TextVectorizer()
-                        vec = vectorizer.vectorize(text[:2000])
+                        vec = ingest_module.vectorize(text[:2000])
                         supabase.table("links").update({"content_vector": vec}).eq("id", link_id).execute()
                         print(f"[Scratchpad] Vectorized link {link_id}")
                 except Exception as ve:
@@ -883,7 +882,7 @@ def check_reverse_lookup(url: str, link_id: int) -> int | None:
 # --- API Routes ---
 
 @router.api_route("/api/check", methods=["GET", "POST"])
-async def api_check_link(url: str = "", comments: int = 5):
+def api_check_link(url: str = "", comments: int = 5):
     """
     Bot-friendly endpoint. Check a URL — create if new, return compact summary.
     Always triggers ingestion if title is missing.
@@ -976,7 +975,7 @@ async def api_check_link(url: str = "", comments: int = 5):
 
 
 @router.get("/api/link")
-async def api_link_lookup(url: str):
+def api_link_lookup(url: str):
     """Look up a link by URL."""
     url = normalize_url(url)
     resp = supabase.table("links").select(
@@ -991,7 +990,7 @@ async def api_link_lookup(url: str):
 
 
 @router.post("/api/link")
-async def api_link_create(body: LinkCreate):
+def api_link_create(body: LinkCreate):
     """Save a new link. Returns existing if URL already tracked."""
     body.url = normalize_url(body.url)
     existing = supabase.table("links").select("id").eq("url", body.url).execute()
@@ -1043,7 +1042,7 @@ async def api_link_create(body: LinkCreate):
 
 
 @router.patch("/api/link/{link_id}")
-async def api_link_edit(link_id: int, body: LinkEdit):
+def api_link_edit(link_id: int, body: LinkEdit):
     """Edit title/description."""
     update = {}
     if body.title is not None:
@@ -1063,7 +1062,7 @@ async def api_link_notes(link_id: int):
 
 
 @router.post("/api/link/{link_id}/notes")
-async def api_link_note_create(link_id: int, body: NoteCreate, request: Request):
+def api_link_note_create(link_id: int, body: NoteCreate, request: Request):
     insert_data = {
         "link_id": link_id, "author": body.author, "text": body.text
     }
@@ -1089,7 +1088,7 @@ async def api_link_tags_add(link_id: int, body: TagsAdd):
 
 
 @router.delete("/api/link/{link_id}/tags/{slug}")
-async def api_link_tag_remove(link_id: int, slug: str):
+def api_link_tag_remove(link_id: int, slug: str):
     tag_resp = supabase.table("tags").select("id").eq("slug", slug).execute()
     if tag_resp.data:
         tag_id = tag_resp.data[0]["id"]
@@ -1111,7 +1110,7 @@ async def api_get_discussions(link_id: int):
 
 
 @router.get("/api/link/{link_id}/status")
-async def api_link_status(link_id: int):
+def api_link_status(link_id: int):
     """
     Get processing status for a link - for live-loading UI polling.
     
@@ -1164,7 +1163,7 @@ async def api_reddit_status():
 
 
 @router.get("/api/links")
-async def api_links_browse(
+def api_links_browse(
     tag: Optional[str] = None,
     sort: str = "recent",
     q: Optional[str] = None,
@@ -1325,7 +1324,7 @@ async def api_link_comments(link_id: int):
 
 
 @router.post("/api/link/{link_id}/comments")
-async def api_link_comment_create(link_id: int, body: CommentCreate, request: Request):
+def api_link_comment_create(link_id: int, body: CommentCreate, request: Request):
     """Create a new comment on a link."""
     # Get user_id from body or from cookie
     user_id = body.user_id
@@ -1373,7 +1372,7 @@ async def api_link_comment_create(link_id: int, body: CommentCreate, request: Re
 
 
 @router.post("/api/comment/{comment_id}/upvote")
-async def api_comment_upvote(comment_id: int, request: Request):
+def api_comment_upvote(comment_id: int, request: Request):
     """Toggle upvote on a comment. For now, just increments (no user tracking)."""
     # Get current upvotes
     resp = supabase.table("comments").select("upvotes").eq("id", comment_id).execute()
@@ -13,6 +13,7 @@ from urllib.parse import urlparse
 from datetime import datetime, timezone
 from fastapi import BackgroundTasks, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
+from db import run_db
 from scratchpad_api import get_external_discussions, fetch_and_save_external_discussions, check_reverse_lookup
 
 
@@ -1008,8 +1009,7 @@ label { display: block; font-size: 13px; color: #94a3b8; margin-bottom: 4px; fon
 """
 
 
-def dark_nav():
-    return """<div class="topbar">
+_DARK_NAV_HTML = """<div class="topbar">
         <a href="/browse" class="brand">&#128279; Linksite</a>
         <a href="/browse">Browse</a>
         <a href="/add">Check Link</a>
@@ -1017,27 +1017,37 @@ def dark_nav():
     </div>"""
 
 
-def dark_page(title, body, extra_scripts=""):
-    return f"""<!DOCTYPE html>
+def dark_nav():
+    return _DARK_NAV_HTML
+
+
+# dark_page() shell, built once at import time
+_DARK_HEAD_START = """<!DOCTYPE html>
 <html lang="en"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
-<title>{title} - Linksite</title><style>{DARK_CSS}</style></head><body>
+<title>"""
+_DARK_HEAD_END = f""" - Linksite</title><style>{DARK_CSS}</style></head><body>
 <div class="page-loader" id="loader"><div class="bar"></div></div>
-{dark_nav()}<div class="container">{body}</div>
+{_DARK_NAV_HTML}<div class="container">"""
+_DARK_BODY_END = """</div>
 <script>
-document.addEventListener('click', function(e) {{
+document.addEventListener('click', function(e) {
     var a = e.target.closest('a[href]');
-    if (a && a.href && !a.href.startsWith('javascript') && !a.target && a.origin === location.origin) {{
+    if (a && a.href && !a.href.startsWith('javascript') && !a.target && a.origin === location.origin) {
         document.getElementById('loader').className = 'page-loader loading';
-    }}
-}});
-document.querySelectorAll('form').forEach(function(f) {{
-    f.addEventListener('submit', function() {{
+    }
+});
+document.querySelectorAll('form').forEach(function(f) {
+    f.addEventListener('submit', function() {
         document.getElementById('loader').className = 'page-loader loading';
-    }});
-}});
+    });
+});
 </script>
-{extra_scripts}
-</body></html>"""
+"""
+
+
+def dark_page(title, body, extra_scripts=""):
+    return "".join((_DARK_HEAD_START, title, _DARK_HEAD_END, body, _DARK_BODY_END,
+                    extra_scripts, "\n</body></html>"))
 
 
 # --- Async PostgREST helper for parallel queries ---
@@ -1111,13 +1121,13 @@ fetch('/api/me').then(function(r){return r.json();}).then(function(d){
 def register_scratchpad_routes(app, supabase, vectorize_fn):
     """Register all HTML page routes on the FastAPI app."""
 
-    from ingest import ContentExtractor
+    from ingest import get_extractor
 
     async def _ingest_link_content(link_id, url):
         try:
-            extractor = ContentExtractor()
+            extractor = get_extractor()
             if extractor.is_youtube_url(url):
-                data = extractor.extract_youtube_content(url)
+                data = await asyncio.to_thread(extractor.extract_youtube_content, url)
                 update = {
                     'title': data.get('title', ''),
                     'description': data.get('transcript', '')[:5000],
@@ -1130,8 +1140,7 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
                 update = {'source': 'bluesky'}
                 text_for_vector = ''
                 try:
-                    import httpx as _hx
-                    async with _hx.AsyncClient() as client:
+                    async with httpx.AsyncClient() as client:
                         oembed_resp = await client.get(
                             'https://embed.bsky.app/oembed',
                             params={'url': url, 'format': 'json'},
@@ -1151,12 +1160,11 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
                     print(f"[Ingest] Bluesky oEmbed failed for {url}: {e}")
                 # Also try the AT Protocol public API for richer data
                 try:
-                    import httpx as _hx
                     # Parse handle and rkey from URL
                     bsky_match = re.search(r'bsky\.app/profile/([^/]+)/post/([^/?#]+)', url)
                     if bsky_match:
                         handle, rkey = bsky_match.group(1), bsky_match.group(2)
-                        async with _hx.AsyncClient() as client:
+                        async with httpx.AsyncClient() as client:
                             # Resolve handle to DID if needed
                             if not handle.startswith('did:'):
                                 resolve = await client.get(
@@ -1200,7 +1208,7 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
                     print(f"[Ingest] Bluesky AT Proto failed for {url}: {e}")
                 data = update  # for consistency
             else:
-                data = extractor.extract_website_content(url)
+                data = await asyncio.to_thread(extractor.extract_website_content, url)
                 update = {
                     'title': data.get('title', ''),
                     'description': (data.get('main_text', '') or '')[:5000],
@@ -1209,7 +1217,7 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
                 }
                 text_for_vector = f"{data.get('title', '')}. {data.get('main_text', '')}"
 
-            existing = supabase.table('links').select('title, description').eq('id', link_id).execute()
+            existing = await run_db(supabase.table('links').select('title, description').eq('id', link_id).execute)
             if existing.data:
                 ex = existing.data[0]
                 if ex.get('title'):
@@ -1218,17 +1226,17 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
                     update.pop('description', None)
 
             try:
-                vec = vectorize_fn(text_for_vector[:5000])
+                vec = await asyncio.to_thread(vectorize_fn, text_for_vector[:5000])
                 update['content_vector'] = vec
             except Exception as e:
                 print(f"Vectorization failed for link {link_id}: {e}")
 
-            supabase.table('links').update(update).eq('id', link_id).execute()
+            await run_db(supabase.table('links').update(update).eq('id', link_id).execute)
             print(f"[Ingest] Link {link_id} enriched from {url}")
         except Exception as e:
             print(f"[Ingest] Error processing link {link_id}: {e}")
 
-    async def _ensure_parent_site(url, link_id):
+    def _ensure_parent_site(url, link_id):
         try:
             parsed = urlparse(url)
             host = (parsed.netloc or '').lower()
@@ -1344,7 +1352,7 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
 
     # ========== POST /add ==========
     @app.post("/add", response_class=HTMLResponse)
-    async def page_add_link_post(
+    def page_add_link_post(
         background_tasks: BackgroundTasks,
         url: str = Form(...),
     ):
@@ -1401,7 +1409,6 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
                 background_tasks.add_task(_ensure_parent_site, resolved_url, link_id)
             
             # Add the discussion URL as an external discussion
-            import re
             external_id = None
             if platform == "reddit":
                 match = re.search(r'/comments/([a-z0-9]+)', discussion_url)
@@ -1451,7 +1458,10 @@ def register_scratchpad_routes(app, supabase, vectorize_fn):
     # ========== GET /link/{id} — Detail page (lazy-loaded sections) ==========
     @app.get("/link/{link_id}", response_class=HTMLResponse)
     async def page_link_detail(link_id: int, message: Optional[str] = None, error: Optional[str] = None):
-        resp = supabase.table('links').select('*').eq('id', link_id).execute()
+        resp = await run_db(supabase.table('links').select(
+            'id, url, title, summary, created_at, direct_score, submitted_by, '
+            'parent_link_id, processing_status, og_image_url, screenshot_url'
+        ).eq('id', link_id).execute)
         if not resp.data:
             return HTMLResponse(dark_page("Not Found", '<div class="msg-err">Link not found.</div>'))
 
@@ -2130,7 +2140,7 @@ if(PROCESSING_STATUS==='new'||PROCESSING_STATUS==='processing'){
 
     # ========== POST /link/{id}/add-note ==========
     @app.post("/link/{link_id}/add-note")
-    async def page_add_note(link_id: int, request: Request, text: str = Form(...), author: str = Form("anon")):
+    def page_add_note(link_id: int, request: Request, text: str = Form(...), author: str = Form("anon")):
         author = author.strip() or "anon"
         insert_data = {'link_id': link_id, 'author': author, 'text': text.strip()}
         # Attach user_id from middleware
@@ -2147,7 +2157,7 @@ if(PROCESSING_STATUS==='new'||PROCESSING_STATUS==='processing'){
 
     # ========== POST /link/{id}/add-tags ==========
     @app.post("/link/{link_id}/add-tags")
-    async def page_add_tags(link_id: int, tags: str = Form(...)):
+    def page_add_tags(link_id: int, tags: str = Form(...)):
         for tag_name in tags.split(','):
             tag_name = tag_name.strip()
             if tag_name:
@@ -2163,7 +2173,7 @@ if(PROCESSING_STATUS==='new'||PROCESSING_STATUS==='processing'){
 
     # ========== POST /link/{id}/star ==========
     @app.post("/link/{link_id}/star")
-    async def page_star_link(link_id: int):
+    def page_star_link(link_id: int):
         # Increment direct_score by 1 (acts as a star/upvote)
         link_resp = supabase.table('links').select('direct_score').eq('id', link_id).execute()
         if link_resp.data:
@@ -2173,7 +2183,7 @@ if(PROCESSING_STATUS==='new'||PROCESSING_STATUS==='processing'){
 
     # ========== POST /link/{id}/refresh-discussions ==========
     @app.post("/link/{link_id}/refresh-discussions")
-    async def page_refresh_discussions(link_id: int, background_tasks: BackgroundTasks):
+    def page_refresh_discussions(link_id: int, background_tasks: BackgroundTasks):
         link_resp = supabase.table('links').select('url').eq('id', link_id).execute()
         if link_resp.data:
             url = link_resp.data[0]['url']
@@ -2182,7 +2192,7 @@ if(PROCESSING_STATUS==='new'||PROCESSING_STATUS==='processing'){
 
     # ========== GET /link/{id}/remove-tag/{slug} ==========
     @app.get("/link/{link_id}/remove-tag/{slug}")
-    async def page_remove_tag(link_id: int, slug: str):
+    def page_remove_tag(link_id: int, slug: str):
         tag_resp = supabase.table('tags').select('id').eq('slug', slug).execute()
         if tag_resp.data:
             supabase.table('link_tags').delete().eq('link_id', link_id).eq('tag_id', tag_resp.data[0]['id']).execute()
@@ -2190,7 +2200,7 @@ if(PROCESSING_STATUS==='new'||PROCESSING_STATUS==='processing'){
 
     # ========== GET /browse — lazy-loaded grid ==========
     @app.get("/browse", response_class=HTMLResponse)
-    async def page_browse(tag: Optional[str] = None, sort: Optional[str] = "recent", q: Optional[str] = None):
+    def page_browse(tag: Optional[str] = None, sort: Optional[str] = "recent", q: Optional[str] = None):
         try:
             # Still fetch tags server-side for the tag bar (it's fast)
             all_tags_resp = supabase.table('tags').select('slug, name').order('name').execute()
@@ -0,0 +1,99 @@
+"""Test the iterparse fast path for RSS 2.0 / Atom feeds (ingest.iterparse_feed)."""
+from ingest import iterparse_feed
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <title>Example Blog</title>
+    <link>https://example.com/</link>
+    <item>
+      <title>First post</title>
+      <link>https://example.com/1</link>
+      <description>&lt;p&gt;Hello &lt;b&gt;world&lt;/b&gt;&lt;/p&gt;&lt;script&gt;&lt;/script&gt;</description>
+      <pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate>
+      <dc:creator>Alice</dc:creator>
+    </item>
+    <item>
+      <title>Second post</title>
+      <link>https://example.com/2</link>
+    </item>
+    <item>
+      <title>Third post</title>
+      <guid>https://example.com/3</guid>
+    </item>
+    <item>
+      <title>Not a permalink</title>
+      <guid isPermaLink="false">tag:example.com,2025:4</guid>
+    </item>
+  </channel>
+</rss>
+"""
+
+YOUTUBE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">
+  <title>Some Channel</title>
+  <link rel="alternate" href="https://www.youtube.com/channel/UC123"/>
+  <entry>
+    <title>A video</title>
+    <link rel="self" href="https://www.youtube.com/feeds/videos.xml?v=abc"/>
+    <link rel="alternate" href="https://www.youtube.com/watch?v=abc"/>
+    <published>2025-01-06T10:00:00+00:00</published>
+    <author><name>Some Channel</name></author>
+    <media:group>
+      <media:title>A video</media:title>
+      <media:thumbnail url="https://i.ytimg.com/vi/abc/hqdefault.jpg" width="480" height="360"/>
+      <media:description>What the video is about</media:description>
+    </media:group>
+  </entry>
+</feed>
+"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/">
+  <channel><title>Old feed</title></channel>
+  <item><title>Entry</title><link>https://example.com/rdf</link></item>
+</rdf:RDF>
+"""
+
+
+def test_rss_entries():
+    title, entries = iterparse_feed(RSS)
+    assert title == "Example Blog"
+    # A permalink guid stands in for a missing <link>; other guids don't
+    assert [e["link"] for e in entries] == [
+        "https://example.com/1", "https://example.com/2", "https://example.com/3", "",
+    ]
+    first = entries[0]
+    assert first["title"] == "First post"
+    # Summary HTML is stripped, as callers do on the feedparser path
+    assert first["summary"] == "Hello world"
+    assert first["published"] == "Mon, 06 Jan 2025 10:00:00 GMT"
+    assert first["author"] == "Alice"
+
+
+def test_rss_stops_at_limit():
+    title, entries = iterparse_feed(RSS, limit=2)
+    assert title == "Example Blog"
+    assert [e["title"] for e in entries] == ["First post", "Second post"]
+
+
+def test_youtube_atom_entry():
+    title, entries = iterparse_feed(YOUTUBE)
+    assert title == "Some Channel"
+    assert len(entries) == 1
+    video = entries[0]
+    # rel="self" is skipped in favour of the alternate (watch) link
+    assert video["link"] == "https://www.youtube.com/watch?v=abc"
+    assert video["title"] == "A video"
+    assert video["summary"] == "What the video is about"
+    assert video["thumbnail"] == "https://i.ytimg.com/vi/abc/hqdefault.jpg"
+    assert video["published"] == "2025-01-06T10:00:00+00:00"
+    assert video["author"] == "Some Channel"
+
+
+def test_unhandled_documents_fall_back():
+    # None tells _feed_entries to hand the bytes to feedparser
+    assert iterparse_feed(RDF) is None
+    assert iterparse_feed(b"<html><body>not a feed</body></html>") is None
+    assert iterparse_feed(b"\x00garbage <<") is None
+    assert iterparse_feed(b'<rss version="2.0"><channel><title>Empty</title></channel></rss>') is None
@@ -17,7 +17,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional
 from uuid import uuid4
 
-from db import query, query_one, execute
+from db import query, query_one, execute, run_db
 from psycopg2.extras import Json
 from backoff import (
     check_backoff, record_success, record_failure, get_backoff_status,
@@ -37,6 +37,9 @@ SONNET_OUTPUT_PRICE = 15.0  # $15 per 1M output tokens
 
 ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
 
+# Links processed at once per batch (bounds load on Anthropic/Reddit/HN)
+LINK_CONCURRENCY = 4
+
 
 # ============================================================
 # Budget Tracking
@@ -218,11 +221,11 @@ async def run_external_discussion_lookup(link_id: int, url: str):
         return
     
     try:
-        # Run the existing external discussion fetch
-        fetch_and_save_external_discussions(link_id, url)
+        # Run the existing external discussion fetch (blocking httpx calls)
+        await asyncio.to_thread(fetch_and_save_external_discussions, link_id, url)
         
         # Check reverse lookup (if this is an HN/Reddit link)
-        check_reverse_lookup(url, link_id)
+        await asyncio.to_thread(check_reverse_lookup, url, link_id)
         
         record_success("reddit")
     except Exception as e:
@@ -266,6 +269,76 @@ def _log_job_complete(job_id: str, items_processed: int, error: str = None, link
 # Main Worker Function
 # ============================================================
 
+async def _process_link(link: dict, budget_ok: bool) -> dict:
+    """Run one link through summary + discussion lookup (step 3 below)."""
+    link_id = link["id"]
+    url = link.get("url", "")
+    outcome = {"id": link_id, "summary": False, "discussions": False, "error": None}
+    
+    try:
+        # a. Set processing_status = 'processing'
+        await run_db(
+            execute,
+            "UPDATE links SET processing_status = 'processing' WHERE id = %s",
+            (link_id,)
+        )
+        
+        # b. Generate summary if budget OK and no existing summary
+        if budget_ok and not link.get("summary"):
+            if check_backoff("anthropic"):
+                summary = await generate_summary(link)
+                if summary:
+                    await run_db(
+                        execute,
+                        "UPDATE links SET summary = %s WHERE id = %s",
+                        (summary, link_id)
+                    )
+                    outcome["summary"] = True
+                    print(f"[Worker] Generated summary for link {link_id}")
+            else:
+                print(f"[Worker] Skipping summary for link {link_id} - anthropic in backoff")
+        
+        # c. Check for external discussions
+        # First check if we already have discussions for this link
+        existing_disc = await run_db(
+            query_one,
+            "SELECT id FROM external_discussions WHERE link_id = %s LIMIT 1",
+            (link_id,)
+        )
+        
+        if not existing_disc and url:
+            await run_external_discussion_lookup(link_id, url)
+            outcome["discussions"] = True
+        
+        # d. Set processing_status = 'completed'
+        await run_db(
+            execute,
+            """
+            UPDATE links 
+            SET processing_status = 'completed', last_processed_at = now()
+            WHERE id = %s
+            """,
+            (link_id,)
+        )
+        
+    except Exception as e:
+        outcome["error"] = f"Link {link_id}: {str(e)}"
+        print(f"[Worker] Error processing link {link_id}: {e}")
+        
+        # Mark as failed
+        await run_db(
+            execute,
+            """
+            UPDATE links 
+            SET processing_status = 'failed', last_processed_at = now()
+            WHERE id = %s
+            """,
+            (link_id,)
+        )
+    
+    return outcome
+
+
 async def run_processing_batch(batch_size: int = 20) -> dict:
     """
     Main worker function - processes a batch of links.
@@ -331,75 +404,20 @@ async def run_processing_batch(batch_size: int = 20) -> dict:
         
         print(f"[Worker] Processing batch of {len(links)} links")
         
-        summaries_generated = 0
-        discussions_checked = 0
-        errors = []
-        processed_link_ids = []  # Track which links we processed
-        
-        # 3. Process each link
-        for link in links:
-            link_id = link["id"]
-            url = link.get("url", "")
-            
-            try:
-                # a. Set processing_status = 'processing'
-                execute(
-                    "UPDATE links SET processing_status = 'processing' WHERE id = %s",
-                    (link_id,)
-                )
-                
-                # b. Generate summary if budget OK and no existing summary
-                if budget_ok and not link.get("summary"):
-                    if check_backoff("anthropic"):
-                        summary = await generate_summary(link)
-                        if summary:
-                            execute(
-                                "UPDATE links SET summary = %s WHERE id = %s",
-                                (summary, link_id)
-                            )
-                            summaries_generated += 1
-                            print(f"[Worker] Generated summary for link {link_id}")
-                    else:
-                        print(f"[Worker] Skipping summary for link {link_id} - anthropic in backoff")
-                
-                # c. Check for external discussions
-                # First check if we already have discussions for this link
-                existing_disc = query_one(
-                    "SELECT id FROM external_discussions WHERE link_id = %s LIMIT 1",
-                    (link_id,)
-                )
-                
-                if not existing_disc and url:
-                    await run_external_discussion_lookup(link_id, url)
-                    discussions_checked += 1
-                
-                # d. Set processing_status = 'completed'
-                execute(
-                    """
-                    UPDATE links 
-                    SET processing_status = 'completed', last_processed_at = now()
-                    WHERE id = %s
-                    """,
-                    (link_id,)
-                )
-                
-                # Track this link as successfully processed
-                processed_link_ids.append(link_id)
-                
-            except Exception as e:
-                error_msg = f"Link {link_id}: {str(e)}"
-                errors.append(error_msg)
-                print(f"[Worker] Error processing link {link_id}: {e}")
-                
-                # Mark as failed
-                execute(
-                    """
-                    UPDATE links 
-                    SET processing_status = 'failed', last_processed_at = now()
-                    WHERE id = %s
-                    """,
-                    (link_id,)
-                )
+        # 3. Process links concurrently; each one is mostly waiting on the
+        # Anthropic API and Reddit/HN lookups
+        sem = asyncio.Semaphore(LINK_CONCURRENCY)
+
+        async def _bounded(link):
+            async with sem:
+                return await _process_link(link, budget_ok)
+
+        outcomes = await asyncio.gather(*(_bounded(link) for link in links))
+
+        summaries_generated = sum(1 for o in outcomes if o["summary"])
+        discussions_checked = sum(1 for o in outcomes if o["discussions"])
+        errors = [o["error"] for o in outcomes if o["error"]]
+        processed_link_ids = [o["id"] for o in outcomes if not o["error"]]
         
         # 4. Log job completion with processed link IDs
         _log_job_complete(